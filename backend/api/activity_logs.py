@@ -9,15 +9,38 @@ def is_admin(user_id):
     user = User.find_by_id(user_id)
     return user and user.get('role') == 'admin'
 
-def create_activity_log(user_id, action, message, job_id=None, tool_used=None):
-    """Helper function to create activity log entries"""
+def create_activity_log(user_id, action, message, job_id=None, tool_used=None, cursor=None):
+    """Helper function to create activity log entries
+    
+    Pass the caller's open cursor to write the log in the same transaction
+    (committed with the caller's writes). A savepoint keeps a failed log
+    insert from aborting that transaction.
+    """
+    params = (user_id, job_id, action, tool_used, message, datetime.now())
+    
+    if cursor is not None:
+        try:
+            cursor.execute("""
+                SAVEPOINT activity_log;
+                INSERT INTO activity_logs (user_id, job_id, action, tool_used, message, timestamp)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, params)
+            
+            result = cursor.fetchone()
+            return result['id'] if result else None
+        except Exception as e:
+            print(f"Error creating activity log: {str(e)}")
+            cursor.execute("ROLLBACK TO SAVEPOINT activity_log")
+            return None
+    
     try:
         with get_db_cursor(commit=True) as cursor:
             cursor.execute("""
                 INSERT INTO activity_logs (user_id, job_id, action, tool_used, message, timestamp)
                 VALUES (%s, %s, %s, %s, %s, %s)
                 RETURNING id
-            """, (user_id, job_id, action, tool_used, message, datetime.now()))
+            """, params)
             
             result = cursor.fetchone()
             return result['id'] if result else None
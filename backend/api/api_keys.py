@@ -1,6 +1,7 @@
 from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.utils.database import get_db_cursor
+from backend.utils.api_key_cache import invalidate_api_key
 from backend.api import api_keys_bp
 from datetime import datetime
 import os
@@ -76,7 +77,9 @@ def update_api_key():
             """, (provider, value, datetime.now(), datetime.now()))
             
             updated_key = cursor.fetchone()
-            return jsonify(format_api_key(updated_key)), 200
+        
+        invalidate_api_key(provider)
+        return jsonify(format_api_key(updated_key)), 200
             
     except Exception as e:
         print(f"Error updating API key: {e}")
@@ -162,8 +165,9 @@ def delete_api_key(provider):
                 file_path = deleted_key['key_value']
                 if os.path.exists(file_path):
                     os.remove(file_path)
-            
-            return jsonify({'message': f'{provider} API key deleted successfully'}), 200
+        
+        invalidate_api_key(provider)
+        return jsonify({'message': f'{provider} API key deleted successfully'}), 200
             
     except Exception as e:
         print(f"Error deleting API key: {e}")
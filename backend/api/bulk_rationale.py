@@ -2,18 +2,35 @@
 Bulk Rationale API Endpoints
 """
 
-from flask import request, jsonify, send_file
+from flask import request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.api import bulk_rationale_bp
 from backend.utils.database import get_db_cursor
+from psycopg2.extras import execute_values, Json
 from backend.api.activity_logs import create_activity_log
 from backend.utils.path_utils import resolve_job_folder_path
+from backend.utils.file_response import stream_file
+from backend.utils.json_provider import json_default
+from backend.utils.log_utils import get_logger
+from backend.utils.job_ids import new_job_id
 from datetime import datetime
+import orjson
+import codecs
+import csv
+import fcntl
+import json
 import os
-import uuid
+import re
+import hashlib
+import shutil
 import threading
-import pandas as pd
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from cachetools import TTLCache
+from cachetools.func import ttl_cache
+
+logger = get_logger(__name__)
 
 
 BULK_STEPS = [
@@ -26,6 +43,197 @@ BULK_STEPS = [
     {"step_number": 7, "name": "Generate PDF", "description": "Create final PDF report"},
 ]
 
+# (step_number, step_name) pairs for seeding job_steps; only job_id and timestamp vary per job
+_BULK_STEP_TEMPLATE = tuple((step['step_number'], step['name']) for step in BULK_STEPS)
+
+# Job progress (%) indexed by step_number: _STEP_PROGRESS[n] is the progress while
+# step n runs, which is also the progress once step n - 1 has finished
+# -> (0, 0, 14, 28, 42, 57, 71, 85, 100); index 0 is unused
+_STEP_PROGRESS = (0,) + tuple(int((n - 1) / len(BULK_STEPS) * 100) for n in range(1, len(BULK_STEPS) + 2))
+
+# Status-transition statements shared by the pipeline driver and the
+# continue/skip handlers. Paired job_steps/jobs changes are single CTE
+# statements, so each transition is one statement and one commit.
+_SQL_MARK_STEP_RUNNING = """
+    WITH step AS (
+        UPDATE job_steps 
+        SET status = 'running', started_at = CURRENT_TIMESTAMP
+        WHERE job_id = %s AND step_number = %s
+    )
+    UPDATE jobs SET current_step = %s, progress = %s, updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s
+"""
+
+_SQL_MARK_STEP_SUCCESS = """
+    UPDATE job_steps 
+    SET status = 'success', 
+        ended_at = CURRENT_TIMESTAMP,
+        output_files = %s,
+        message = %s
+    WHERE job_id = %s AND step_number = %s
+"""
+
+_SQL_MARK_STEP_SUCCESS_AT_CHECKPOINT = """
+    WITH step AS (
+        UPDATE job_steps 
+        SET status = 'success', 
+            ended_at = CURRENT_TIMESTAMP,
+            output_files = %s,
+            message = %s
+        WHERE job_id = %s AND step_number = %s
+    )
+    UPDATE jobs 
+    SET status = %s, progress = %s, current_step = %s, 
+        pdf_path = COALESCE(%s, pdf_path), updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s
+"""
+
+# Success of one step and start of the next in a single statement
+_SQL_ADVANCE_STEP = """
+    WITH done AS (
+        UPDATE job_steps 
+        SET status = 'success', 
+            ended_at = CURRENT_TIMESTAMP,
+            output_files = %s,
+            message = %s
+        WHERE job_id = %s AND step_number = %s
+    ), started AS (
+        UPDATE job_steps 
+        SET status = 'running', started_at = CURRENT_TIMESTAMP
+        WHERE job_id = %s AND step_number = %s
+    )
+    UPDATE jobs SET current_step = %s, progress = %s, updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s
+"""
+
+_SQL_MARK_STEP_FAILED = """
+    WITH step AS (
+        UPDATE job_steps 
+        SET status = 'failed', 
+            ended_at = CURRENT_TIMESTAMP,
+            message = %s
+        WHERE job_id = %s AND step_number = %s
+    )
+    UPDATE jobs SET status = 'failed', updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s
+"""
+
+_SQL_MARK_JOB_FAILED = """
+    UPDATE jobs 
+    SET status = 'failed', updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s
+"""
+
+# Leave a review checkpoint only if the job is still paused there, so two
+# concurrent "continue" clicks cannot both queue a pipeline run
+_SQL_RESUME_FROM_CHECKPOINT = """
+    UPDATE jobs 
+    SET status = 'processing', current_step = %s, updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s AND user_id = %s AND status = %s
+    RETURNING folder_path, date, time
+"""
+
+UPLOAD_BUFFER_SIZE = 4 * 1024 * 1024
+UPLOAD_SNIFF_SIZE = 1024
+
+# Characters not allowed in uploaded chart filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^0-9A-Za-z]')
+
+# Bounded pool for background pipeline runs; extra jobs queue instead of spawning threads
+_PIPELINE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv('BULK_WORKERS', '4')),
+    thread_name_prefix='bulk-pipeline'
+)
+_pipeline_queue_depth = 0
+_pipeline_queue_lock = threading.Lock()
+# Latest queued/running pipeline future per job (guarded by _pipeline_queue_lock)
+_pipeline_futures = {}
+
+# Separate small pool for deleting job folders so cleanup never waits behind pipelines
+_CLEANUP_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='bulk-cleanup')
+
+
+def _mark_failed(job_id, step_num=None, error=None):
+    """Mark a job failed, along with the step that was running when it failed"""
+    with get_db_cursor(commit=True) as cursor:
+        if step_num is None:
+            cursor.execute(_SQL_MARK_JOB_FAILED, (job_id,))
+        else:
+            cursor.execute(_SQL_MARK_STEP_FAILED, (error or 'Unknown error', job_id, step_num, job_id))
+
+
+def _pipeline_done(job_id, future):
+    global _pipeline_queue_depth
+    with _pipeline_queue_lock:
+        _pipeline_queue_depth -= 1
+        if _pipeline_futures.get(job_id) is future:
+            del _pipeline_futures[job_id]
+    
+    if future.cancelled():
+        return
+    
+    # run_bulk_pipeline records its own step failures; this only catches errors that escape it
+    error = future.exception()
+    if error is not None:
+        logger.error("Pipeline run for job %s crashed: %s", job_id, error)
+        _mark_failed(job_id)
+
+
+def _submit_pipeline(job_id, *args, **kwargs):
+    """Queue a run_bulk_pipeline call for a job on the bounded worker pool"""
+    global _pipeline_queue_depth
+    with _pipeline_queue_lock:
+        _pipeline_queue_depth += 1
+        depth = _pipeline_queue_depth
+        future = _PIPELINE_POOL.submit(run_bulk_pipeline, job_id, *args, **kwargs)
+        _pipeline_futures[job_id] = future
+    future.add_done_callback(lambda f: _pipeline_done(job_id, f))
+    logger.info("Bulk pipeline queued (%d queued or running)", depth)
+    return future
+
+
+@lru_cache(maxsize=64)
+def _step4_preview_payload(csv_path, mtime_ns, size):
+    """Serialized Step 4 preview for one version (mtime/size) of a CSV file"""
+    import pandas as pd
+    import numpy as np
+    
+    df = pd.read_csv(csv_path)
+    
+    # NaN/inf -> None in one vectorized pass instead of a per-cell loop
+    cleaned = df.replace([np.inf, -np.inf], np.nan)
+    data = cleaned.astype(object).where(cleaned.notna(), None).to_dict('records')
+    
+    return orjson.dumps(
+        {'success': True, 'data': data, 'columns': df.columns.tolist()},
+        default=json_default,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+@ttl_cache(maxsize=4096, ttl=5.0)
+def _find_bulk_pdf(folder_path):
+    """Locate the generated (unsigned) PDF in a job folder; cached briefly per folder"""
+    pdf_folder = os.path.join(resolve_job_folder_path(folder_path), 'pdf')
+    try:
+        with os.scandir(pdf_folder) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pdf') and not entry.name.startswith('bulk_rationale_signed'):
+                    return entry.path
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _bulk_pdf_path(folder_path, pdf_path):
+    """Absolute path of a job's generated PDF from its jobs.pdf_path (relative to the job folder)"""
+    if pdf_path:
+        candidate = os.path.join(resolve_job_folder_path(folder_path), pdf_path)
+        if os.path.exists(candidate):
+            return candidate
+    # Jobs finished before pdf_path was recorded (or whose file moved) fall back to a folder scan
+    return _find_bulk_pdf(folder_path)
+
 
 def run_bulk_pipeline(job_id, job_folder, call_date, call_time, start_step=1, end_step=None):
     """Run the bulk rationale pipeline in background
@@ -59,129 +267,224 @@ def run_bulk_pipeline(job_id, job_folder, call_date, call_time, start_step=1, en
     ]
     
     try:
+        # Success params of the previous step, written together with this step's start
+        finished_step_params = None
+        # Step whose row is still 'running' in the database, if any
+        running_step = None
+            
         for step_num, step_name, step_func, step_args in steps:
             if step_num < start_step:
-                print(f"⏭️ Skipping Step {step_num}: {step_name} (already completed)")
+                logger.info("Skipping Step %d: %s (already completed)", step_num, step_name)
                 continue
-            
+                
             if end_step is not None and step_num > end_step:
-                print(f"⏸️ Pausing before Step {step_num}: {step_name}")
+                logger.info("Pausing before Step %d: %s", step_num, step_name)
                 break
+                    
+            running_params = (job_id, step_num, step_num, _STEP_PROGRESS[step_num], job_id)
                 
             with get_db_cursor(commit=True) as cursor:
-                cursor.execute("""
-                    UPDATE job_steps 
-                    SET status = 'running', started_at = %s
-                    WHERE job_id = %s AND step_number = %s
-                """, (datetime.now(), job_id, step_num))
+                if finished_step_params:
+                    cursor.execute(_SQL_ADVANCE_STEP, finished_step_params + running_params)
+                    finished_step_params = None
+                else:
+                    cursor.execute(_SQL_MARK_STEP_RUNNING, running_params)
+            running_step = step_num
+                
+            logger.info("=== Step %d: %s ===", step_num, step_name)
                 
-                cursor.execute("""
-                    UPDATE jobs SET current_step = %s, progress = %s, updated_at = %s
-                    WHERE id = %s
-                """, (step_num, int((step_num - 1) / 7 * 100), datetime.now(), job_id))
-            
-            print(f"\n{'='*60}")
-            print(f"Running Step {step_num}: {step_name}")
-            print(f"{'='*60}")
-            
             result = step_func(*step_args)
-            
-            if result.get('success'):
-                with get_db_cursor(commit=True) as cursor:
-                    output_files = [result.get('output_file')] if result.get('output_file') else []
-                    cursor.execute("""
-                        UPDATE job_steps 
-                        SET status = 'success', 
-                            ended_at = %s,
-                            output_files = %s,
-                            message = %s
-                        WHERE job_id = %s AND step_number = %s
-                    """, (datetime.now(), output_files, f"Step {step_num} completed", job_id, step_num))
                 
-                # After Step 4 completes, pause for CSV review
+            if result.get('success'):
+                output_files = [result.get('output_file')] if result.get('output_file') else []
+                failed_charts = result.get('failed_charts', []) if step_num == 6 else []
+                    
+                if failed_charts:
+                    # Store failed charts info in job_steps message
+                    step_message = Json({'failed_charts': failed_charts, 'success_count': result.get('success_count', 0)})
+                else:
+                    step_message = f"Step {step_num} completed"
+                    
+                # Checkpoints: pause after Step 4 for CSV review, pause after Step 6 if
+                # any chart failed, and mark the PDF ready once Step 7 is done
+                job_status, pdf_path = None, None
                 if step_num == 4:
+                    job_status, job_progress = 'awaiting_step4_review', _STEP_PROGRESS[5]
+                elif failed_charts:
+                    job_status, job_progress = 'awaiting_chart_upload', _STEP_PROGRESS[7]
+                elif step_num == 7:
+                    job_status, job_progress = 'pdf_ready', _STEP_PROGRESS[8]
+                    # Stored relative to the job folder so relocated folders still resolve
+                    pdf_path = os.path.relpath(
+                        resolve_job_folder_path(result.get('output_file')),
+                        resolve_job_folder_path(job_folder)
+                    )
+                    
+                step_params = (output_files, step_message, job_id, step_num)
+                next_step_runs = step_num < len(steps) and (end_step is None or step_num < end_step)
+                    
+                if not job_status and next_step_runs:
+                    # Nothing happens between here and the next step's start, so
+                    # record this success in the same statement as that start
+                    finished_step_params = step_params
+                else:
                     with get_db_cursor(commit=True) as cursor:
-                        cursor.execute("""
-                            UPDATE jobs 
-                            SET status = 'awaiting_step4_review', progress = 57, updated_at = %s
-                            WHERE id = %s
-                        """, (datetime.now(), job_id))
-                    print(f"Job {job_id}: Paused after Step 4 for mapped master file CSV review")
+                        if job_status:
+                            cursor.execute(
+                                _SQL_MARK_STEP_SUCCESS_AT_CHECKPOINT,
+                                step_params + (job_status, job_progress, step_num, pdf_path, job_id)
+                            )
+                        else:
+                            cursor.execute(_SQL_MARK_STEP_SUCCESS, step_params)
+                    running_step = None
+                    
+                if step_num == 4:
+                    logger.info("Job %s: Paused after Step 4 for mapped master file CSV review", job_id)
                     return
-                
-                # After Step 6 (Generate Charts), check for failed charts
-                if step_num == 6:
-                    failed_charts = result.get('failed_charts', [])
-                    if failed_charts:
-                        import json
-                        with get_db_cursor(commit=True) as cursor:
-                            cursor.execute("""
-                                UPDATE jobs 
-                                SET status = 'awaiting_chart_upload', progress = 85, updated_at = %s
-                                WHERE id = %s
-                            """, (datetime.now(), job_id))
-                            
-                            # Store failed charts info in job_steps message
-                            cursor.execute("""
-                                UPDATE job_steps 
-                                SET message = %s
-                                WHERE job_id = %s AND step_number = %s
-                            """, (json.dumps({'failed_charts': failed_charts, 'success_count': result.get('success_count', 0)}), job_id, step_num))
-                        
-                        print(f"Job {job_id}: Paused after Step 6 - {len(failed_charts)} chart(s) need manual upload")
-                        return
-            else:
-                with get_db_cursor(commit=True) as cursor:
-                    cursor.execute("""
-                        UPDATE job_steps 
-                        SET status = 'failed', 
-                            ended_at = %s,
-                            message = %s
-                        WHERE job_id = %s AND step_number = %s
-                    """, (datetime.now(), result.get('error', 'Unknown error'), job_id, step_num))
                     
-                    cursor.execute("""
-                        UPDATE jobs SET status = 'failed', updated_at = %s
-                        WHERE id = %s
-                    """, (datetime.now(), job_id))
-                
-                print(f"❌ Step {step_num} failed: {result.get('error')}")
+                if failed_charts:
+                    logger.info("Job %s: Paused after Step 6 - %d chart(s) need manual upload", job_id, len(failed_charts))
+                    return
+                    
+                if step_num == 7:
+                    logger.info("Bulk Rationale pipeline completed for job %s", job_id)
+            else:
+                logger.error("Step %d failed: %s", step_num, result.get('error'))
+                _mark_failed(job_id, step_num, result.get('error'))
                 return
-        
-        # Only mark as pdf_ready if we completed all steps
-        if end_step is None or end_step >= 7:
-            with get_db_cursor(commit=True) as cursor:
-                cursor.execute("""
-                    UPDATE jobs 
-                    SET status = 'pdf_ready', progress = 100, current_step = 7, updated_at = %s
-                    WHERE id = %s
-                """, (datetime.now(), job_id))
             
-            print(f"\n✅ Bulk Rationale pipeline completed for job {job_id}")
-        
     except Exception as e:
-        print(f"❌ Pipeline error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
-                UPDATE jobs SET status = 'failed', updated_at = %s
-                WHERE id = %s
-            """, (datetime.now(), job_id))
+        logger.exception("Pipeline error")
+        _mark_failed(job_id, running_step, str(e))
+
+
+# job_id -> resolved folder_path; a job's folder never moves, so entries only
+# need dropping when the job is deleted
+_JOB_PATH_CACHE = TTLCache(maxsize=4096, ttl=300)
+_job_path_lock = threading.Lock()
+
+# Chart uploads waiting to be applied, per job: {job_id: {stock_index: chart_path}}
+_pending_chart_uploads = {}
+_pending_chart_lock = threading.Lock()
+_CHART_UPLOAD_LOCKS = tuple(threading.Lock() for _ in range(16))
 
 
 def _job_path(job_id, *path_parts):
     """Helper to get path within job folder"""
+    with _job_path_lock:
+        folder_path = _JOB_PATH_CACHE.get(job_id)
+    if folder_path is not None:
+        return os.path.join(folder_path, *path_parts)
+    
     with get_db_cursor() as cursor:
         cursor.execute("SELECT folder_path FROM jobs WHERE id = %s", (job_id,))
         result = cursor.fetchone()
         if result:
             folder_path = resolve_job_folder_path(result['folder_path'])
+            with _job_path_lock:
+                _JOB_PATH_CACHE[job_id] = folder_path
             return os.path.join(folder_path, *path_parts)
     return None
 
 
+def _peek_upload(file, size):
+    """Read the first bytes of an uploaded file and rewind it for saving"""
+    head = file.stream.read(size)
+    file.stream.seek(0)
+    return head
+
+
+def _looks_like_csv(head):
+    """Cheap text check on the start of an upload: non-empty UTF-8 without NUL bytes"""
+    if not head.strip() or b'\x00' in head:
+        return False
+    try:
+        # Incremental decode tolerates a multi-byte character cut off at the end
+        codecs.getincrementaldecoder('utf-8')().decode(head)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _read_csv_row(csv_path, index):
+    """Parse a CSV only as far as one data row (0-based); None if it has fewer rows"""
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        return next(islice(csv.DictReader(f), index, None), None)
+
+
+def _write_json_atomic(path, data, **dump_kwargs):
+    """Write JSON to a temp file, fsync it and rename it over path"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _apply_chart_upload(job_id, analysis_folder, stock_index, chart_path):
+    """
+    Record an uploaded chart in chart_overrides.json and drop it from failed_charts.json.
+    
+    Uploads are group-committed: whichever request holds the job's lock applies
+    every upload queued so far with one rewrite of each file and one step update,
+    so a burst of uploads does not rewrite (and fsync) the files once per chart.
+    Returns once this upload has been written; raises if writing it failed.
+    """
+    with _pending_chart_lock:
+        _pending_chart_uploads.setdefault(job_id, {})[stock_index] = chart_path
+    
+    # In-process stripe lock, plus flock for other worker processes
+    with _CHART_UPLOAD_LOCKS[hash(job_id) % len(_CHART_UPLOAD_LOCKS)], \
+            open(os.path.join(analysis_folder, '.chart_uploads.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        
+        with _pending_chart_lock:
+            batch = _pending_chart_uploads.pop(job_id, None)
+        if not batch:
+            # An earlier lock holder already wrote this upload
+            return
+        
+        overrides_file = os.path.join(analysis_folder, 'chart_overrides.json')
+        try:
+            overrides = {}
+            if os.path.exists(overrides_file):
+                with open(overrides_file, 'r', encoding='utf-8') as f:
+                    overrides = json.load(f)
+            overrides.update((str(index), path) for index, path in batch.items())
+            _write_json_atomic(overrides_file, overrides)
+        except Exception:
+            # Hand the other requests' uploads back so each of them retries its own
+            # write under the lock (without clobbering anything queued since)
+            if batch.get(stock_index) == chart_path:
+                del batch[stock_index]
+            if batch:
+                with _pending_chart_lock:
+                    pending = _pending_chart_uploads.setdefault(job_id, {})
+                    for index, path in batch.items():
+                        pending.setdefault(index, path)
+            raise
+        
+        failed_charts_file = os.path.join(analysis_folder, 'failed_charts.json')
+        if os.path.exists(failed_charts_file):
+            try:
+                with open(failed_charts_file, 'r', encoding='utf-8') as f:
+                    failed_list = json.load(f)
+                
+                failed_list = [fc for fc in failed_list if fc.get('index') not in batch]
+                _write_json_atomic(failed_charts_file, failed_list, indent=2)
+                
+                with get_db_cursor(commit=True) as cursor:
+                    cursor.execute("""
+                        UPDATE job_steps 
+                        SET message = jsonb_set(message::jsonb, '{failed_charts}', %s)::text
+                        WHERE job_id = %s AND step_number = 6 AND message LIKE '{%%'
+                    """, (Json(failed_list), job_id))
+                
+            except Exception as e:
+                logger.error("Error updating failed charts list: %s", e)
+
+
 def check_job_access(job_id, user_id):
     """Check if user has access to job"""
     with get_db_cursor() as cursor:
@@ -211,62 +514,69 @@ def create_job():
         if not channel_id or not call_date or not input_text.strip():
             return jsonify({'error': 'Channel, date, and input text are required'}), 400
         
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
-                SELECT channel_name, platform FROM channels WHERE id = %s
-            """, (channel_id,))
-            channel = cursor.fetchone()
-            
-            if not channel:
-                return jsonify({'error': 'Channel not found'}), 404
-            
-            channel_name = channel['channel_name']
-            platform = channel['platform']
-            
-            job_id = f"bulk-{uuid.uuid4().hex[:8]}"
-            title = f"{platform} - {channel_name} - {call_date}"
-            
-            job_folder = f"backend/job_files/{job_id}"
-            os.makedirs(job_folder, exist_ok=True)
-            os.makedirs(os.path.join(job_folder, 'analysis'), exist_ok=True)
-            os.makedirs(os.path.join(job_folder, 'charts'), exist_ok=True)
-            os.makedirs(os.path.join(job_folder, 'pdf'), exist_ok=True)
-            
-            input_file_path = os.path.join(job_folder, 'bulk-input.txt')
-            with open(input_file_path, 'w', encoding='utf-8') as f:
-                f.write(input_text)
-            
-            cursor.execute("""
-                INSERT INTO jobs (id, youtube_url, title, channel_id, date, time, 
-                                  user_id, tool_used, status, progress, current_step, folder_path,
-                                  created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                job_id, youtube_url, title, channel_id, call_date, call_time,
-                current_user_id, 'Bulk Rationale', 'processing', 0, 0, job_folder,
-                datetime.now(), datetime.now()
-            ))
-            
-            for step in BULK_STEPS:
-                cursor.execute("""
-                    INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, step['step_number'], step['name'], 'pending', datetime.now()))
-            
-            create_activity_log(
-                current_user_id,
-                'job_started',
-                f'Started Bulk Rationale: {title}',
-                job_id,
-                'Bulk Rationale'
-            )
+        job_id = new_job_id('bulk')
+        job_folder = f"backend/job_files/{job_id}"
+        now = datetime.now()
+        
+        # Set up the job folder before opening the transaction so it only covers DB work
+        # (the folder is new for this job_id, so the subfolders are plain mkdir calls)
+        os.makedirs(job_folder)
+        for subfolder in ('analysis', 'charts', 'pdf'):
+            os.mkdir(os.path.join(job_folder, subfolder))
+        
+        input_file_path = os.path.join(job_folder, 'bulk-input.txt')
+        with open(input_file_path, 'w', encoding='utf-8') as f:
+            f.write(input_text)
         
-        thread = threading.Thread(
-            target=run_bulk_pipeline,
-            args=(job_id, job_folder, call_date, call_time)
-        )
-        thread.daemon = True
-        thread.start()
+        try:
+            with get_db_cursor(commit=True) as cursor:
+                # Channel lookup and job insert in one statement; no row means no channel
+                cursor.execute("""
+                    WITH c AS (
+                        SELECT channel_name, platform FROM channels WHERE id = %s
+                    )
+                    INSERT INTO jobs (id, youtube_url, title, channel_id, date, time, 
+                                      user_id, tool_used, status, progress, current_step, folder_path,
+                                      created_at, updated_at)
+                    SELECT %s, %s, concat(c.platform, ' - ', c.channel_name, ' - ', %s::text),
+                           %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                    FROM c
+                    RETURNING id, title
+                """, (
+                    channel_id,
+                    job_id, youtube_url, call_date, channel_id, call_date, call_time,
+                    current_user_id, 'Bulk Rationale', 'processing', 0, 0, job_folder,
+                    now, now
+                ))
+                
+                created = cursor.fetchone()
+                
+                if created:
+                    execute_values(cursor, """
+                        INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
+                        VALUES %s
+                    """, [(job_id, number, name, 'pending', now) for number, name in _BULK_STEP_TEMPLATE],
+                       page_size=len(_BULK_STEP_TEMPLATE))
+                    
+                    create_activity_log(
+                        current_user_id,
+                        'job_started',
+                        f'Started Bulk Rationale: {created["title"]}',
+                        job_id,
+                        'Bulk Rationale',
+                        cursor=cursor
+                    )
+        except Exception:
+            shutil.rmtree(job_folder, ignore_errors=True)
+            raise
+        
+        if not created:
+            shutil.rmtree(job_folder, ignore_errors=True)
+            return jsonify({'error': 'Channel not found'}), 404
+        
+        title = created['title']
+        
+        _submit_pipeline(job_id, job_folder, call_date, call_time)
         
         return jsonify({
             'success': True,
@@ -276,9 +586,7 @@ def create_job():
         }), 200
         
     except Exception as e:
-        print(f"Error creating bulk job: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error creating bulk job")
         return jsonify({'error': str(e)}), 500
 
 
@@ -291,7 +599,10 @@ def get_job(job_id):
         
         with get_db_cursor() as cursor:
             cursor.execute("""
-                SELECT j.*, c.channel_name, c.platform
+                SELECT j.*, c.channel_name, c.platform,
+                       (SELECT md5(string_agg(concat_ws('|', s.status, s.message, s.started_at, s.ended_at),
+                                              ',' ORDER BY s.step_number))
+                        FROM job_steps s WHERE s.job_id = j.id) AS steps_version
                 FROM jobs j
                 LEFT JOIN channels c ON j.channel_id = c.id
                 WHERE j.id = %s AND j.user_id = %s
@@ -302,6 +613,18 @@ def get_job(job_id):
             if not job:
                 return jsonify({'error': 'Job not found'}), 404
             
+            # Progress polls usually see no change; answer those with a 304
+            # before loading steps, scanning the PDF folder or serializing
+            etag = hashlib.md5(
+                f"{job['status']}|{job['progress']}|{job['current_step']}|{job['updated_at']}|{job['steps_version']}".encode()
+            ).hexdigest()
+            
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'no-cache, must-revalidate'
+                return response
+            
             cursor.execute("""
                 SELECT * FROM job_steps 
                 WHERE job_id = %s 
@@ -312,12 +635,7 @@ def get_job(job_id):
             
             pdf_path = None
             if job['status'] in ['pdf_ready', 'completed', 'signed']:
-                resolved_folder = resolve_job_folder_path(job['folder_path'])
-                pdf_folder = os.path.join(resolved_folder, 'pdf')
-                if os.path.exists(pdf_folder):
-                    pdf_files = [f for f in os.listdir(pdf_folder) if f.endswith('.pdf') and not f.startswith('bulk_rationale_signed')]
-                    if pdf_files:
-                        pdf_path = os.path.join(pdf_folder, pdf_files[0])
+                pdf_path = _bulk_pdf_path(job['folder_path'], job['pdf_path'])
             
             cursor.execute("""
                 SELECT unsigned_pdf_path, signed_pdf_path, sign_status
@@ -326,7 +644,7 @@ def get_job(job_id):
             """, (job_id,))
             saved = cursor.fetchone()
         
-        return jsonify({
+        payload = {
             'jobId': job['id'],
             'title': job['title'],
             'status': job['status'],
@@ -341,13 +659,19 @@ def get_job(job_id):
             'unsignedPdfPath': saved['unsigned_pdf_path'] if saved else None,
             'signedPdfPath': saved['signed_pdf_path'] if saved else None,
             'signStatus': saved['sign_status'] if saved else None,
-            'job_steps': [dict(s) for s in steps],
+            'job_steps': steps,
             'createdAt': job['created_at'].isoformat() if job['created_at'] else None,
             'updatedAt': job['updated_at'].isoformat() if job['updated_at'] else None
-        }), 200
+        }
+        
+        # Step rows are serialized as-is by the app's orjson provider
+        response = current_app.json.response(payload)
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache, must-revalidate'
+        return response, 200
         
     except Exception as e:
-        print(f"Error getting job: {str(e)}")
+        logger.error("Error getting job: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -358,24 +682,31 @@ def delete_job(job_id):
     try:
         current_user_id = get_jwt_identity()
         
+        # job_steps and saved_rationale rows go with the job (ON DELETE CASCADE)
         with get_db_cursor(commit=True) as cursor:
             cursor.execute("""
-                SELECT folder_path FROM jobs 
+                DELETE FROM jobs 
                 WHERE id = %s AND user_id = %s
+                RETURNING folder_path
             """, (job_id, current_user_id))
             
             job = cursor.fetchone()
             
             if not job:
                 return jsonify({'error': 'Job not found'}), 404
-            
-            cursor.execute("DELETE FROM saved_rationale WHERE job_id = %s", (job_id,))
-            cursor.execute("DELETE FROM job_steps WHERE job_id = %s", (job_id,))
-            cursor.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
-            
-            if job['folder_path'] and os.path.exists(job['folder_path']):
-                import shutil
-                shutil.rmtree(job['folder_path'], ignore_errors=True)
+        
+        with _job_path_lock:
+            _JOB_PATH_CACHE.pop(job_id, None)
+        
+        # Drop a run that is still waiting in the queue for this job
+        with _pipeline_queue_lock:
+            future = _pipeline_futures.get(job_id)
+        if future is not None:
+            future.cancel()
+        
+        # The job is gone once the DELETEs commit; the folder walk happens off the request thread
+        if job['folder_path'] and os.path.exists(job['folder_path']):
+            _CLEANUP_POOL.submit(shutil.rmtree, job['folder_path'], ignore_errors=True)
         
         return jsonify({
             'success': True,
@@ -383,7 +714,7 @@ def delete_job(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error deleting job: {str(e)}")
+        logger.error("Error deleting job: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -410,43 +741,47 @@ def save_job(job_id):
             if job['status'] not in ['pdf_ready', 'completed']:
                 return jsonify({'error': 'PDF not ready yet'}), 400
             
-            cursor.execute("SELECT id FROM saved_rationale WHERE job_id = %s", (job_id,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                return jsonify({'error': 'Job already saved'}), 400
-            
             pdf_path = os.path.join(job['folder_path'], 'pdf', 'bulk_rationale.pdf')
             
             if not os.path.exists(pdf_path):
                 return jsonify({'error': 'PDF file not found'}), 404
             
+            # The unique job_id decides whether this request saves the job;
+            # the job is only marked completed when the row was inserted
             cursor.execute("""
-                INSERT INTO saved_rationale (
-                    job_id, tool_used, channel_id, title, date, youtube_url,
-                    unsigned_pdf_path, sign_status, created_at, updated_at
+                WITH saved AS (
+                    INSERT INTO saved_rationale (
+                        job_id, tool_used, channel_id, title, date, youtube_url,
+                        unsigned_pdf_path, sign_status, created_at, updated_at
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (job_id) DO NOTHING
+                    RETURNING id, job_id
+                ), completed AS (
+                    UPDATE jobs SET status = 'completed', updated_at = CURRENT_TIMESTAMP
+                    WHERE id IN (SELECT job_id FROM saved)
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
+                SELECT id FROM saved
             """, (
                 job_id, 'Bulk Rationale', job['channel_id'], job['title'],
                 job['date'], job['youtube_url'], pdf_path, 'Unsigned',
                 datetime.now(), datetime.now()
             ))
             
-            rationale_id = cursor.fetchone()['id']
+            saved = cursor.fetchone()
             
-            cursor.execute("""
-                UPDATE jobs SET status = 'completed', updated_at = %s
-                WHERE id = %s
-            """, (datetime.now(), job_id))
+            if not saved:
+                return jsonify({'error': 'Job already saved'}), 400
+            
+            rationale_id = saved['id']
             
             create_activity_log(
                 current_user_id,
                 'job_completed',
                 f'Saved Bulk Rationale: {job["title"]}',
                 job_id,
-                'Bulk Rationale'
+                'Bulk Rationale',
+                cursor=cursor
             )
         
         return jsonify({
@@ -456,7 +791,7 @@ def save_job(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error saving job: {str(e)}")
+        logger.error("Error saving job: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -469,7 +804,7 @@ def download_pdf(job_id):
         
         with get_db_cursor() as cursor:
             cursor.execute("""
-                SELECT folder_path FROM jobs 
+                SELECT folder_path, pdf_path FROM jobs 
                 WHERE id = %s AND user_id = %s
             """, (job_id, current_user_id))
             
@@ -478,27 +813,19 @@ def download_pdf(job_id):
             if not job:
                 return jsonify({'error': 'Job not found'}), 404
         
-        resolved_folder = resolve_job_folder_path(job['folder_path'])
-        pdf_folder = os.path.join(resolved_folder, 'pdf')
-        
-        pdf_path = None
-        if os.path.exists(pdf_folder):
-            pdf_files = [f for f in os.listdir(pdf_folder) if f.endswith('.pdf') and not f.startswith('bulk_rationale_signed')]
-            if pdf_files:
-                pdf_path = os.path.join(pdf_folder, pdf_files[0])
+        pdf_path = _bulk_pdf_path(job['folder_path'], job['pdf_path'])
         
         if not pdf_path or not os.path.exists(pdf_path):
             return jsonify({'error': 'PDF not found'}), 404
         
-        return send_file(
-            pdf_path,
-            as_attachment=False,
-            download_name=os.path.basename(pdf_path),
-            mimetype='application/pdf'
-        )
+        try:
+            return stream_file(pdf_path, 'application/pdf', download_name=os.path.basename(pdf_path))
+        except FileNotFoundError:
+            # Removed between the check and the open (e.g. a regenerated PDF)
+            return jsonify({'error': 'PDF not found'}), 404
         
     except Exception as e:
-        print(f"Error downloading PDF: {str(e)}")
+        logger.error("Error downloading PDF: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -520,7 +847,11 @@ def upload_signed_pdf(job_id):
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({'error': 'Only PDF files allowed'}), 400
         
-        with get_db_cursor(commit=True) as cursor:
+        # Reject non-PDF content before it can replace an existing signed PDF
+        if not _peek_upload(file, 5).startswith(b'%PDF-'):
+            return jsonify({'error': 'File is not a valid PDF'}), 400
+        
+        with get_db_cursor() as cursor:
             cursor.execute("""
                 SELECT j.folder_path, sr.id as rationale_id
                 FROM jobs j
@@ -530,28 +861,30 @@ def upload_signed_pdf(job_id):
             
             job = cursor.fetchone()
             
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
-            
-            if not job['rationale_id']:
-                return jsonify({'error': 'Please save the job first'}), 400
-            
-            signed_filename = f'bulk_rationale_signed.pdf'
-            signed_path = os.path.join(job['folder_path'], 'pdf', signed_filename)
-            
-            file.save(signed_path)
-            
-            cursor.execute("""
-                UPDATE saved_rationale
-                SET signed_pdf_path = %s, sign_status = 'Signed', 
-                    signed_uploaded_at = %s, updated_at = %s
-                WHERE job_id = %s
-            """, (signed_path, datetime.now(), datetime.now(), job_id))
-            
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if not job['rationale_id']:
+            return jsonify({'error': 'Please save the job first'}), 400
+        
+        signed_filename = f'bulk_rationale_signed.pdf'
+        signed_path = os.path.join(job['folder_path'], 'pdf', signed_filename)
+        
+        # Write the upload before opening the write transaction so no row
+        # locks are held while the file streams to disk
+        file.save(signed_path, buffer_size=UPLOAD_BUFFER_SIZE)
+        
+        with get_db_cursor(commit=True) as cursor:
             cursor.execute("""
+                WITH signed AS (
+                    UPDATE saved_rationale
+                    SET signed_pdf_path = %s, sign_status = 'Signed', 
+                        signed_uploaded_at = %s, updated_at = %s
+                    WHERE job_id = %s
+                )
                 UPDATE jobs SET status = 'signed', updated_at = %s
                 WHERE id = %s
-            """, (datetime.now(), job_id))
+            """, (signed_path, datetime.now(), datetime.now(), job_id, datetime.now(), job_id))
         
         return jsonify({
             'success': True,
@@ -560,7 +893,7 @@ def upload_signed_pdf(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error uploading signed PDF: {str(e)}")
+        logger.error("Error uploading signed PDF: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -570,40 +903,34 @@ def restart_step(job_id, step_number):
     """Restart a failed step"""
     try:
         current_user_id = get_jwt_identity()
+        now = datetime.now()
         
         with get_db_cursor(commit=True) as cursor:
+            # Ownership check, step reset and job update in one round trip
             cursor.execute("""
-                SELECT j.folder_path, j.date, j.time
-                FROM jobs j
-                WHERE j.id = %s AND j.user_id = %s
-            """, (job_id, current_user_id))
+                WITH owned AS (
+                    SELECT id FROM jobs WHERE id = %s AND user_id = %s
+                ), reset AS (
+                    UPDATE job_steps 
+                    SET status = 'pending', message = NULL, started_at = NULL, ended_at = NULL
+                    WHERE job_id IN (SELECT id FROM owned) AND step_number >= %s
+                )
+                UPDATE jobs j
+                SET status = 'processing', current_step = %s, updated_at = %s
+                FROM owned
+                WHERE j.id = owned.id
+                RETURNING j.folder_path, j.date, j.time
+            """, (job_id, current_user_id, step_number, step_number - 1, now))
             
             job = cursor.fetchone()
             
             if not job:
                 return jsonify({'error': 'Job not found'}), 404
-            
-            cursor.execute("""
-                UPDATE job_steps 
-                SET status = 'pending', message = NULL, started_at = NULL, ended_at = NULL
-                WHERE job_id = %s AND step_number >= %s
-            """, (job_id, step_number))
-            
-            cursor.execute("""
-                UPDATE jobs 
-                SET status = 'processing', current_step = %s, updated_at = %s
-                WHERE id = %s
-            """, (step_number - 1, datetime.now(), job_id))
         
-        call_date = str(job['date']) if job['date'] else datetime.now().strftime('%Y-%m-%d')
+        call_date = str(job['date']) if job['date'] else now.strftime('%Y-%m-%d')
         call_time = str(job['time']) if job['time'] else '10:00:00'
         
-        thread = threading.Thread(
-            target=run_bulk_pipeline,
-            args=(job_id, job['folder_path'], call_date, call_time, step_number)
-        )
-        thread.daemon = True
-        thread.start()
+        _submit_pipeline(job_id, job['folder_path'], call_date, call_time, step_number)
         
         return jsonify({
             'success': True,
@@ -611,7 +938,7 @@ def restart_step(job_id, step_number):
         }), 200
         
     except Exception as e:
-        print(f"Error restarting step: {str(e)}")
+        logger.error("Error restarting step: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -633,22 +960,14 @@ def get_step4_csv_preview(job_id):
         if not csv_path or not os.path.exists(csv_path):
             return jsonify({'error': 'mapped_master_file.csv not found'}), 404
         
-        df = pd.read_csv(csv_path)
+        # Re-parse only when the file changes (uploads and saved edits bump mtime/size)
+        st = os.stat(csv_path)
+        payload = _step4_preview_payload(csv_path, st.st_mtime_ns, st.st_size)
         
-        data = df.to_dict('records')
-        for row in data:
-            for key, value in row.items():
-                if pd.isna(value) or (isinstance(value, (int, float, np.number)) and not np.isfinite(value)):
-                    row[key] = None
-        
-        return jsonify({
-            'success': True,
-            'data': data,
-            'columns': df.columns.tolist()
-        }), 200
+        return current_app.response_class(payload, status=200, mimetype='application/json')
         
     except Exception as e:
-        print(f"Error getting Step 4 CSV preview: {str(e)}")
+        logger.error("Error getting Step 4 CSV preview: %s", e)
         return jsonify({'error': f'Failed to get CSV preview: {str(e)}'}), 500
 
 
@@ -668,15 +987,10 @@ def download_step4_csv(job_id):
         if not csv_path or not os.path.exists(csv_path):
             return jsonify({'error': 'mapped_master_file.csv not found'}), 404
         
-        return send_file(
-            csv_path,
-            as_attachment=True,
-            download_name='mapped_master_file.csv',
-            mimetype='text/csv'
-        )
+        return stream_file(csv_path, 'text/csv', download_name='mapped_master_file.csv', as_attachment=True)
         
     except Exception as e:
-        print(f"Error downloading Step 4 CSV: {str(e)}")
+        logger.error("Error downloading Step 4 CSV: %s", e)
         return jsonify({'error': f'Failed to download CSV: {str(e)}'}), 500
 
 
@@ -702,6 +1016,9 @@ def upload_step4_csv(job_id):
         if not file.filename.endswith('.csv'):
             return jsonify({'error': 'Only CSV files are allowed'}), 400
         
+        if not _looks_like_csv(_peek_upload(file, UPLOAD_SNIFF_SIZE)):
+            return jsonify({'error': 'File is not a valid CSV'}), 400
+        
         csv_path = _job_path(job_id, 'analysis', 'mapped_master_file.csv')
         
         if not csv_path:
@@ -709,7 +1026,11 @@ def upload_step4_csv(job_id):
         
         os.makedirs(os.path.dirname(csv_path), exist_ok=True)
         
-        file.save(csv_path)
+        # Stream to a sibling temp file and swap it in, so the preview and
+        # Step 5 never read a partially written CSV
+        tmp_path = f"{csv_path}.upload"
+        file.save(tmp_path, buffer_size=UPLOAD_BUFFER_SIZE)
+        os.replace(tmp_path, csv_path)
         
         return jsonify({
             'success': True,
@@ -717,7 +1038,7 @@ def upload_step4_csv(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error uploading Step 4 CSV: {str(e)}")
+        logger.error("Error uploading Step 4 CSV: %s", e)
         return jsonify({'error': f'Failed to upload CSV: {str(e)}'}), 500
 
 
@@ -728,51 +1049,20 @@ def step4_continue_pipeline(job_id):
     try:
         current_user_id = get_jwt_identity()
         
-        has_access, error_msg = check_job_access(job_id, current_user_id)
-        if not has_access:
-            return jsonify({'error': error_msg}), 403
-        
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT id, status, folder_path, date, time FROM jobs WHERE id = %s", (job_id,))
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(_SQL_RESUME_FROM_CHECKPOINT, (5, job_id, current_user_id, 'awaiting_step4_review'))
             job = cursor.fetchone()
-            
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
-            
-            if job['status'] != 'awaiting_step4_review':
-                return jsonify({'error': 'Job is not in awaiting_step4_review status'}), 400
         
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
-                UPDATE jobs 
-                SET status = 'processing', current_step = 5, updated_at = %s
-                WHERE id = %s
-            """, (datetime.now(), job_id))
+        if not job:
+            has_access, error_msg = check_job_access(job_id, current_user_id)
+            if not has_access:
+                return jsonify({'error': error_msg}), 403
+            return jsonify({'error': 'Job is not in awaiting_step4_review status'}), 400
         
         call_date = str(job['date']) if job['date'] else datetime.now().strftime('%Y-%m-%d')
         call_time = str(job['time']) if job['time'] else '10:00:00'
         
-        def run_remaining_steps():
-            try:
-                run_bulk_pipeline(
-                    job_id, 
-                    resolve_job_folder_path(job['folder_path']), 
-                    call_date, 
-                    call_time, 
-                    start_step=5
-                )
-            except Exception as e:
-                print(f"Error continuing pipeline from Step 5 for job {job_id}: {str(e)}")
-                with get_db_cursor(commit=True) as cursor:
-                    cursor.execute("""
-                        UPDATE jobs 
-                        SET status = 'failed', updated_at = %s
-                        WHERE id = %s
-                    """, (datetime.now(), job_id))
-        
-        thread = threading.Thread(target=run_remaining_steps)
-        thread.daemon = True
-        thread.start()
+        _submit_pipeline(job_id, resolve_job_folder_path(job['folder_path']), call_date, call_time, start_step=5)
         
         return jsonify({
             'success': True,
@@ -780,7 +1070,7 @@ def step4_continue_pipeline(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error continuing pipeline from Step 4: {str(e)}")
+        logger.error("Error continuing pipeline from Step 4: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -812,11 +1102,12 @@ def save_step4_edits(job_id):
         
         os.makedirs(os.path.dirname(csv_path), exist_ok=True)
         
+        import pandas as pd
         df = pd.DataFrame(csv_data)
         df = df[columns]
         df.to_csv(csv_path, index=False, encoding='utf-8-sig')
         
-        print(f"✅ Step 4 CSV saved with {len(csv_data)} rows for job {job_id}")
+        logger.info("Step 4 CSV saved with %d rows for job %s", len(csv_data), job_id)
         
         return jsonify({
             'success': True,
@@ -825,9 +1116,7 @@ def save_step4_edits(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error saving Step 4 edits: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error saving Step 4 edits")
         return jsonify({'error': f'Failed to save: {str(e)}'}), 500
 
 
@@ -843,36 +1132,53 @@ def get_failed_charts(job_id):
             return jsonify({'error': error_msg}), 403
         
         with get_db_cursor() as cursor:
-            cursor.execute("SELECT status, folder_path FROM jobs WHERE id = %s", (job_id,))
+            # Step 6 stores its failed-charts summary as a JSON object in message;
+            # other messages are plain text and are left unparsed, and malformed or
+            # unexpectedly shaped JSON counts as no summary, as the old per-row decode
+            # did. The response body is built as text in PostgreSQL, so the list is
+            # never decoded into Python objects and re-encoded on the way out
+            cursor.execute("""
+                SELECT j.status, j.folder_path,
+                       r.success_count,
+                       jsonb_array_length(r.failed_charts) AS failed_count,
+                       jsonb_build_object(
+                           'success', true,
+                           'failed_charts', r.failed_charts,
+                           'success_count', r.success_count,
+                           'status', j.status
+                       )::text AS body
+                FROM jobs j
+                LEFT JOIN job_steps s ON s.job_id = j.id AND s.step_number = 6
+                LEFT JOIN LATERAL (
+                    SELECT CASE WHEN s.message LIKE '{%%' THEN try_parse_jsonb(s.message) END AS data
+                ) p ON true
+                LEFT JOIN LATERAL (
+                    SELECT CASE WHEN jsonb_typeof(p.data) = 'object' THEN p.data END AS data
+                ) m ON true
+                CROSS JOIN LATERAL (
+                    SELECT CASE WHEN jsonb_typeof(m.data->'failed_charts') = 'array'
+                                THEN m.data->'failed_charts' ELSE '[]'::jsonb END AS failed_charts,
+                           CASE WHEN jsonb_typeof(m.data->'success_count') = 'number'
+                                THEN (m.data->>'success_count')::numeric::int ELSE 0 END AS success_count
+                ) r
+                WHERE j.id = %s
+            """, (job_id,))
             job = cursor.fetchone()
             
             if not job:
                 return jsonify({'error': 'Job not found'}), 404
-            
-            cursor.execute("""
-                SELECT message FROM job_steps 
-                WHERE job_id = %s AND step_number = 6
-            """, (job_id,))
-            step = cursor.fetchone()
         
-        failed_charts = []
-        success_count = 0
+        if job['failed_count']:
+            return current_app.response_class(job['body'], status=200, mimetype='application/json')
         
-        if step and step['message']:
-            try:
-                import json
-                data = json.loads(step['message'])
-                failed_charts = data.get('failed_charts', [])
-                success_count = data.get('success_count', 0)
-            except (json.JSONDecodeError, TypeError):
-                pass
+        failed_charts = []
+        success_count = job['success_count']
         
         job_folder = resolve_job_folder_path(job['folder_path'])
         failed_charts_file = os.path.join(job_folder, 'analysis', 'failed_charts.json')
         
-        if not failed_charts and os.path.exists(failed_charts_file):
+        if os.path.exists(failed_charts_file):
             try:
-                import json
                 with open(failed_charts_file, 'r', encoding='utf-8') as f:
                     failed_charts = json.load(f)
             except Exception:
@@ -886,7 +1192,7 @@ def get_failed_charts(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error getting failed charts: {str(e)}")
+        logger.error("Error getting failed charts: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -928,59 +1234,27 @@ def upload_chart(job_id, stock_index):
         if not os.path.exists(stocks_file):
             return jsonify({'error': 'Stocks CSV file not found'}), 404
         
-        df = pd.read_csv(stocks_file)
+        row = _read_csv_row(stocks_file, stock_index) if stock_index >= 0 else None
         
-        if stock_index < 0 or stock_index >= len(df):
+        if row is None:
             return jsonify({'error': 'Invalid stock index'}), 400
         
-        stock_name = str(df.iloc[stock_index].get('INPUT STOCK', f'stock_{stock_index}')).strip()
-        symbol = str(df.iloc[stock_index].get('STOCK SYMBOL', '')).strip()
+        stock_name = str(row.get('INPUT STOCK') or f'stock_{stock_index}').strip()
+        symbol = str(row.get('STOCK SYMBOL') or '').strip()
         
-        safe_name = ''.join(c if c.isalnum() else '_' for c in (symbol or stock_name))
+        safe_name = _UNSAFE_FILENAME_CHARS.sub('_', symbol or stock_name)
         filename = f"manual_{safe_name}_{stock_index}.{ext}"
         save_path = os.path.join(charts_folder, filename)
         
         chart_file.save(save_path)
         
         relative_path = f"charts/{filename}"
-        df.at[stock_index, 'CHART PATH'] = relative_path
-        df.to_csv(stocks_file, index=False, encoding='utf-8-sig')
         
-        failed_charts_file = os.path.join(analysis_folder, 'failed_charts.json')
-        if os.path.exists(failed_charts_file):
-            try:
-                import json
-                with open(failed_charts_file, 'r', encoding='utf-8') as f:
-                    failed_list = json.load(f)
-                
-                failed_list = [fc for fc in failed_list if fc.get('index') != stock_index]
-                
-                with open(failed_charts_file, 'w', encoding='utf-8') as f:
-                    json.dump(failed_list, f, indent=2)
-                
-                with get_db_cursor(commit=True) as cursor:
-                    cursor.execute("""
-                        SELECT message FROM job_steps 
-                        WHERE job_id = %s AND step_number = 6
-                    """, (job_id,))
-                    step = cursor.fetchone()
-                    
-                    if step and step['message']:
-                        try:
-                            data = json.loads(step['message'])
-                            data['failed_charts'] = failed_list
-                            cursor.execute("""
-                                UPDATE job_steps 
-                                SET message = %s
-                                WHERE job_id = %s AND step_number = 6
-                            """, (json.dumps(data), job_id))
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                    
-            except Exception as e:
-                print(f"Error updating failed charts list: {e}")
+        # Record the chart as an override instead of rewriting stocks_with_charts.csv;
+        # Step 7 applies the overrides when it loads the CSV
+        _apply_chart_upload(job_id, analysis_folder, stock_index, relative_path)
         
-        print(f"✅ Chart uploaded for stock {stock_name} (index {stock_index}): {filename}")
+        logger.info("Chart uploaded for stock %s (index %s): %s", stock_name, stock_index, filename)
         
         return jsonify({
             'success': True,
@@ -989,9 +1263,7 @@ def upload_chart(job_id, stock_index):
         }), 200
         
     except Exception as e:
-        print(f"Error uploading chart: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error uploading chart")
         return jsonify({'error': str(e)}), 500
 
 
@@ -1002,51 +1274,20 @@ def step6_continue_pipeline(job_id):
     try:
         current_user_id = get_jwt_identity()
         
-        has_access, error_msg = check_job_access(job_id, current_user_id)
-        if not has_access:
-            return jsonify({'error': error_msg}), 403
-        
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT id, status, folder_path, date, time FROM jobs WHERE id = %s", (job_id,))
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(_SQL_RESUME_FROM_CHECKPOINT, (7, job_id, current_user_id, 'awaiting_chart_upload'))
             job = cursor.fetchone()
-            
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
-            
-            if job['status'] != 'awaiting_chart_upload':
-                return jsonify({'error': 'Job is not in awaiting_chart_upload status'}), 400
         
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
-                UPDATE jobs 
-                SET status = 'processing', current_step = 7, updated_at = %s
-                WHERE id = %s
-            """, (datetime.now(), job_id))
+        if not job:
+            has_access, error_msg = check_job_access(job_id, current_user_id)
+            if not has_access:
+                return jsonify({'error': error_msg}), 403
+            return jsonify({'error': 'Job is not in awaiting_chart_upload status'}), 400
         
         call_date = str(job['date']) if job['date'] else datetime.now().strftime('%Y-%m-%d')
         call_time = str(job['time']) if job['time'] else '10:00:00'
         
-        def run_pdf_step():
-            try:
-                run_bulk_pipeline(
-                    job_id, 
-                    resolve_job_folder_path(job['folder_path']), 
-                    call_date, 
-                    call_time, 
-                    start_step=7
-                )
-            except Exception as e:
-                print(f"Error running PDF step for job {job_id}: {str(e)}")
-                with get_db_cursor(commit=True) as cursor:
-                    cursor.execute("""
-                        UPDATE jobs 
-                        SET status = 'failed', updated_at = %s
-                        WHERE id = %s
-                    """, (datetime.now(), job_id))
-        
-        thread = threading.Thread(target=run_pdf_step)
-        thread.daemon = True
-        thread.start()
+        _submit_pipeline(job_id, resolve_job_folder_path(job['folder_path']), call_date, call_time, start_step=7)
         
         return jsonify({
             'success': True,
@@ -1054,7 +1295,7 @@ def step6_continue_pipeline(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error continuing to PDF generation: {str(e)}")
+        logger.error("Error continuing to PDF generation: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1065,51 +1306,20 @@ def skip_failed_charts(job_id):
     try:
         current_user_id = get_jwt_identity()
         
-        has_access, error_msg = check_job_access(job_id, current_user_id)
-        if not has_access:
-            return jsonify({'error': error_msg}), 403
-        
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT id, status, folder_path, date, time FROM jobs WHERE id = %s", (job_id,))
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(_SQL_RESUME_FROM_CHECKPOINT, (7, job_id, current_user_id, 'awaiting_chart_upload'))
             job = cursor.fetchone()
-            
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
-            
-            if job['status'] != 'awaiting_chart_upload':
-                return jsonify({'error': 'Job is not in awaiting_chart_upload status'}), 400
         
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
-                UPDATE jobs 
-                SET status = 'processing', current_step = 7, updated_at = %s
-                WHERE id = %s
-            """, (datetime.now(), job_id))
+        if not job:
+            has_access, error_msg = check_job_access(job_id, current_user_id)
+            if not has_access:
+                return jsonify({'error': error_msg}), 403
+            return jsonify({'error': 'Job is not in awaiting_chart_upload status'}), 400
         
         call_date = str(job['date']) if job['date'] else datetime.now().strftime('%Y-%m-%d')
         call_time = str(job['time']) if job['time'] else '10:00:00'
         
-        def run_pdf_step():
-            try:
-                run_bulk_pipeline(
-                    job_id, 
-                    resolve_job_folder_path(job['folder_path']), 
-                    call_date, 
-                    call_time, 
-                    start_step=7
-                )
-            except Exception as e:
-                print(f"Error running PDF step for job {job_id}: {str(e)}")
-                with get_db_cursor(commit=True) as cursor:
-                    cursor.execute("""
-                        UPDATE jobs 
-                        SET status = 'failed', updated_at = %s
-                        WHERE id = %s
-                    """, (datetime.now(), job_id))
-        
-        thread = threading.Thread(target=run_pdf_step)
-        thread.daemon = True
-        thread.start()
+        _submit_pipeline(job_id, resolve_job_folder_path(job['folder_path']), call_date, call_time, start_step=7)
         
         return jsonify({
             'success': True,
@@ -1117,5 +1327,5 @@ def skip_failed_charts(job_id):
         }), 200
         
     except Exception as e:
-        print(f"Error skipping failed charts: {str(e)}")
+        logger.error("Error skipping failed charts: %s", e)
         return jsonify({'error': str(e)}), 500
@@ -1,8 +1,12 @@
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.utils.database import get_db_cursor
+from backend.utils.database import get_db_cursor, execute_prepared
 from backend.api import dashboard_bp
 from backend.models.user import User
+from cachetools.func import ttl_cache
+
+# Dashboards poll /stats; one aggregate scan per window serves every poll in it
+STATS_CACHE_SECONDS = 10
 
 def is_admin(user_id):
     user = User.find_by_id(user_id)
@@ -16,30 +20,6 @@ def get_dashboard_data():
         user_id = get_jwt_identity()
         
         with get_db_cursor() as cursor:
-            # Get stats for ALL jobs (all users can see all jobs)
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_jobs,
-                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_jobs,
-                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_jobs,
-                    SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as running_jobs,
-                    SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_jobs
-                FROM jobs
-            """)
-            
-            stats_row = cursor.fetchone()
-            
-            stats = {
-                'total_jobs': stats_row['total_jobs'] or 0,
-                'completed_jobs': stats_row['completed_jobs'] or 0,
-                'failed_jobs': stats_row['failed_jobs'] or 0,
-                'running_jobs': stats_row['running_jobs'] or 0,
-                'pending_jobs': stats_row['pending_jobs'] or 0,
-                'total_change': '+ 0% from last month',
-                'completed_change': '+ 0% from last month',
-                'failed_change': '+ 0% from last month'
-            }
-            
             # Get recent jobs with filters
             search_query = request.args.get('search', '')
             tool_filter = request.args.get('tool', 'all')
@@ -53,15 +33,11 @@ def get_dashboard_data():
             where_conditions = ['1=1']
             query_params = []
             
-            # Search filter
+            # Search filter (search_text is the lower-cased title, URL and id in one indexed column)
             if search_query:
-                where_conditions.append("""
-                    (LOWER(j.title) LIKE %s OR 
-                     LOWER(j.youtube_url) LIKE %s OR 
-                     LOWER(j.id) LIKE %s)
-                """)
+                where_conditions.append('j.search_text LIKE %s')
                 search_pattern = f'%{search_query.lower()}%'
-                query_params.extend([search_pattern, search_pattern, search_pattern])
+                query_params.append(search_pattern)
             
             # Status filter
             if status_filter != 'all':
@@ -81,44 +57,70 @@ def get_dashboard_data():
             
             where_clause = ' AND '.join(where_conditions)
             
-            # Get jobs with creator info for admin
+            # Stats for ALL jobs (all users can see all jobs), the filtered page of
+            # jobs with their trigger-maintained step counts for progress, and the
+            # filtered total in one query
             cursor.execute(f"""
-                SELECT 
-                    j.id,
-                    j.youtube_url,
-                    j.status,
-                    j.title as title,
-                    j.tool_used,
-                    j.user_id,
-                    c.channel_name,
-                    j.created_at,
-                    j.updated_at,
-                    CONCAT(u.first_name, ' ', u.last_name) as creator_name
-                FROM jobs j
-                LEFT JOIN channels c ON j.channel_id = c.id
-                LEFT JOIN users u ON j.user_id = u.id
-                WHERE {where_clause}
-                ORDER BY j.created_at DESC
-                LIMIT %s OFFSET %s
+                WITH stats AS (
+                    SELECT 
+                        COUNT(*) as total_jobs,
+                        SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_jobs,
+                        SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_jobs,
+                        SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as running_jobs,
+                        SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_jobs
+                    FROM jobs
+                ), page AS (
+                    SELECT 
+                        j.id,
+                        j.youtube_url,
+                        j.status,
+                        j.title as title,
+                        j.tool_used,
+                        j.user_id,
+                        c.channel_name,
+                        j.created_at,
+                        j.updated_at,
+                        CONCAT(u.first_name, ' ', u.last_name) as creator_name,
+                        j.step_count as total_steps,
+                        j.completed_step_count as completed_steps,
+                        COUNT(*) OVER () as total_count
+                    FROM jobs j
+                    LEFT JOIN channels c ON j.channel_id = c.id
+                    LEFT JOIN users u ON j.user_id = u.id
+                    WHERE {where_clause}
+                    ORDER BY j.created_at DESC
+                    LIMIT %s OFFSET %s
+                )
+                SELECT stats.*, page.*
+                FROM stats
+                LEFT JOIN page ON true
+                ORDER BY page.created_at DESC
             """, (*query_params, limit, offset))
             
-            jobs = cursor.fetchall()
+            rows = cursor.fetchall()
+            
+            # The stats columns repeat on every row; with an empty page there is
+            # still one row, carrying NULL job columns
+            stats_row = rows[0]
+            
+            stats = {
+                'total_jobs': stats_row['total_jobs'] or 0,
+                'completed_jobs': stats_row['completed_jobs'] or 0,
+                'failed_jobs': stats_row['failed_jobs'] or 0,
+                'running_jobs': stats_row['running_jobs'] or 0,
+                'pending_jobs': stats_row['pending_jobs'] or 0,
+                'total_change': '+ 0% from last month',
+                'completed_change': '+ 0% from last month',
+                'failed_change': '+ 0% from last month'
+            }
+            
+            jobs = [row for row in rows if row['id'] is not None]
             
             # Calculate progress for each job
             jobs_with_progress = []
             for job in jobs:
-                # Get job steps to calculate progress
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_steps,
-                        SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) as completed_steps
-                    FROM job_steps
-                    WHERE job_id = %s
-                """, (job['id'],))
-                
-                steps_row = cursor.fetchone()
-                total_steps = steps_row['total_steps'] or 15  # Default to 15 steps
-                completed_steps = steps_row['completed_steps'] or 0
+                total_steps = job['total_steps'] or 15  # Default to 15 steps
+                completed_steps = job['completed_steps'] or 0
                 
                 # Calculate progress percentage
                 progress = int((completed_steps / total_steps) * 100) if total_steps > 0 else 0
@@ -155,15 +157,20 @@ def get_dashboard_data():
                     'user_id': job.get('user_id')
                 })
             
-            # Get total count for pagination
-            cursor.execute(f"""
-                SELECT COUNT(*) as total
-                FROM jobs j
-                LEFT JOIN channels c ON j.channel_id = c.id
-                WHERE {where_clause}
-            """, query_params)
-            
-            total_count = cursor.fetchone()['total']
+            # Total count for pagination comes with the page; only a page past
+            # the end needs it counted separately
+            if jobs:
+                total_count = jobs[0]['total_count']
+            elif offset > 0:
+                cursor.execute(f"""
+                    SELECT COUNT(*) as total
+                    FROM jobs j
+                    LEFT JOIN channels c ON j.channel_id = c.id
+                    WHERE {where_clause}
+                """, query_params)
+                total_count = cursor.fetchone()['total']
+            else:
+                total_count = 0
             
             return jsonify({
                 'stats': stats,
@@ -178,38 +185,42 @@ def get_dashboard_data():
         return jsonify({'error': str(e)}), 500
 
 
+@ttl_cache(maxsize=1, ttl=STATS_CACHE_SECONDS)
+def _load_job_stats():
+    """Aggregate job counts across ALL jobs; cached for STATS_CACHE_SECONDS"""
+    with get_db_cursor() as cursor:
+        # Get stats for ALL jobs (all users can see all jobs)
+        execute_prepared(cursor, 'dashboard_job_stats', """
+            SELECT 
+                COUNT(*) as total_jobs,
+                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_jobs,
+                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_jobs,
+                SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as running_jobs,
+                SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_jobs
+            FROM jobs
+        """)
+        
+        stats_row = cursor.fetchone()
+    
+    return {
+        'total_jobs': stats_row['total_jobs'] or 0,
+        'completed_jobs': stats_row['completed_jobs'] or 0,
+        'failed_jobs': stats_row['failed_jobs'] or 0,
+        'running_jobs': stats_row['running_jobs'] or 0,
+        'pending_jobs': stats_row['pending_jobs'] or 0,
+        'total_change': '+ 0% from last month',
+        'completed_change': '+ 0% from last month',
+        'failed_change': '+ 0% from last month'
+    }
+
+
 @dashboard_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_dashboard_stats():
     """Get dashboard statistics only - shows ALL jobs for ALL users"""
     try:
-        with get_db_cursor() as cursor:
-            # Get stats for ALL jobs (all users can see all jobs)
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_jobs,
-                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_jobs,
-                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_jobs,
-                    SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as running_jobs,
-                    SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_jobs
-                FROM jobs
-            """)
-            
-            stats_row = cursor.fetchone()
-            
-            stats = {
-                'total_jobs': stats_row['total_jobs'] or 0,
-                'completed_jobs': stats_row['completed_jobs'] or 0,
-                'failed_jobs': stats_row['failed_jobs'] or 0,
-                'running_jobs': stats_row['running_jobs'] or 0,
-                'pending_jobs': stats_row['pending_jobs'] or 0,
-                'total_change': '+ 0% from last month',
-                'completed_change': '+ 0% from last month',
-                'failed_change': '+ 0% from last month'
-            }
-            
-            return jsonify(stats), 200
-            
+        return jsonify(_load_job_stats()), 200
+        
     except Exception as e:
         print(f"Error getting dashboard stats: {str(e)}")
         return jsonify({'error': str(e)}), 500
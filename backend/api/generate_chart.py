@@ -2,21 +2,34 @@
 Generate Chart API - Standalone chart generation tool
 No database records required - generates charts on demand and auto-cleans up
 """
-from flask import request, jsonify, send_file
+from flask import request, jsonify, current_app
 from flask_jwt_extended import jwt_required
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
+import traceback
 import uuid
 from backend.api import Blueprint
-from backend.services.manual_v2.utils import get_stock_autocomplete, get_master_csv_path
+from backend.services.manual_v2.utils import get_stock_autocomplete, get_master_csv_path, get_master_equity_index
 from backend.services.chart_generator import ChartGeneratorService
-import pandas as pd
+from backend.utils.file_response import stream_file
 
 generate_chart_bp = Blueprint('generate_chart', __name__, url_prefix='/api/v1/generate-chart')
 
 CHARTS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'generated_charts')
 os.makedirs(CHARTS_FOLDER, exist_ok=True)
 
+# Chart files are written once under a unique ID and expire after 24 hours
+CHART_CACHE_SECONDS = 24 * 60 * 60
+
+
+def _set_chart_cache_headers(response, chart_id):
+    """Let the browser keep a chart for its lifetime (private: the view requires a JWT)"""
+    response.set_etag(chart_id)
+    response.cache_control.private = True
+    response.cache_control.max_age = CHART_CACHE_SECONDS
+    response.cache_control.immutable = True
+    return response
+
 
 @generate_chart_bp.route('/stocks', methods=['GET'])
 @jwt_required()
@@ -52,27 +65,17 @@ def get_stock_details():
         if not master_csv_path or not os.path.exists(master_csv_path):
             return jsonify({'error': 'Master CSV file not found'}), 404
         
-        df = pd.read_csv(master_csv_path)
-        df_equity = df[
-            (df['SEM_INSTRUMENT_NAME'] == 'EQUITY') & 
-            (df['SEM_EXCH_INSTRUMENT_TYPE'] == 'ES')
-        ].copy()
+        row = get_master_equity_index(master_csv_path).get(symbol)
         
-        matching_row = df_equity[
-            df_equity['SEM_TRADING_SYMBOL'].str.upper() == symbol
-        ]
-        
-        if matching_row.empty:
+        if row is None:
             return jsonify({'error': f"Stock symbol '{symbol}' not found"}), 404
         
-        row = matching_row.iloc[0]
-        
         stock_details = {
-            'symbol': str(row['SEM_TRADING_SYMBOL']) if pd.notna(row['SEM_TRADING_SYMBOL']) else '',
-            'security_id': str(row['SEM_SMST_SECURITY_ID']) if pd.notna(row['SEM_SMST_SECURITY_ID']) else '',
-            'listed_name': str(row['SM_SYMBOL_NAME']) if pd.notna(row['SM_SYMBOL_NAME']) else '',
-            'short_name': str(row['SEM_CUSTOM_SYMBOL']) if pd.notna(row['SEM_CUSTOM_SYMBOL']) else '',
-            'exchange': str(row['SEM_EXM_EXCH_ID']) if pd.notna(row['SEM_EXM_EXCH_ID']) else ''
+            'symbol': row['SEM_TRADING_SYMBOL'],
+            'security_id': row['SEM_SMST_SECURITY_ID'],
+            'listed_name': row['SM_SYMBOL_NAME'],
+            'short_name': row['SEM_CUSTOM_SYMBOL'],
+            'exchange': row['SEM_EXM_EXCH_ID']
         }
         
         return jsonify({'stock': stock_details}), 200
@@ -138,7 +141,6 @@ def generate_chart():
             }), 400
         
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
@@ -148,17 +150,18 @@ def generate_chart():
 def view_chart(chart_id):
     """View/display a generated chart (doesn't delete it)"""
     try:
-        chart_path = os.path.join(CHARTS_FOLDER, f"{chart_id}.png")
+        # The chart ID is the ETag, so a cached copy is confirmed without touching the disk
+        if chart_id in request.if_none_match:
+            return _set_chart_cache_headers(current_app.response_class(status=304), chart_id)
         
-        if not os.path.exists(chart_path):
-            return jsonify({'error': 'Chart not found or expired'}), 404
+        chart_path = os.path.join(CHARTS_FOLDER, f"{chart_id}.png")
         
-        return send_file(
-            chart_path,
-            mimetype='image/png',
-            as_attachment=False
-        )
+        # Opening the file is the existence check. nginx's X-Accel-Mapping only covers
+        # job_files, so charts are always streamed through the WSGI file wrapper
+        return _set_chart_cache_headers(stream_file(chart_path, 'image/png', conditional=False), chart_id)
         
+    except FileNotFoundError:
+        return jsonify({'error': 'Chart not found or expired'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -170,27 +173,31 @@ def download_chart(chart_id):
     try:
         chart_path = os.path.join(CHARTS_FOLDER, f"{chart_id}.png")
         
-        if not os.path.exists(chart_path):
-            return jsonify({'error': 'Chart not found or expired'}), 404
-        
-        response = send_file(
+        # The chart is deleted once the response closes, so it cannot be
+        # handed off to nginx; the WSGI file wrapper still sends it with sendfile()
+        response = stream_file(
             chart_path,
-            mimetype='image/png',
+            'image/png',
+            download_name=f"chart_{chart_id}.png",
             as_attachment=True,
-            download_name=f"chart_{chart_id}.png"
+            conditional=False,
+            allow_accel=False
         )
         
         @response.call_on_close
         def delete_chart():
             try:
-                if os.path.exists(chart_path):
-                    os.remove(chart_path)
-                    print(f"🗑️ Chart deleted after download: {chart_id}")
+                os.remove(chart_path)
+                print(f"🗑️ Chart deleted after download: {chart_id}")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 print(f"⚠️ Error deleting chart: {e}")
         
         return response
         
+    except FileNotFoundError:
+        return jsonify({'error': 'Chart not found or expired'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -200,19 +207,20 @@ def download_chart(chart_id):
 def cleanup_old_charts():
     """Cleanup charts older than 24 hours (can be called manually or via cron)"""
     try:
-        from datetime import timedelta
-        
         deleted_count = 0
-        cutoff_time = datetime.now() - timedelta(hours=24)
-        
-        for filename in os.listdir(CHARTS_FOLDER):
-            if filename.endswith('.png'):
-                file_path = os.path.join(CHARTS_FOLDER, filename)
-                file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-                
-                if file_mtime < cutoff_time:
-                    os.remove(file_path)
-                    deleted_count += 1
+        cutoff_ts = (datetime.now() - timedelta(hours=24)).timestamp()
+        
+        # Stat and unlink relative to one directory fd (fstatat/unlinkat), so the
+        # kernel never re-resolves the folder path per file
+        dir_fd = os.open(CHARTS_FOLDER, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            with os.scandir(dir_fd) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.png') and entry.stat().st_mtime < cutoff_ts:
+                        os.unlink(entry.name, dir_fd=dir_fd)
+                        deleted_count += 1
+        finally:
+            os.close(dir_fd)
         
         return jsonify({
             'success': True,
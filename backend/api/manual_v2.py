@@ -1,16 +1,28 @@
-from flask import request, jsonify
+from flask import request, jsonify, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 import uuid
 import os
 import json
+import orjson
 from backend.api import Blueprint
 from backend.utils.database import get_db_cursor
+from psycopg2.extras import execute_values
+from backend.utils.job_ids import new_job_id
 from backend.services.manual_v2.utils import enrich_stocks_with_master_data, get_stock_autocomplete
 from backend.services.manual_v2 import ManualRationaleOrchestrator
 
 manual_v2_bp = Blueprint('manual_v2', __name__, url_prefix='/api/v1/manual-v2')
 
+# to_char() pattern for the RFC 822 dates jsonify writes for datetime values
+HTTP_DATE_FORMAT = 'Dy, DD Mon YYYY HH24:MI:SS "GMT"'
+
+MANUAL_STEPS = (
+    (1, 'Fetch CMP'),
+    (2, 'Generate Charts'),
+    (3, 'Generate PDF')
+)
+
 @manual_v2_bp.route('/stocks', methods=['GET'])
 @jwt_required()
 def autocomplete_stocks():
@@ -54,7 +66,7 @@ def create_job():
         
         enriched_stocks = enrich_stocks_with_master_data(stocks)
         
-        job_id = f"manual-{uuid.uuid4().hex[:8]}"
+        job_id = new_job_id('manual')
         folder_path = os.path.join('backend', 'job_files', job_id)
         
         # Get platform name from channel
@@ -65,18 +77,18 @@ def create_job():
         
         # Format date for title: DD-MM-YYYY
         try:
-            from datetime import datetime as dt
             if date:
-                parsed_date = dt.strptime(date, '%Y-%m-%d')
+                parsed_date = datetime.strptime(date, '%Y-%m-%d')
                 formatted_date = parsed_date.strftime('%d-%m-%Y')
             else:
-                formatted_date = dt.now().strftime('%d-%m-%Y')
+                formatted_date = datetime.now().strftime('%d-%m-%Y')
         except:
             formatted_date = date
         
         # Create job title as "Platform Name - DD-MM-YYYY"
         job_title = f"{platform_name} - {formatted_date}"
         
+        # Stored as JSONB, which drops formatting anyway; orjson encodes it compactly
         payload = {
             'stocks': enriched_stocks,
             'call_time': call_time,
@@ -84,24 +96,20 @@ def create_job():
             'date': date
         }
         
+        # Timestamps come from the database clock, one value per transaction
         with get_db_cursor(commit=True) as cursor:
             cursor.execute("""
                 INSERT INTO jobs (id, channel_id, title, date, user_id, tool_used, status, folder_path, payload, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
             """, (job_id, channel_id, job_title, date, user_id, 'Manual Rationale', 'pending', folder_path, 
-                  json.dumps(payload), datetime.now(), datetime.now()))
+                  orjson.dumps(payload).decode()))
             
-            steps = [
-                (1, 'Fetch CMP', 'pending'),
-                (2, 'Generate Charts', 'pending'),
-                (3, 'Generate PDF', 'pending')
-            ]
-            
-            for step_number, step_name, status in steps:
-                cursor.execute("""
-                    INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, step_number, step_name, status, datetime.now()))
+            # All steps in one multi-row INSERT
+            execute_values(cursor, """
+                INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
+                VALUES %s
+            """, [(job_id, number, name, 'pending') for number, name in MANUAL_STEPS],
+               template="(%s, %s, %s, %s, CURRENT_TIMESTAMP)", page_size=len(MANUAL_STEPS))
         
         return jsonify({
             'success': True,
@@ -119,24 +127,40 @@ def create_job():
 def get_job(job_id):
     try:
         with get_db_cursor() as cursor:
+            # Job and its steps in one round-trip; step timestamps are formatted
+            # as the same HTTP dates jsonify gives datetime values
             cursor.execute("""
-                SELECT id, channel_id, title, date, user_id, tool_used, status, progress, current_step, folder_path, payload, created_at, updated_at
-                FROM jobs WHERE id = %s
-            """, (job_id,))
+                SELECT j.id, j.channel_id, j.title, j.date, j.user_id, j.tool_used, j.status, j.progress,
+                       j.current_step, j.folder_path, j.payload, j.created_at, j.updated_at, s.job_steps
+                FROM jobs j
+                CROSS JOIN LATERAL (
+                    SELECT COALESCE(json_agg(json_build_object(
+                        'id', js.id,
+                        'job_id', js.job_id,
+                        'step_number', js.step_number,
+                        'step_name', js.step_name,
+                        'status', js.status,
+                        'message', js.message,
+                        'started_at', to_char(js.started_at, %(http_date)s),
+                        'ended_at', to_char(js.ended_at, %(http_date)s),
+                        'created_at', to_char(js.created_at, %(http_date)s)
+                    ) ORDER BY js.step_number), '[]') AS job_steps
+                    FROM job_steps js
+                    WHERE js.job_id = j.id
+                ) s
+                WHERE j.id = %(job_id)s
+            """, {'http_date': HTTP_DATE_FORMAT, 'job_id': job_id})
             job = cursor.fetchone()
             
             if not job:
                 return jsonify({'error': 'Job not found'}), 404
-            
-            cursor.execute("""
-                SELECT id, job_id, step_number, step_name, status, message, started_at, ended_at, created_at
-                FROM job_steps WHERE job_id = %s ORDER BY step_number
-            """, (job_id,))
-            job_steps = cursor.fetchall()
+        
+        job = dict(job)
+        job_steps = job.pop('job_steps')
         
         return jsonify({
-            'job': dict(job),
-            'job_steps': [dict(step) for step in job_steps]
+            'job': job,
+            'job_steps': job_steps
         }), 200
         
     except Exception as e:
@@ -163,9 +187,9 @@ def run_job(job_id):
             if current_status in ['pdf_ready', 'completed', 'signed', 'failed']:
                 cursor.execute("""
                     UPDATE jobs 
-                    SET status = %s, progress = %s, current_step = %s, updated_at = %s 
+                    SET status = %s, progress = %s, current_step = %s, updated_at = CURRENT_TIMESTAMP 
                     WHERE id = %s
-                """, ('pending', 0, 0, datetime.now(), job_id))
+                """, ('pending', 0, 0, job_id))
                 
                 # Reset all job steps to pending
                 cursor.execute("""
@@ -263,19 +287,19 @@ def save_job(job_id):
             if existing:
                 cursor.execute("""
                     UPDATE saved_rationale 
-                    SET title = %s, date = %s, unsigned_pdf_path = %s, updated_at = %s
+                    SET title = %s, date = %s, unsigned_pdf_path = %s, updated_at = CURRENT_TIMESTAMP
                     WHERE job_id = %s
-                """, (job['title'], job['date'], pdf_path, datetime.now(), job_id))
+                """, (job['title'], job['date'], pdf_path, job_id))
             else:
                 cursor.execute("""
                     INSERT INTO saved_rationale (job_id, tool_used, channel_id, title, date, unsigned_pdf_path, sign_status, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
                 """, (job_id, 'Manual Rationale', job['channel_id'], job['title'], job['date'], 
-                      pdf_path, 'Unsigned', datetime.now(), datetime.now()))
+                      pdf_path, 'Unsigned'))
             
             cursor.execute("""
-                UPDATE jobs SET status = %s, updated_at = %s WHERE id = %s
-            """, ('completed', datetime.now(), job_id))
+                UPDATE jobs SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s
+            """, ('completed', job_id))
         
         return jsonify({
             'success': True,
@@ -319,13 +343,13 @@ def upload_signed_pdf(job_id):
             
             cursor.execute("""
                 UPDATE saved_rationale 
-                SET signed_pdf_path = %s, sign_status = %s, signed_uploaded_at = %s, updated_at = %s
+                SET signed_pdf_path = %s, sign_status = %s, signed_uploaded_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
                 WHERE job_id = %s
-            """, (signed_path, 'Signed', datetime.now(), datetime.now(), job_id))
+            """, (signed_path, 'Signed', job_id))
             
             cursor.execute("""
-                UPDATE jobs SET status = %s, updated_at = %s WHERE id = %s
-            """, ('signed', datetime.now(), job_id))
+                UPDATE jobs SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s
+            """, ('signed', job_id))
         
         return jsonify({
             'success': True,
@@ -359,7 +383,6 @@ def download_pdf(job_id):
                 return jsonify({'error': 'Access denied'}), 403
             
             # Parse payload if it's a string
-            import json
             payload = job['payload']
             if isinstance(payload, str):
                 payload = json.loads(payload)
@@ -378,7 +401,6 @@ def download_pdf(job_id):
             if not os.path.exists(abs_pdf_path):
                 return jsonify({'error': 'Access denied'}), 403
             
-            from flask import send_file
             return send_file(
                 abs_pdf_path,
                 mimetype='application/pdf',
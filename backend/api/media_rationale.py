@@ -1,15 +1,16 @@
 from flask import request, jsonify, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.utils.database import get_db_cursor
+from backend.utils.job_ids import new_job_id
+from psycopg2.extras import execute_values
 from backend.utils.path_utils import resolve_job_folder_path
+from backend.utils.background import run_in_background
 from backend.api import media_rationale_bp
 from backend.models.user import User
 from backend.pipeline.fetch_video_data import fetch_video_metadata
 from backend.pipeline.pipeline_manager import create_job_directory, PIPELINE_STEPS, run_pipeline_step
 from datetime import datetime
 import os
-import secrets
-import threading
 import csv
 import io
 import shutil
@@ -117,7 +118,7 @@ def start_analysis():
             return jsonify({'error': 'Missing required fields'}), 400
         
         # Generate unique job ID
-        job_id = f"job-{secrets.token_hex(4)}"
+        job_id = new_job_id('job')
         
         # Get channel_id from database (if exists)
         channel_id = None
@@ -151,17 +152,14 @@ def start_analysis():
             ))
             
             # Initialize all 14 pipeline steps (Step 15 is API-only)
-            for step in PIPELINE_STEPS:
-                cursor.execute("""
-                    INSERT INTO job_steps (
-                        job_id, step_number, step_name, 
-                        status, message, output_files
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (
-                    job_id, step['number'], step['name'],
-                    'pending', None, []
-                ))
+            step_rows = [(job_id, step['number'], step['name'], 'pending', None, []) for step in PIPELINE_STEPS]
+            execute_values(cursor, """
+                INSERT INTO job_steps (
+                    job_id, step_number, step_name, 
+                    status, message, output_files
+                )
+                VALUES %s
+            """, step_rows, template='(%s, %s, %s, %s, %s, %s::text[])', page_size=len(step_rows))
         
         # Start pipeline execution in background thread
         def run_pipeline_background():
@@ -202,9 +200,7 @@ def start_analysis():
                     """, (datetime.now(), job_id))
         
         # Start background thread
-        thread = threading.Thread(target=run_pipeline_background)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_pipeline_background)
         
         return jsonify({
             'success': True,
@@ -452,9 +448,7 @@ def restart_step(job_id, step_number):
                     """, (datetime.now(), job_id))
         
         # Start background thread
-        thread = threading.Thread(target=run_pipeline_from_step)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_pipeline_from_step)
         
         return jsonify({
             'success': True,
@@ -581,9 +575,7 @@ def generate_pdf(job_id):
             except Exception as e:
                 print(f"PDF generation error for job {job_id}: {str(e)}")
         
-        thread = threading.Thread(target=run_pdf_generation)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_pdf_generation)
         
         return jsonify({
             'success': True,
@@ -988,9 +980,7 @@ def continue_pipeline(job_id):
                     """, (datetime.now(), job_id))
         
         # Start background thread
-        thread = threading.Thread(target=run_remaining_steps)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_remaining_steps)
         
         return jsonify({
             'success': True,
@@ -1171,9 +1161,7 @@ def step8_continue_pipeline(job_id):
                     """, (datetime.now(), job_id))
         
         # Start background thread
-        thread = threading.Thread(target=run_remaining_steps)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_remaining_steps)
         
         return jsonify({
             'success': True,
@@ -1,32 +1,119 @@
-from flask import request, jsonify, send_file
+from flask import request, jsonify, send_file, g
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.utils.database import get_db_cursor
+from backend.utils.job_ids import new_job_id
+from psycopg2.extras import execute_values
 from backend.utils.path_utils import resolve_job_folder_path
+from backend.utils.background import run_in_background
 from backend.api import premium_rationale_bp
 from backend.models.user import User
 from datetime import datetime
+from cachetools.func import ttl_cache
 import os
-import secrets
-import threading
 import shutil
 
+# Roles rarely change; a short cache spares a users lookup on most requests
+ADMIN_CACHE_SECONDS = 30
+
+# API keys the pipeline needs, selected alongside the job row
+_SQL_PIPELINE_KEYS = """
+    (SELECT key_value FROM api_keys WHERE LOWER(provider) = 'openai' LIMIT 1) AS openai_api_key,
+    (SELECT key_value FROM api_keys WHERE LOWER(provider) = 'dhan' LIMIT 1) AS dhan_api_key
+"""
+
+# Step transitions update job_steps and jobs in one statement each
+_SQL_START_STEP = """
+    WITH step AS (
+        UPDATE job_steps SET status = 'running', started_at = %(now)s
+        WHERE job_id = %(job_id)s AND step_number = %(step_number)s
+    )
+    UPDATE jobs SET status = 'processing', current_step = %(step_number)s, progress = %(progress)s, updated_at = %(now)s
+    WHERE id = %(job_id)s
+    RETURNING folder_path
+"""
+
+_SQL_FINISH_STEP = """
+    UPDATE job_steps 
+    SET status = 'success', message = %(message)s, ended_at = %(now)s
+    WHERE job_id = %(job_id)s AND step_number = %(step_number)s
+"""
+
+_SQL_PDF_READY = """
+    WITH step AS (
+        UPDATE job_steps 
+        SET status = 'success', message = 'PDF generated successfully', ended_at = %(now)s
+        WHERE job_id = %(job_id)s AND step_number = 8
+    )
+    UPDATE jobs SET status = 'pdf_ready', progress = 100, updated_at = %(now)s
+    WHERE id = %(job_id)s
+"""
+
+_SQL_FAIL_STEP = """
+    WITH step AS (
+        UPDATE job_steps 
+        SET status = 'failed', message = %(message)s, ended_at = %(now)s
+        WHERE job_id = %(job_id)s AND step_number = %(step_number)s
+    )
+    UPDATE jobs SET status = 'failed', updated_at = %(now)s
+    WHERE id = %(job_id)s
+"""
+
+@ttl_cache(maxsize=256, ttl=ADMIN_CACHE_SECONDS)
 def is_admin(user_id):
     user = User.find_by_id(user_id)
     return user and user.get('role') == 'admin'
 
+def _job_row(job_id):
+    """Fetch the job row once per request; access checks and handlers share it"""
+    cache = g.setdefault('_job_cache', {})
+    if job_id not in cache:
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                SELECT id, user_id, channel_id, tool_used, title, date, youtube_url, status, folder_path
+                FROM jobs WHERE id = %s
+            """, (job_id,))
+            cache[job_id] = cursor.fetchone()
+    return cache[job_id]
+
 def check_job_access(job_id, current_user_id):
     """Verify user owns this job or is admin"""
-    with get_db_cursor() as cursor:
-        cursor.execute("SELECT user_id FROM jobs WHERE id = %s", (job_id,))
-        job = cursor.fetchone()
-        
-        if not job:
-            return False, "Job not found"
-        
-        if job['user_id'] != current_user_id and not is_admin(current_user_id):
-            return False, "Access denied"
-        
-        return True, None
+    job = _job_row(job_id)
+    
+    if not job:
+        return False, "Job not found"
+    
+    if job['user_id'] != current_user_id and not is_admin(current_user_id):
+        return False, "Access denied"
+    
+    return True, None
+
+def _start_step(job_id, step_number, progress):
+    """Mark a step running and the job processing at that step; returns the job's folder_path row"""
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(_SQL_START_STEP, {
+            'job_id': job_id, 'step_number': step_number, 'progress': progress, 'now': datetime.now()
+        })
+        return cursor.fetchone()
+
+def _finish_step(job_id, step_number):
+    """Mark a step successful"""
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(_SQL_FINISH_STEP, {
+            'job_id': job_id, 'step_number': step_number,
+            'message': 'Step completed successfully', 'now': datetime.now()
+        })
+
+def _fail_step(job_id, step_number, message):
+    """Mark a step and its job failed"""
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(_SQL_FAIL_STEP, {
+            'job_id': job_id, 'step_number': step_number, 'message': message, 'now': datetime.now()
+        })
+
+def _mark_pdf_ready(job_id):
+    """Mark Step 8 successful and the job pdf_ready"""
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(_SQL_PDF_READY, {'job_id': job_id, 'now': datetime.now()})
 
 @premium_rationale_bp.route('/create-job', methods=['POST'])
 @jwt_required()
@@ -58,7 +145,7 @@ def create_job():
                 return jsonify({'error': 'Channel not found'}), 404
         
         # Generate unique job ID
-        job_id = f"premium-{secrets.token_hex(4)}"
+        job_id = new_job_id('premium')
         
         # Create job folder structure
         job_folder = os.path.join('backend', 'job_files', job_id)
@@ -120,16 +207,15 @@ def create_job():
                 {'step_number': 8, 'step_name': 'Generate PDF Report'},
             ]
             
-            for step in premium_steps:
-                cursor.execute("""
-                    INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, step['step_number'], step['step_name'], 'pending', datetime.now()))
+            now = datetime.now()
+            step_rows = [(job_id, step['step_number'], step['step_name'], 'pending', now) for step in premium_steps]
+            execute_values(cursor, """
+                INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
+                VALUES %s
+            """, step_rows, page_size=len(step_rows))
         
         # Start processing in background thread
-        thread = threading.Thread(target=process_premium_job_async, args=(job_id,))
-        thread.daemon = True
-        thread.start()
+        run_in_background(process_premium_job_async, job_id)
         
         return jsonify({
             'success': True,
@@ -157,36 +243,25 @@ def process_premium_job_async(job_id):
             step08_generate_pdf
         )
         
-        # Update job status to processing
+        # Update job status to processing and get its folder and the API keys
         with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE jobs 
                 SET status = 'processing', current_step = 1, updated_at = %s
                 WHERE id = %s
+                RETURNING folder_path, {_SQL_PIPELINE_KEYS}
             """, (datetime.now(), job_id))
-        
-        # Get job details
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
             job = cursor.fetchone()
         
         job_folder = job['folder_path']
+        openai_api_key = job['openai_api_key']
+        dhan_api_key = job['dhan_api_key']
         
         # Read input text
         input_file_path = os.path.join(job_folder, 'input.txt')
         with open(input_file_path, 'r', encoding='utf-8') as f:
             input_text = f.read()
         
-        # Get API keys from database
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT key_value FROM api_keys WHERE LOWER(provider) = 'openai'")
-            openai_key_row = cursor.fetchone()
-            openai_api_key = openai_key_row['key_value'] if openai_key_row else None
-            
-            cursor.execute("SELECT key_value FROM api_keys WHERE LOWER(provider) = 'dhan'")
-            dhan_key_row = cursor.fetchone()
-            dhan_api_key = dhan_key_row['key_value'] if dhan_key_row else None
-        
         # Process steps 1-7 (before CSV review)
         steps_before_review = [
             (1, lambda: step01_generate_csv.run(job_folder, input_text, openai_api_key)),
@@ -200,46 +275,18 @@ def process_premium_job_async(job_id):
         
         for step_num, step_func in steps_before_review:
             # Update current step
-            with get_db_cursor(commit=True) as cursor:
-                cursor.execute("""
-                    UPDATE jobs 
-                    SET current_step = %s, progress = %s, updated_at = %s
-                    WHERE id = %s
-                """, (step_num, int((step_num / 8) * 100), datetime.now(), job_id))
-                
-                cursor.execute("""
-                    UPDATE job_steps 
-                    SET status = 'running', started_at = %s
-                    WHERE job_id = %s AND step_number = %s
-                """, (datetime.now(), job_id, step_num))
+            _start_step(job_id, step_num, int((step_num / 8) * 100))
             
             # Run step
             result = step_func()
             
             if not result.get('success'):
                 # Mark step and job as failed
-                with get_db_cursor(commit=True) as cursor:
-                    cursor.execute("""
-                        UPDATE job_steps 
-                        SET status = 'failed', message = %s, ended_at = %s
-                        WHERE job_id = %s AND step_number = %s
-                    """, (result.get('error', 'Unknown error'), datetime.now(), job_id, step_num))
-                    
-                    cursor.execute("""
-                        UPDATE jobs 
-                        SET status = 'failed', updated_at = %s
-                        WHERE id = %s
-                    """, (datetime.now(), job_id))
-                
+                _fail_step(job_id, step_num, result.get('error', 'Unknown error'))
                 return
             
             # Mark step as completed
-            with get_db_cursor(commit=True) as cursor:
-                cursor.execute("""
-                    UPDATE job_steps 
-                    SET status = 'success', message = 'Step completed successfully', ended_at = %s
-                    WHERE job_id = %s AND step_number = %s
-                """, (datetime.now(), job_id, step_num))
+            _finish_step(job_id, step_num)
         
         # After Step 7, set status to awaiting CSV review
         with get_db_cursor(commit=True) as cursor:
@@ -438,9 +485,7 @@ def continue_to_pdf(job_id):
             return jsonify({'error': error_msg}), 403
         
         # Start Step 8 in background
-        thread = threading.Thread(target=run_step_8_async, args=(job_id,))
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_step_8_async, job_id)
         
         return jsonify({
             'success': True,
@@ -457,23 +502,10 @@ def run_step_8_async(job_id):
         from backend.pipeline.premium import step08_generate_pdf
         
         # Update status
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
-                UPDATE jobs 
-                SET status = 'processing', current_step = 8, progress = 95, updated_at = %s
-                WHERE id = %s
-            """, (datetime.now(), job_id))
-            
-            cursor.execute("""
-                UPDATE job_steps 
-                SET status = 'running', started_at = %s
-                WHERE job_id = %s AND step_number = 8
-            """, (datetime.now(), job_id))
-            
-            cursor.execute("SELECT folder_path FROM jobs WHERE id = %s", (job_id,))
-            job = cursor.fetchone()
-            
-            # Get PDF template config
+        job = _start_step(job_id, 8, 95)
+        
+        # Get PDF template config
+        with get_db_cursor() as cursor:
             cursor.execute("SELECT * FROM pdf_template LIMIT 1")
             template = cursor.fetchone()
         
@@ -482,32 +514,10 @@ def run_step_8_async(job_id):
         
         if result.get('success'):
             # Mark as PDF ready
-            with get_db_cursor(commit=True) as cursor:
-                cursor.execute("""
-                    UPDATE jobs 
-                    SET status = 'pdf_ready', progress = 100, updated_at = %s
-                    WHERE id = %s
-                """, (datetime.now(), job_id))
-                
-                cursor.execute("""
-                    UPDATE job_steps 
-                    SET status = 'success', message = 'PDF generated successfully', ended_at = %s
-                    WHERE job_id = %s AND step_number = 8
-                """, (datetime.now(), job_id))
+            _mark_pdf_ready(job_id)
         else:
             # Mark as failed
-            with get_db_cursor(commit=True) as cursor:
-                cursor.execute("""
-                    UPDATE jobs 
-                    SET status = 'failed', updated_at = %s
-                    WHERE id = %s
-                """, (datetime.now(), job_id))
-                
-                cursor.execute("""
-                    UPDATE job_steps 
-                    SET status = 'failed', message = %s, ended_at = %s
-                    WHERE job_id = %s AND step_number = 8
-                """, (result.get('error', 'Unknown error'), datetime.now(), job_id))
+            _fail_step(job_id, 8, result.get('error', 'Unknown error'))
         
     except Exception as e:
         print(f"Error in Step 8: {str(e)}")
@@ -534,13 +544,10 @@ def restart_step(job_id, step_number):
         if step_number < 1 or step_number > 8:
             return jsonify({'error': 'Invalid step number. Must be between 1 and 8'}), 400
         
-        # Check if job exists
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT id, status, folder_path FROM jobs WHERE id = %s", (job_id,))
-            job = cursor.fetchone()
-            
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
+        # Check if job exists (row already loaded by the access check)
+        job = _job_row(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
         
         # Reset the specified step and all subsequent steps to 'pending'
         with get_db_cursor(commit=True) as cursor:
@@ -580,21 +587,17 @@ def restart_step(job_id, step_number):
                 
                 # Get necessary data
                 with get_db_cursor() as cursor:
-                    cursor.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
+                    cursor.execute(
+                        f"SELECT folder_path, {_SQL_PIPELINE_KEYS} FROM jobs WHERE id = %s", (job_id,)
+                    )
                     job = cursor.fetchone()
                     
-                    cursor.execute("SELECT key_value FROM api_keys WHERE LOWER(provider) = 'openai'")
-                    openai_key_row = cursor.fetchone()
-                    openai_api_key = openai_key_row['key_value'] if openai_key_row else None
-                    
-                    cursor.execute("SELECT key_value FROM api_keys WHERE LOWER(provider) = 'dhan'")
-                    dhan_key_row = cursor.fetchone()
-                    dhan_api_key = dhan_key_row['key_value'] if dhan_key_row else None
-                    
                     cursor.execute("SELECT * FROM pdf_template LIMIT 1")
                     template = cursor.fetchone()
                 
                 job_folder = job['folder_path']
+                openai_api_key = job['openai_api_key']
+                dhan_api_key = job['dhan_api_key']
                 
                 # Read input text for Step 1
                 input_file_path = os.path.join(job_folder, 'input.txt')
@@ -625,47 +628,19 @@ def restart_step(job_id, step_number):
                         break
                     
                     # Update current step
-                    with get_db_cursor(commit=True) as cursor:
-                        cursor.execute("""
-                            UPDATE jobs 
-                            SET current_step = %s, progress = %s, updated_at = %s
-                            WHERE id = %s
-                        """, (step_num, int((step_num / 8) * 100), datetime.now(), job_id))
-                        
-                        cursor.execute("""
-                            UPDATE job_steps 
-                            SET status = 'running', started_at = %s
-                            WHERE job_id = %s AND step_number = %s
-                        """, (datetime.now(), job_id, step_num))
+                    _start_step(job_id, step_num, int((step_num / 8) * 100))
                     
                     # Run step
                     result = step_func()
                     
                     if not result.get('success'):
                         # Mark step and job as failed
-                        with get_db_cursor(commit=True) as cursor:
-                            cursor.execute("""
-                                UPDATE job_steps 
-                                SET status = 'failed', message = %s, ended_at = %s
-                                WHERE job_id = %s AND step_number = %s
-                            """, (result.get('error', 'Unknown error'), datetime.now(), job_id, step_num))
-                            
-                            cursor.execute("""
-                                UPDATE jobs 
-                                SET status = 'failed', updated_at = %s
-                                WHERE id = %s
-                            """, (datetime.now(), job_id))
-                        
+                        _fail_step(job_id, step_num, result.get('error', 'Unknown error'))
                         all_success = False
                         break
                     
                     # Mark step as completed
-                    with get_db_cursor(commit=True) as cursor:
-                        cursor.execute("""
-                            UPDATE job_steps 
-                            SET status = 'success', message = 'Step completed successfully', ended_at = %s
-                            WHERE job_id = %s AND step_number = %s
-                        """, (datetime.now(), job_id, step_num))
+                    _finish_step(job_id, step_num)
                 
                 # Update final status
                 if all_success:
@@ -696,9 +671,7 @@ def restart_step(job_id, step_number):
                     """, (datetime.now(), job_id))
         
         # Start background thread
-        thread = threading.Thread(target=run_pipeline_from_step)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_pipeline_from_step)
         
         return jsonify({
             'success': True,
@@ -721,18 +694,10 @@ def save_rationale(job_id):
         if not has_access:
             return jsonify({'error': error_msg}), 403
         
-        # Get job details
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT id, channel_id, tool_used, title, 
-                       date, youtube_url
-                FROM jobs WHERE id = %s
-            """, (job_id,))
-            
-            job = cursor.fetchone()
-            
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
+        # Get job details (row already loaded by the access check)
+        job = _job_row(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
         
         # Path to unsigned PDF
         pdf_path = os.path.join('backend', 'job_files', job_id, 'pdf', 'premium_rationale.pdf')
@@ -818,13 +783,10 @@ def delete_job(job_id):
         if not has_access:
             return jsonify({'error': error_msg}), 403
         
-        # Check if job exists
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT id, folder_path FROM jobs WHERE id = %s", (job_id,))
-            job = cursor.fetchone()
-            
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
+        # Check if job exists (row already loaded by the access check)
+        job = _job_row(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
         
         # Delete job from database (will cascade delete job_steps)
         with get_db_cursor(commit=True) as cursor:
@@ -236,7 +236,8 @@ def save_rationale():
                 'job_completed',
                 f'Saved rationale for video: {job["title"]}',
                 job_id,
-                job['tool_used']
+                job['tool_used'],
+                cursor=cursor
             )
         
         return jsonify({
@@ -337,7 +338,8 @@ def upload_signed_pdf():
                 'job_completed',
                 f'Uploaded signed PDF for: {job["title"]}',
                 job_id,
-                job['tool_used']
+                job['tool_used'],
+                cursor=cursor
             )
         
         return jsonify({
@@ -6,17 +6,27 @@ Transcript Rationale API Endpoints
 from flask import Blueprint, request, jsonify, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.utils.database import get_db_cursor
+from backend.utils.job_ids import new_job_id
+from psycopg2.extras import execute_values
 from backend.api.activity_logs import create_activity_log
 from backend.utils.path_utils import resolve_job_folder_path
+from backend.utils.background import run_in_background
 from datetime import datetime
 import os
-import uuid
-import threading
+import re
+import json
+import traceback
 import pandas as pd
 import numpy as np
 
 transcript_rationale_bp = Blueprint('transcript_rationale', __name__, url_prefix='/api/v1/transcript-rationale')
 
+# Characters not allowed in uploaded chart filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^0-9A-Za-z]')
+
+# Bare NaN tokens pandas leaves in step messages (not valid JSON)
+_BARE_NAN = re.compile(r'\bNaN\b')
+
 TRANSCRIPT_STEPS = [
     {"step_number": 1, "name": "Translate", "description": "Translate transcript to English"},
     {"step_number": 2, "name": "Detect Stocks", "description": "Detect stocks discussed by analyst"},
@@ -117,7 +127,6 @@ def run_transcript_pipeline(job_id, job_folder, call_date, call_time, start_step
                 if step_num == 7:
                     failed_charts = result.get('failed_charts', [])
                     if failed_charts:
-                        import json
                         with get_db_cursor(commit=True) as cursor:
                             cursor.execute("""
                                 UPDATE jobs 
@@ -164,7 +173,6 @@ def run_transcript_pipeline(job_id, job_folder, call_date, call_time, start_step
         
     except Exception as e:
         print(f"❌ Pipeline error: {str(e)}")
-        import traceback
         traceback.print_exc()
         
         with get_db_cursor(commit=True) as cursor:
@@ -226,7 +234,7 @@ def create_job():
             channel_name = channel['channel_name']
             platform = channel['platform']
             
-            job_id = f"transcript-{uuid.uuid4().hex[:8]}"
+            job_id = new_job_id('transcript')
             title = f"{platform} - {channel_name} - {call_date}"
             
             job_folder = f"backend/job_files/{job_id}"
@@ -250,26 +258,23 @@ def create_job():
                 datetime.now(), datetime.now()
             ))
             
-            for step in TRANSCRIPT_STEPS:
-                cursor.execute("""
-                    INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, step['step_number'], step['name'], 'pending', datetime.now()))
+            now = datetime.now()
+            step_rows = [(job_id, step['step_number'], step['name'], 'pending', now) for step in TRANSCRIPT_STEPS]
+            execute_values(cursor, """
+                INSERT INTO job_steps (job_id, step_number, step_name, status, created_at)
+                VALUES %s
+            """, step_rows, page_size=len(step_rows))
             
             create_activity_log(
                 current_user_id,
                 'job_started',
                 f'Started Transcript Rationale: {title}',
                 job_id,
-                'Transcript Rationale'
+                'Transcript Rationale',
+                cursor=cursor
             )
         
-        thread = threading.Thread(
-            target=run_transcript_pipeline,
-            args=(job_id, job_folder, call_date, call_time)
-        )
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_transcript_pipeline, job_id, job_folder, call_date, call_time)
         
         return jsonify({
             'success': True,
@@ -280,7 +285,6 @@ def create_job():
         
     except Exception as e:
         print(f"Error creating transcript job: {str(e)}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
@@ -361,10 +365,12 @@ def delete_job(job_id):
     try:
         current_user_id = get_jwt_identity()
         
+        # job_steps and saved_rationale rows go with the job (ON DELETE CASCADE)
         with get_db_cursor(commit=True) as cursor:
             cursor.execute("""
-                SELECT folder_path FROM jobs 
+                DELETE FROM jobs 
                 WHERE id = %s AND user_id = %s
+                RETURNING folder_path
             """, (job_id, current_user_id))
             
             job = cursor.fetchone()
@@ -372,10 +378,6 @@ def delete_job(job_id):
             if not job:
                 return jsonify({'error': 'Job not found'}), 404
             
-            cursor.execute("DELETE FROM saved_rationale WHERE job_id = %s", (job_id,))
-            cursor.execute("DELETE FROM job_steps WHERE job_id = %s", (job_id,))
-            cursor.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
-            
             if job['folder_path'] and os.path.exists(job['folder_path']):
                 import shutil
                 shutil.rmtree(job['folder_path'], ignore_errors=True)
@@ -449,7 +451,8 @@ def save_job(job_id):
                 'job_completed',
                 f'Saved Transcript Rationale: {job["title"]}',
                 job_id,
-                'Transcript Rationale'
+                'Transcript Rationale',
+                cursor=cursor
             )
         
         return jsonify({
@@ -603,12 +606,7 @@ def restart_step(job_id, step_number):
         call_date = str(job['date']) if job['date'] else datetime.now().strftime('%Y-%m-%d')
         call_time = str(job['time']) if job['time'] else '10:00:00'
         
-        thread = threading.Thread(
-            target=run_transcript_pipeline,
-            args=(job_id, job['folder_path'], call_date, call_time, step_number)
-        )
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_transcript_pipeline, job_id, job['folder_path'], call_date, call_time, step_number)
         
         return jsonify({
             'success': True,
@@ -775,9 +773,7 @@ def step5_continue_pipeline(job_id):
                         WHERE id = %s
                     """, (datetime.now(), job_id))
         
-        thread = threading.Thread(target=run_remaining_steps)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_remaining_steps)
         
         return jsonify({
             'success': True,
@@ -831,7 +827,6 @@ def save_step5_edits(job_id):
         
     except Exception as e:
         print(f"Error saving Step 5 edits: {str(e)}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': f'Failed to save: {str(e)}'}), 500
 
@@ -882,10 +877,8 @@ def get_failed_charts(job_id):
         
         if step and step['message']:
             try:
-                import json
-                import re
                 message_str = step['message']
-                message_str = re.sub(r'\bNaN\b', '""', message_str)
+                message_str = _BARE_NAN.sub('""', message_str)
                 data = json.loads(message_str)
                 raw_failed_charts = data.get('failed_charts', [])
                 failed_charts = [sanitize_chart_data(fc) for fc in raw_failed_charts]
@@ -899,7 +892,6 @@ def get_failed_charts(job_id):
         
         if not failed_charts and os.path.exists(failed_charts_file):
             try:
-                import json
                 with open(failed_charts_file, 'r', encoding='utf-8') as f:
                     failed_charts = json.load(f)
             except Exception:
@@ -963,7 +955,7 @@ def upload_chart(job_id, stock_index):
         stock_name = str(df.iloc[stock_index].get('INPUT STOCK', f'stock_{stock_index}')).strip()
         symbol = str(df.iloc[stock_index].get('STOCK SYMBOL', '')).strip()
         
-        safe_name = ''.join(c if c.isalnum() else '_' for c in (symbol or stock_name))
+        safe_name = _UNSAFE_FILENAME_CHARS.sub('_', symbol or stock_name)
         filename = f"manual_{safe_name}_{stock_index}.{ext}"
         save_path = os.path.join(charts_folder, filename)
         
@@ -976,7 +968,6 @@ def upload_chart(job_id, stock_index):
         failed_charts_file = os.path.join(analysis_folder, 'failed_charts.json')
         if os.path.exists(failed_charts_file):
             try:
-                import json
                 with open(failed_charts_file, 'r', encoding='utf-8') as f:
                     failed_list = json.load(f)
                 
@@ -1017,7 +1008,6 @@ def upload_chart(job_id, stock_index):
         
     except Exception as e:
         print(f"Error uploading chart: {str(e)}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
@@ -1071,9 +1061,7 @@ def step7_continue_pipeline(job_id):
                         WHERE id = %s
                     """, (datetime.now(), job_id))
         
-        thread = threading.Thread(target=run_pdf_step)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_pdf_step)
         
         return jsonify({
             'success': True,
@@ -1134,9 +1122,7 @@ def skip_failed_charts(job_id):
                         WHERE id = %s
                     """, (datetime.now(), job_id))
         
-        thread = threading.Thread(target=run_pdf_step)
-        thread.daemon = True
-        thread.start()
+        run_in_background(run_pdf_step)
         
         return jsonify({
             'success': True,
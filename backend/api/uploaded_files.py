@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 from backend.utils.database import get_db_cursor
 from backend.utils.path_utils import resolve_uploaded_file_path
+from backend.services.manual_v2.utils import invalidate_master_cache
 from backend.api import uploaded_files_bp
 from datetime import datetime
 import os
@@ -97,23 +98,42 @@ def get_master_stocks():
         if not master_csv_path or not os.path.exists(master_csv_path):
             return jsonify({'error': f'Master CSV file not found on disk. DB path: {db_path}'}), 404
         
-        # Read master CSV and filter EQUITY instruments with ES exchange type
+        # Read master CSV and filter EQUITY instruments with ES exchange type,
+        # taking the columns by index from the header instead of a dict per row
         stocks = []
-        with open(master_csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(master_csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            column = {name: index for index, name in enumerate(header)}
+            width = len(header)
+            
+            instrument_idx = column.get('SEM_INSTRUMENT_NAME')
+            exch_type_idx = column.get('SEM_EXCH_INSTRUMENT_TYPE')
+            symbol_idx = column.get('SEM_TRADING_SYMBOL')
+            security_id_idx = column.get('SEM_SMST_SECURITY_ID')
+            exchange_idx = column.get('SEM_EXM_EXCH_ID')
+            listed_name_idx = column.get('SM_SYMBOL_NAME')
+            short_name_idx = column.get('SEM_CUSTOM_SYMBOL')
+            
+            # Without these columns no row can match
+            if None in (instrument_idx, exch_type_idx, symbol_idx):
+                reader = ()
+            
             for row in reader:
+                if len(row) < width:
+                    row += [''] * (width - len(row))
+                
                 # Filter by EQUITY instrument (SEM_INSTRUMENT_NAME column)
-                instrument = row.get('SEM_INSTRUMENT_NAME', '')
+                instrument = row[instrument_idx]
                 if instrument.upper() != 'EQUITY':
                     continue
                 
                 # Filter by ES exchange type (SEM_EXCH_INSTRUMENT_TYPE column)
-                exch_type = row.get('SEM_EXCH_INSTRUMENT_TYPE', '')
-                if exch_type.upper() != 'ES':
+                if row[exch_type_idx].upper() != 'ES':
                     continue
                 
                 # Get stock symbol from SEM_TRADING_SYMBOL
-                stock_symbol = row.get('SEM_TRADING_SYMBOL', '').strip()
+                stock_symbol = row[symbol_idx].strip()
                 
                 if not stock_symbol:
                     continue
@@ -125,11 +145,11 @@ def get_master_stocks():
                 stocks.append({
                     'name': stock_symbol,
                     'symbol': stock_symbol,
-                    'securityId': row.get('SEM_SMST_SECURITY_ID', ''),
-                    'exchange': row.get('SEM_EXM_EXCH_ID', 'BSE'),
-                    'listedName': row.get('SM_SYMBOL_NAME', ''),
-                    'shortName': row.get('SEM_CUSTOM_SYMBOL', stock_symbol),
-                    'instrument': row.get('SEM_INSTRUMENT_NAME', 'EQUITY')
+                    'securityId': row[security_id_idx] if security_id_idx is not None else '',
+                    'exchange': row[exchange_idx] if exchange_idx is not None else 'BSE',
+                    'listedName': row[listed_name_idx] if listed_name_idx is not None else '',
+                    'shortName': row[short_name_idx] if short_name_idx is not None else stock_symbol,
+                    'instrument': instrument
                 })
         
         # Sort by name and limit results
@@ -240,6 +260,9 @@ def upload_file():
                     
                     # Delete from database
                     cursor.execute("DELETE FROM uploaded_files WHERE file_type = %s", (file_type,))
+            
+            if file_type == 'masterFile':
+                invalidate_master_cache(existing['file_path'] if existing else None)
         
         # Ensure upload directory exists
         os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -295,6 +318,9 @@ def delete_file(file_id):
             # Delete from database
             cursor.execute("DELETE FROM uploaded_files WHERE id = %s", (file_id,))
             
+            if file_record['file_type'] == 'masterFile':
+                invalidate_master_cache(file_record['file_path'])
+            
             return jsonify({'message': 'File deleted successfully'}), 200
             
     except Exception as e:
@@ -5,6 +5,7 @@ from flask import request, jsonify, send_file
 from flask_jwt_extended import jwt_required
 from backend.api import Blueprint
 from backend.services.youtube_caption_service import caption_service
+import traceback
 
 youtube_caption_bp = Blueprint('youtube_caption', __name__, url_prefix='/api/v1/youtube-caption')
 
@@ -141,7 +142,6 @@ def download_caption(caption_id):
         return response
         
     except Exception as e:
-        import traceback
         print(f"Download error: {traceback.format_exc()}")
         return jsonify({
             'success': False,
@@ -5,12 +5,14 @@ from flask_jwt_extended import JWTManager
 from backend.config import Config
 from backend.api import auth_bp, users_bp, api_keys_bp, pdf_template_bp, uploaded_files_bp, channels_bp, media_rationale_bp, premium_rationale_bp, bulk_rationale_bp, saved_rationale_bp, activity_logs_bp, dashboard_bp, manual_v2_bp, generate_chart_bp, youtube_caption_bp, transcript_rationale_bp
 from backend.utils.database import init_database
+from backend.utils.json_provider import ORJSONProvider
 
 def create_app():
     # Serve static files from build directory in production
     static_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'build')
     app = Flask(__name__, static_folder=static_folder, static_url_path='')
     app.config.from_object(Config)
+    app.json = ORJSONProvider(app)
     
     # Initialize database tables
     with app.app_context():
@@ -6,6 +6,9 @@ Translates bulk-input.txt to English using OpenAI
 import os
 import openai
 from backend.utils.database import get_db_cursor
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def get_openai_key():
@@ -32,9 +35,7 @@ def run(job_folder):
             'error': str or None
         }
     """
-    print("\n" + "=" * 60)
-    print("BULK STEP 1: TRANSLATE INPUT TEXT")
-    print(f"{'='*60}\n")
+    logger.info("BULK STEP 1: TRANSLATE INPUT TEXT")
     
     try:
         input_file = os.path.join(job_folder, 'bulk-input.txt')
@@ -53,11 +54,11 @@ def run(job_folder):
                 'error': 'OpenAI API key not found. Please add it in Settings → API Keys.'
             }
         
-        print(f"📖 Reading input file: {input_file}")
+        logger.info("📖 Reading input file: %s", input_file)
         with open(input_file, 'r', encoding='utf-8') as f:
             input_text = f.read()
         
-        print(f"📝 Input text length: {len(input_text)} characters")
+        logger.info("📝 Input text length: %s characters", len(input_text))
         
         if not input_text.strip():
             return {
@@ -65,7 +66,7 @@ def run(job_folder):
                 'error': 'Input text is empty'
             }
         
-        print("🌐 Translating to English using OpenAI...")
+        logger.info("🌐 Translating to English using OpenAI...")
         
         client = openai.OpenAI(api_key=openai_key)
         
@@ -95,16 +96,15 @@ Translate the following text to English while:
         
         translated_text = response.choices[0].message.content.strip()
         
-        print(f"✅ Translation complete: {len(translated_text)} characters")
+        logger.info("✅ Translation complete: %s characters", len(translated_text))
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(translated_text)
         
-        print(f"💾 Saved translated text to: {output_file}")
+        logger.info("💾 Saved translated text to: %s", output_file)
         
-        print("\n📋 Preview (first 500 chars):")
-        print("-" * 40)
-        print(translated_text[:500] + "..." if len(translated_text) > 500 else translated_text)
+        logger.info("📋 Preview (first 500 chars):")
+        logger.info("%s", translated_text[:500] + "..." if len(translated_text) > 500 else translated_text)
         
         return {
             'success': True,
@@ -112,7 +112,7 @@ Translate the following text to English while:
         }
         
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.error("❌ Error: %s", e)
         return {
             'success': False,
             'error': str(e)
@@ -11,6 +11,9 @@ Converts bulk-input-english.txt to structured CSV
 import os
 import re
 import pandas as pd
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def clean_stock_symbol(raw_symbol):
@@ -189,7 +192,7 @@ def parse_bulk_input(input_text):
         if analysis_text and len(analysis_text) >= 10:
             entries.append((stock_line, analysis_text))
         elif stock_line:
-            print(f"⚠️ Skipping '{stock_line}' - no analysis found or too short")
+            logger.warning("⚠️ Skipping '%s' - no analysis found or too short", stock_line)
     
     return entries
 
@@ -259,7 +262,7 @@ def deduplicate_stocks(rows):
             seen.add(stock)
             unique_rows.append(row)
         else:
-            print(f"⚠️ Removing duplicate: {stock}")
+            logger.warning("⚠️ Removing duplicate: %s", stock)
     
     return unique_rows
 
@@ -280,9 +283,7 @@ def run(job_folder, call_date, call_time):
             'error': str or None
         }
     """
-    print("\n" + "=" * 60)
-    print("BULK STEP 2: CONVERT TO CSV")
-    print("=" * 60 + "\n")
+    logger.info("BULK STEP 2: CONVERT TO CSV")
     
     try:
         input_file = os.path.join(job_folder, 'bulk-input-english.txt')
@@ -296,16 +297,16 @@ def run(job_folder, call_date, call_time):
                 'error': f'Translated file not found: {input_file}'
             }
         
-        print(f"📖 Reading input file: {input_file}")
+        logger.info("📖 Reading input file: %s", input_file)
         with open(input_file, 'r', encoding='utf-8') as f:
             input_text = f.read()
         
-        print(f"📝 Text length: {len(input_text)} characters")
-        print(f"📅 Call Date: {call_date}, Time: {call_time}")
+        logger.info("📝 Text length: %s characters", len(input_text))
+        logger.info("📅 Call Date: %s, Time: %s", call_date, call_time)
         
-        print("\n🔄 Parsing input text...")
+        logger.info("🔄 Parsing input text...")
         entries = parse_bulk_input(input_text)
-        print(f"✅ Found {len(entries)} stock entries")
+        logger.info("✅ Found %s stock entries", len(entries))
         
         if not entries:
             return {
@@ -313,15 +314,14 @@ def run(job_folder, call_date, call_time):
                 'error': 'No stock entries found in input. Check input format: each stock should have a name line followed by analysis text.'
             }
         
-        print("\n📋 Processing stocks:")
-        print("-" * 60)
+        logger.info("📋 Processing stocks:")
         
         rows = []
         for idx, (stock_line, analysis) in enumerate(entries):
             stock_symbols = split_and_clean_stocks(stock_line)
             
             for symbol in stock_symbols:
-                print(f"  {len(rows)+1}. {symbol}")
+                logger.info("  %s. %s", len(rows)+1, symbol)
                 rows.append({
                     "DATE": call_date,
                     "TIME": call_time,
@@ -329,9 +329,8 @@ def run(job_folder, call_date, call_time):
                     "ANALYSIS": analysis
                 })
         
-        print("-" * 60)
         
-        print("\n🔍 Removing duplicates...")
+        logger.info("🔍 Removing duplicates...")
         rows = deduplicate_stocks(rows)
         
         if not rows:
@@ -343,14 +342,12 @@ def run(job_folder, call_date, call_time):
         df = pd.DataFrame(rows)
         df.to_csv(output_file, index=False, encoding='utf-8-sig')
         
-        print(f"\n✅ Created {len(df)} stock entries")
-        print(f"💾 Saved to: {output_file}")
+        logger.info("✅ Created %s stock entries", len(df))
+        logger.info("💾 Saved to: %s", output_file)
         
-        print("\n📋 Final Stock List:")
-        print("-" * 40)
+        logger.info("📋 Final Stock List:")
         for idx, (_, row) in enumerate(df.iterrows()):
-            print(f"  {idx+1}. {row['INPUT STOCK']}")
-        print("-" * 40)
+            logger.info("  %s. %s", idx+1, row['INPUT STOCK'])
         
         return {
             'success': True,
@@ -359,9 +356,7 @@ def run(job_folder, call_date, call_time):
         }
         
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         return {
             'success': False,
             'error': str(e)
@@ -9,6 +9,9 @@ import json
 import openai
 import pandas as pd
 from backend.utils.database import get_db_cursor
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def get_openai_key():
@@ -98,13 +101,13 @@ Return ONLY the polished analysis text, nothing else."""
         
         word_count = len(polished.split())
         if word_count < 50:
-            print(f"  ⚠️ Polished text too short ({word_count} words), using original")
+            logger.warning("  ⚠️ Polished text too short (%s words), using original", word_count)
             return original_analysis
         
         return polished
         
     except Exception as e:
-        print(f"  ⚠️ Error polishing: {str(e)}")
+        logger.warning("  ⚠️ Error polishing: %s", e)
         return original_analysis
 
 
@@ -122,9 +125,7 @@ def run(job_folder):
             'error': str or None
         }
     """
-    print("\n" + "=" * 60)
-    print("BULK STEP 2b: POLISH ANALYSIS")
-    print(f"{'='*60}\n")
+    logger.info("BULK STEP 2b: POLISH ANALYSIS")
     
     try:
         analysis_folder = os.path.join(job_folder, 'analysis')
@@ -144,9 +145,9 @@ def run(job_folder):
                 'error': 'OpenAI API key not found. Please add it in Settings → API Keys.'
             }
         
-        print(f"📖 Loading CSV: {input_file}")
+        logger.info("📖 Loading CSV: %s", input_file)
         df = pd.read_csv(input_file)
-        print(f"✅ Loaded {len(df)} stocks")
+        logger.info("✅ Loaded %s stocks", len(df))
         
         if 'ANALYSIS' not in df.columns:
             df.columns = df.columns.str.strip().str.upper()
@@ -165,8 +166,7 @@ def run(job_folder):
         
         client = openai.OpenAI(api_key=openai_key)
         
-        print("\n🔄 Polishing analysis for each stock...")
-        print("-" * 60)
+        logger.info("🔄 Polishing analysis for each stock...")
         
         polished_count = 0
         for idx, row in df.iterrows():
@@ -174,25 +174,24 @@ def run(job_folder):
             original_analysis = str(row.get('ANALYSIS', '')).strip()
             
             if not original_analysis or original_analysis.lower() in ['nan', 'none', '']:
-                print(f"  ⏭️ {stock_name}: No analysis to polish")
+                logger.info("  ⏭️ %s: No analysis to polish", stock_name)
                 continue
             
-            print(f"  📝 Polishing: {stock_name}...")
+            logger.info("  📝 Polishing: %s...", stock_name)
             polished = polish_analysis(client, stock_name, original_analysis)
             df.at[idx, 'ANALYSIS'] = polished
             polished_count += 1
             
             word_count = len(polished.split())
-            print(f"     ✅ Done ({word_count} words)")
+            logger.info("     ✅ Done (%s words)", word_count)
         
-        print("-" * 60)
-        print(f"\n📊 Summary:")
-        print(f"   Total stocks: {len(df)}")
-        print(f"   Polished: {polished_count}")
+        logger.info("📊 Summary:")
+        logger.info("   Total stocks: %s", len(df))
+        logger.info("   Polished: %s", polished_count)
         
-        print(f"\n💾 Saving to: {output_file}")
+        logger.info("💾 Saving to: %s", output_file)
         df.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✅ Saved polished analysis CSV\n")
+        logger.info("✅ Saved polished analysis CSV")
         
         return {
             'success': True,
@@ -202,9 +201,7 @@ def run(job_folder):
         }
         
     except Exception as e:
-        print(f"\n❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         return {
             'success': False,
             'error': str(e)
@@ -36,6 +36,9 @@ import re
 import pandas as pd
 import psycopg2
 from backend.utils.path_utils import resolve_uploaded_file_path
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def normalize_for_exact_match(s):
@@ -226,8 +229,8 @@ def get_master_file_path():
         if result:
             db_path = result[0]
             resolved_path = resolve_uploaded_file_path(db_path)
-            print(f"📂 Master file path from DB: {db_path}")
-            print(f"📂 Resolved to: {resolved_path}")
+            logger.info("📂 Master file path from DB: %s", db_path)
+            logger.info("📂 Resolved to: %s", resolved_path)
             return resolved_path
         else:
             raise ValueError("Master file not found in database. Please upload it first in Settings.")
@@ -291,9 +294,7 @@ def run(job_folder):
     Returns:
         dict: Status, message, and output files
     """
-    print("\n" + "="*60)
-    print("BULK STEP 4: MAP MASTER FILE (SYMBOL MAPPING)")
-    print("="*60 + "\n")
+    logger.info("BULK STEP 4: MAP MASTER FILE (SYMBOL MAPPING)")
     
     try:
         analysis_folder = os.path.join(job_folder, 'analysis')
@@ -308,9 +309,9 @@ def run(job_folder):
                 'error': f'Bulk input CSV not found: {input_csv}'
             }
         
-        print(f"📖 Using input file: {os.path.basename(input_csv)}")
+        logger.info("📖 Using input file: %s", os.path.basename(input_csv))
         
-        print("\n🔑 Retrieving master file path from database...")
+        logger.info("🔑 Retrieving master file path from database...")
         master_file_path = get_master_file_path()
         
         if not os.path.exists(master_file_path):
@@ -319,17 +320,17 @@ def run(job_folder):
                 'error': f'Master file not found at: {master_file_path}'
             }
         
-        print(f"✅ Master file found\n")
+        logger.info("✅ Master file found")
         
-        print("📖 Loading master file...")
+        logger.info("📖 Loading master file...")
         df_master = pd.read_csv(master_file_path, low_memory=False)
-        print(f"✅ Loaded {len(df_master)} records from master file\n")
+        logger.info("✅ Loaded %s records from master file", len(df_master))
         
-        print("🔍 Filtering for EQUITY instruments...")
+        logger.info("🔍 Filtering for EQUITY instruments...")
         df_master = df_master[df_master["SEM_INSTRUMENT_NAME"].astype(str).str.upper() == "EQUITY"].copy()
-        print(f"✅ {len(df_master)} EQUITY records found\n")
+        logger.info("✅ %s EQUITY records found", len(df_master))
         
-        print("🔧 Normalizing master file fields...")
+        logger.info("🔧 Normalizing master file fields...")
         for col in ["SEM_TRADING_SYMBOL", "SEM_CUSTOM_SYMBOL", "SM_SYMBOL_NAME", "SEM_EXM_EXCH_ID"]:
             if col in df_master.columns:
                 df_master[col] = df_master[col].astype(str).str.strip().str.upper()
@@ -343,9 +344,9 @@ def run(job_folder):
         df_master["exchange_priority"] = df_master["SEM_EXM_EXCH_ID"].apply(
             lambda x: 1 if x == "NSE" else (2 if x == "BSE" else 3)
         )
-        print("✅ Master file normalized\n")
+        logger.info("✅ Master file normalized")
         
-        print("📖 Loading bulk input stocks...")
+        logger.info("📖 Loading bulk input stocks...")
         df_input = pd.read_csv(input_csv)
         df_input.columns = df_input.columns.str.strip().str.upper()
         
@@ -361,22 +362,23 @@ def run(job_folder):
         df_input['INPUT STOCK'] = df_input['INPUT STOCK'].astype(str).str.strip().str.upper()
         df_input["INPUT_STOCK_NORM"] = df_input['INPUT STOCK'].apply(normalize_for_exact_match)
         
-        print(f"✅ Loaded {len(df_input)} stocks to map\n")
+        logger.info("✅ Loaded %s stocks to map", len(df_input))
         
-        print("🔗 Starting stock matching process...")
-        print("-" * 80)
-        print(f"{'INPUT STOCK':<25} {'MATCHED SYMBOL':<18} {'METHOD':<35} {'EXCH':<5}")
-        print("-" * 80)
+        logger.info("🔗 Starting stock matching process...")
+        logger.info("%-25s %-18s %-35s %-5s", 'INPUT STOCK', 'MATCHED SYMBOL', 'METHOD', 'EXCH')
         
         results = []
         matched_count = 0
         
+        # Every row has the same columns, so pick the analysis column once
+        analysis_column = 'ANALYSIS' if 'ANALYSIS' in df_input.columns else 'RATIONALE'
+        
         for idx, row in df_input.iterrows():
             input_stock = row['INPUT STOCK']
             input_stock_norm = row['INPUT_STOCK_NORM']
             date = row.get('DATE', '')
             time = row.get('TIME', '')
-            analysis = row.get('ANALYSIS', row.get('RATIONALE', ''))
+            analysis = row.get(analysis_column, '')
             chart_type = row.get('CHART TYPE', 'Daily')
             
             match = None
@@ -443,9 +445,9 @@ def run(job_folder):
                     "INSTRUMENT": instrument
                 })
                 matched_count += 1
-                print(f"✅ {input_stock:<25} {stock_symbol:<18} {match_source:<35} {exchange:<5}")
+                logger.info("✅ %-25s %-18s %-35s %-5s", input_stock, stock_symbol, match_source, exchange)
             else:
-                print(f"❌ {input_stock:<25} {'NO MATCH':<18} {'':<35} {'':<5}")
+                logger.warning("❌ %-25s %-18s %-35s %-5s", input_stock, 'NO MATCH', '', '')
                 results.append({
                     "DATE": date,
                     "TIME": time,
@@ -460,27 +462,26 @@ def run(job_folder):
                     "INSTRUMENT": ""
                 })
         
-        print("-" * 80)
-        print(f"\n📊 Mapping Summary:")
-        print(f"   Total stocks: {len(df_input)}")
-        print(f"   Matched: {matched_count}")
-        print(f"   Unmatched: {len(df_input) - matched_count}")
+        logger.info("📊 Mapping Summary:")
+        logger.info("   Total stocks: %s", len(df_input))
+        logger.info("   Matched: %s", matched_count)
+        logger.info("   Unmatched: %s", len(df_input) - matched_count)
         
         if len(df_input) - matched_count > 0:
-            print("\n⚠️  Unmatched stocks (please check spelling):")
+            logger.warning("⚠️  Unmatched stocks (please check spelling):")
             for r in results:
                 if not r.get("STOCK SYMBOL"):
-                    print(f"   - {r['INPUT STOCK']}")
+                    logger.info("   - %s", r['INPUT STOCK'])
         
-        print(f"\n💾 Saving mapped data to: {output_csv}")
+        logger.info("💾 Saving mapped data to: %s", output_csv)
         final_df = pd.DataFrame(results)
         
         os.makedirs(os.path.dirname(output_csv), exist_ok=True)
         
         final_df.to_csv(output_csv, index=False, encoding='utf-8-sig')
         
-        print(f"✅ Saved {len(final_df)} records")
-        print(f"✅ Output: analysis/mapped_master_file.csv\n")
+        logger.info("✅ Saved %s records", len(final_df))
+        logger.info("✅ Output: analysis/mapped_master_file.csv")
         
         return {
             'success': True,
@@ -491,9 +492,7 @@ def run(job_folder):
         }
     
     except Exception as e:
-        print(f"\n❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         return {
             'success': False,
             'error': str(e)
@@ -10,6 +10,9 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from backend.utils.database import get_db_cursor
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def normalize_date_format(date_str):
@@ -319,7 +322,7 @@ def fetch_cmp_for_stock(security_id, exchange, date_str, time_str, headers):
         return None
         
     except Exception as e:
-        print(f"      Error fetching CMP: {str(e)}")
+        logger.error("      Error fetching CMP: %s", e)
         return None
 
 
@@ -337,9 +340,7 @@ def run(job_folder):
             'error': str or None
         }
     """
-    print("\n" + "=" * 60)
-    print("BULK STEP 4: FETCH CMP (CURRENT MARKET PRICE)")
-    print(f"{'='*60}\n")
+    logger.info("BULK STEP 4: FETCH CMP (CURRENT MARKET PRICE)")
     
     try:
         analysis_folder = os.path.join(job_folder, 'analysis')
@@ -365,17 +366,16 @@ def run(job_folder):
             "access-token": dhan_key
         }
         
-        print(f"🔑 Dhan API key found")
+        logger.info("🔑 Dhan API key found")
         
-        print(f"📖 Loading mapped stocks: {input_file}")
+        logger.info("📖 Loading mapped stocks: %s", input_file)
         df = pd.read_csv(input_file)
-        print(f"✅ Loaded {len(df)} stocks")
+        logger.info("✅ Loaded %s stocks", len(df))
         
         if 'CMP' not in df.columns:
             df['CMP'] = None
         
-        print("\n💹 Fetching Current Market Prices...")
-        print("-" * 60)
+        logger.info("💹 Fetching Current Market Prices...")
         
         success_count = 0
         failed_count = 0
@@ -388,7 +388,7 @@ def run(job_folder):
                 security_id = security_id.split('.')[0]
             
             if not security_id or security_id == '' or security_id == 'nan':
-                print(f"  ⚠️ {stock_name:30} | Missing SECURITY ID, skipping")
+                logger.warning("  ⚠️ %-30s | Missing SECURITY ID, skipping", stock_name)
                 failed_count += 1
                 continue
             
@@ -399,7 +399,7 @@ def run(job_folder):
             # Normalize date format to YYYY-MM-DD
             date_str = normalize_date_format(raw_date)
             if not date_str:
-                print(f"  ⚠️ {stock_name:30} | Invalid date format: {raw_date}, skipping")
+                logger.warning("  ⚠️ %-30s | Invalid date format: %s, skipping", stock_name, raw_date)
                 failed_count += 1
                 continue
             
@@ -412,26 +412,26 @@ def run(job_folder):
             
             # Log if date or time was converted
             if raw_date != date_str or raw_time != time_str:
-                print(f"  📅 Normalized: {raw_date} {raw_time} → {date_str} {time_str}")
+                logger.info("  📅 Normalized: %s %s → %s %s", raw_date, raw_time, date_str, time_str)
             
             cmp = fetch_cmp_for_stock(security_id, exchange, date_str, time_str, headers)
             
             if cmp:
                 df.at[i, 'CMP'] = round(cmp, 2)
                 success_count += 1
-                print(f"  ✓ {stock_name:30} | CMP: ₹{cmp:.2f}")
+                logger.info("  ✓ %-30s | CMP: ₹%.2f", stock_name, cmp)
             else:
                 failed_count += 1
-                print(f"  ✗ {stock_name:30} | Failed to fetch CMP")
+                logger.warning("  ✗ %-30s | Failed to fetch CMP", stock_name)
             
             time.sleep(0.5)
         
         df.to_csv(output_file, index=False, encoding='utf-8-sig')
         
-        print(f"\n📊 CMP Fetch Results:")
-        print(f"   ✓ Success: {success_count}")
-        print(f"   ✗ Failed: {failed_count}")
-        print(f"\n💾 Saved to: {output_file}")
+        logger.info("📊 CMP Fetch Results:")
+        logger.info("   ✓ Success: %s", success_count)
+        logger.info("   ✗ Failed: %s", failed_count)
+        logger.info("💾 Saved to: %s", output_file)
         
         return {
             'success': True,
@@ -441,9 +441,7 @@ def run(job_folder):
         }
         
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         return {
             'success': False,
             'error': str(e)
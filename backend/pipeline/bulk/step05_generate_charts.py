@@ -18,6 +18,9 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import mplfinance as mpf
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 IST = pytz.timezone("Asia/Kolkata")
 BASE_URL = "https://api.dhan.co/v2"
@@ -369,9 +372,7 @@ def run(job_folder, call_date=None, call_time=None):
             'error': str or None
         }
     """
-    print("\n" + "=" * 60)
-    print("BULK STEP 5: GENERATE STOCK CHARTS (PREMIUM DESIGN)")
-    print(f"{'='*60}\n")
+    logger.info("BULK STEP 5: GENERATE STOCK CHARTS (PREMIUM DESIGN)")
     
     try:
         analysis_folder = os.path.join(job_folder, 'analysis')
@@ -379,9 +380,14 @@ def run(job_folder, call_date=None, call_time=None):
         input_file = os.path.join(analysis_folder, 'stocks_with_cmp.csv')
         output_file = os.path.join(analysis_folder, 'stocks_with_charts.csv')
         failed_charts_file = os.path.join(analysis_folder, 'failed_charts.json')
+        overrides_file = os.path.join(analysis_folder, 'chart_overrides.json')
         
         os.makedirs(charts_folder, exist_ok=True)
         
+        # Uploaded charts belong to the previous run's rows
+        if os.path.exists(overrides_file):
+            os.remove(overrides_file)
+        
         if not os.path.exists(input_file):
             return {
                 'success': False,
@@ -401,24 +407,23 @@ def run(job_folder, call_date=None, call_time=None):
             "access-token": dhan_key
         }
         
-        print(f"🔑 Dhan API key found")
+        logger.info("🔑 Dhan API key found")
         
         if call_date:
-            print(f"📅 Using job date: {call_date}")
+            logger.info("📅 Using job date: %s", call_date)
         if call_time:
-            print(f"⏰ Using job time: {call_time}")
+            logger.info("⏰ Using job time: %s", call_time)
         
-        print(f"📖 Loading stocks: {input_file}")
+        logger.info("📖 Loading stocks: %s", input_file)
         df = pd.read_csv(input_file)
-        print(f"✅ Loaded {len(df)} stocks")
+        logger.info("✅ Loaded %s stocks", len(df))
         
         if 'CHART PATH' not in df.columns:
             df['CHART PATH'] = ''
         if 'CHART TYPE' not in df.columns:
             df['CHART TYPE'] = 'Daily'
         
-        print(f"\n📈 Generating premium charts...")
-        print("-" * 60)
+        logger.info("📈 Generating premium charts...")
         
         success_count = 0
         failed_count = 0
@@ -435,7 +440,7 @@ def run(job_folder, call_date=None, call_time=None):
                     security_id = security_id.split('.')[0]
                 
                 if not security_id or security_id == '' or security_id == 'nan':
-                    print(f"  ⚠️ [{idx+1}/{len(df)}] {stock_name:25} | Skipping - No SECURITY ID")
+                    logger.warning("  ⚠️ [%s/%s] %-25s | Skipping - No SECURITY ID", idx+1, len(df), stock_name)
                     failed_charts.append({
                         'index': idx,
                         'stock_name': stock_name,
@@ -470,7 +475,7 @@ def run(job_folder, call_date=None, call_time=None):
                     except (ValueError, TypeError):
                         cmp = None
                 
-                print(f"  [{idx+1}/{len(df)}] {stock_name[:25]:25} ({chart_type}, {exchange})...")
+                logger.info("  [%s/%s] %-25s (%s, %s)...", idx+1, len(df), stock_name[:25], chart_type, exchange)
                 
                 date_obj = parse_date(date_str)
                 h, m, s = parse_time(time_str)
@@ -498,12 +503,12 @@ def run(job_folder, call_date=None, call_time=None):
                         raise ValueError("No data for requested date/time")
                     
                 except Exception as primary_error:
-                    print(f"      ℹ️ No data for {date_obj}, fetching last trading day...")
+                    logger.info("      ℹ️ No data for %s, fetching last trading day...", date_obj)
                     
                     last_close = get_last_trading_day_close(end_dt_local)
                     last_date = last_close.date()
                     
-                    print(f"      ℹ️ Using last trading day: {last_date.strftime('%Y-%m-%d')} 3:30 PM")
+                    logger.info("      ℹ️ Using last trading day: %s 3:30 PM", last_date.strftime('%Y-%m-%d'))
                     
                     start_hist = last_date - relativedelta(months=8)
                     end_hist_non_inclusive = last_date + timedelta(days=1)
@@ -541,14 +546,14 @@ def run(job_folder, call_date=None, call_time=None):
                 df.at[idx, 'CHART PATH'] = relative_path
                 df.at[idx, 'CHART TYPE'] = chart_type
                 
-                print(f"      ✅ Chart saved: {fname}")
+                logger.info("      ✅ Chart saved: %s", fname)
                 success_count += 1
                 
                 time.sleep(1.5)
                 
             except Exception as e:
                 error_msg = str(e)
-                print(f"      ❌ Error: {error_msg}")
+                logger.error("      ❌ Error: %s", error_msg)
                 df.at[idx, 'CHART PATH'] = ''
                 failed_charts.append({
                     'index': idx,
@@ -565,12 +570,12 @@ def run(job_folder, call_date=None, call_time=None):
         if failed_charts:
             with open(failed_charts_file, 'w', encoding='utf-8') as f:
                 json.dump(failed_charts, f, indent=2)
-            print(f"\n📋 Failed charts info saved to: {failed_charts_file}")
+            logger.info("📋 Failed charts info saved to: %s", failed_charts_file)
         
-        print(f"\n📊 Chart Generation Results:")
-        print(f"   ✓ Success: {success_count}")
-        print(f"   ✗ Failed: {failed_count}")
-        print(f"\n💾 Saved to: {output_file}")
+        logger.info("📊 Chart Generation Results:")
+        logger.info("   ✓ Success: %s", success_count)
+        logger.info("   ✗ Failed: %s", failed_count)
+        logger.info("💾 Saved to: %s", output_file)
         
         return {
             'success': True,
@@ -581,9 +586,7 @@ def run(job_folder, call_date=None, call_time=None):
         }
         
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         return {
             'success': False,
             'error': str(e)
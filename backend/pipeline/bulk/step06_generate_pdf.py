@@ -7,6 +7,7 @@ Creates a professional PDF report from stocks_with_charts.csv with premium blue
 
 import os
 import re
+import json
 import pandas as pd
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
@@ -24,6 +25,9 @@ from PIL import Image as PILImage, ImageDraw
 from datetime import datetime
 import psycopg2
 from backend.utils.reportlab_html import extract_html_content, create_html_flowables
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def get_db_connection():
@@ -70,12 +74,12 @@ def fetch_pdf_config(job_id: str):
                 for path in possible_paths:
                     if os.path.exists(path):
                         channel_logo_path = path
-                        print(f"✅ Found channel logo at: {path}")
+                        logger.info("✅ Found channel logo at: %s", path)
                         break
                 
                 if not channel_logo_path:
-                    print(f"⚠️ Channel logo file not found: {channel_logo_path_raw}")
-                    print(f"   Tried paths: {possible_paths}")
+                    logger.warning("⚠️ Channel logo file not found: %s", channel_logo_path_raw)
+                    logger.info("   Tried paths: %s", possible_paths)
         
         cursor.execute("""
             SELECT company_name, registration_details, disclaimer_text, disclosure_text, company_data
@@ -160,7 +164,7 @@ def make_round_logo(src_path, diameter_px=360):
         out.save(tmp_path, "PNG")
         return tmp_path
     except Exception as e:
-        print(f"⚠️ Could not create round logo: {e}")
+        logger.warning("⚠️ Could not create round logo: %s", e)
         return src_path
 
 
@@ -179,9 +183,7 @@ def run(job_folder, template_config=None):
             'error': str or None
         }
     """
-    print("\n" + "=" * 60)
-    print("BULK RATIONALE STEP 6: GENERATE PDF")
-    print("=" * 60 + "\n")
+    logger.info("BULK RATIONALE STEP 6: GENERATE PDF")
     
     try:
         job_id = os.path.basename(job_folder)
@@ -194,14 +196,24 @@ def run(job_folder, template_config=None):
                 'error': f'Input file not found: {stocks_csv}'
             }
         
-        print(f"📊 Loading stocks from {stocks_csv}...")
+        logger.info("📊 Loading stocks from %s...", stocks_csv)
         df = pd.read_csv(stocks_csv, encoding="utf-8-sig")
-        print(f"✅ Loaded {len(df)} stocks")
-        
-        print("🔑 Fetching PDF configuration from database...")
+        logger.info("✅ Loaded %s stocks", len(df))
+        
+        # Charts uploaded by hand after Step 6 are kept as {row index: chart path}
+        overrides_file = os.path.join(job_folder, "analysis/chart_overrides.json")
+        if os.path.exists(overrides_file):
+            with open(overrides_file, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+            df["CHART PATH"] = df["CHART PATH"].astype(object)
+            for idx, chart_path in overrides.items():
+                df.at[int(idx), "CHART PATH"] = chart_path
+            logger.info("🖼️ Applied %s uploaded chart(s)", len(overrides))
+        
+        logger.info("🔑 Fetching PDF configuration from database...")
         config = fetch_pdf_config(job_id)
-        print(f"✅ Platform: {config['channel_name']}")
-        print(f"✅ Report: {config['title']}")
+        logger.info("✅ Platform: %s", config['channel_name'])
+        logger.info("✅ Report: %s", config['title'])
         
         input_date = config.get('input_date', '')
         if input_date:
@@ -217,7 +229,7 @@ def run(job_folder, template_config=None):
         output_pdf = os.path.join(job_folder, "pdf", pdf_filename)
         os.makedirs(os.path.dirname(output_pdf), exist_ok=True)
         
-        print(f"📄 Output: {output_pdf}")
+        logger.info("📄 Output: %s", output_pdf)
         
         BASE_REG = "NotoSans"
         BASE_BLD = "NotoSans-Bold"
@@ -300,7 +312,7 @@ def run(job_folder, template_config=None):
                 if logo_path and os.path.exists(logo_path):
                     ROUND_LOGO = logo_path
             except Exception as e:
-                print(f"⚠️ Could not create round logo: {e}")
+                logger.warning("⚠️ Could not create round logo: %s", e)
         
         def padded_block(flowables, left=10, right=10):
             total_w = PAGE_W - M_L - M_R
@@ -359,7 +371,7 @@ def run(job_folder, template_config=None):
                     c.drawImage(config['company_logo_path'], PAGE_W - 90, PAGE_H - 55, 48, 24,
                                preserveAspectRatio=True, mask='auto')
                 except Exception as e:
-                    print(f"⚠️ Could not draw company logo: {e}")
+                    logger.warning("⚠️ Could not draw company logo: %s", e)
         
         def draw_blue_stripe_header(c: pdfcanvas.Canvas):
             stripe_h = 20
@@ -382,7 +394,7 @@ def run(job_folder, template_config=None):
                                preserveAspectRatio=True, mask='auto')
                     cur_x += logo_sz + 8
                 except Exception as e:
-                    print(f"⚠️ Could not draw logo in footer: {e}")
+                    logger.warning("⚠️ Could not draw logo in footer: %s", e)
                     c.setStrokeColor(BLUE)
                     c.circle(cur_x + logo_sz/2, baseline_y, logo_sz/2, stroke=1, fill=0)
                     cur_x += logo_sz + 8
@@ -467,7 +479,7 @@ def run(job_folder, template_config=None):
             h = max(3.2*inch, min(max_w * 9/16, 4.8*inch))
             return Image(path, width=max_w, height=h)
         
-        print(f"📝 Generating {len(df)} stock pages...")
+        logger.info("📝 Generating %s stock pages...", len(df))
         for idx, row in df.iterrows():
             date_val = str(row.get("DATE", "") or "").strip()
             
@@ -490,7 +502,7 @@ def run(job_folder, template_config=None):
                         story.append(full_width_chart(chart_path))
                         story.append(Spacer(1, 14))
                     except Exception as e:
-                        print(f"⚠️ Could not add chart {chart_path}: {e}")
+                        logger.warning("⚠️ Could not add chart %s: %s", chart_path, e)
                         story.append(Paragraph("<i>Chart unavailable</i>", small_grey))
                         story.append(Spacer(1, 10))
                 else:
@@ -511,10 +523,10 @@ def run(job_folder, template_config=None):
             story.append(PageBreak())
             
             if (idx + 1) % 10 == 0:
-                print(f"  ✅ Generated {idx + 1}/{len(df)} pages")
+                logger.info("  ✅ Generated %s/%s pages", idx + 1, len(df))
         
         if config.get('disclaimer_text'):
-            print("📋 Adding Disclaimer section...")
+            logger.info("📋 Adding Disclaimer section...")
             story.append(heading("Disclaimer"))
             story.append(Spacer(1, 10))
             
@@ -530,7 +542,7 @@ def run(job_folder, template_config=None):
             story.append(Spacer(1, 35))
         
         if config.get('disclosure_text'):
-            print("📋 Adding Disclosure section...")
+            logger.info("📋 Adding Disclosure section...")
             story.append(heading("Disclosure"))
             story.append(Spacer(1, 10))
             
@@ -572,7 +584,7 @@ def run(job_folder, template_config=None):
         
         story.append(PageBreak())
         
-        print("📋 Adding Contact Details section...")
+        logger.info("📋 Adding Contact Details section...")
         story.append(heading("Contact Details"))
         story.append(Spacer(1, 14))
         
@@ -618,12 +630,12 @@ def run(job_folder, template_config=None):
         story.append(contact_grid)
         story.append(Spacer(1, 35))
         
-        print("🔨 Building PDF...")
+        logger.info("🔨 Building PDF...")
         doc.build(story, onFirstPage=on_first_page, onLaterPages=on_later_pages)
         
-        print(f"✅ PDF generated successfully!")
-        print(f"📄 Output: {output_pdf}")
-        print(f"📊 Total pages: {len(df)} stocks + disclaimers\n")
+        logger.info("✅ PDF generated successfully!")
+        logger.info("📄 Output: %s", output_pdf)
+        logger.info("📊 Total pages: %s stocks + disclaimers", len(df))
         
         return {
             'success': True,
@@ -631,9 +643,7 @@ def run(job_folder, template_config=None):
         }
         
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         return {
             'success': False,
             'error': str(e)
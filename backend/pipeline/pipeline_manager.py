@@ -61,22 +61,28 @@ def update_step_status(job_id, step_number, status, message=None, output_files=N
                     WHERE job_id = %s AND step_number = %s
                 """, (status, datetime.now(), message, job_id, step_number))
             
-            elif status in ['success', 'failed']:
-                cursor.execute("""
-                    UPDATE job_steps 
-                    SET status = %s, ended_at = %s, message = %s, output_files = %s
-                    WHERE job_id = %s AND step_number = %s
-                """, (status, datetime.now(), message, output_files or [], job_id, step_number))
-            
-            # Update job's current step and progress
-            if status == 'success':
+            elif status == 'success':
+                # Step row and the job's current step/progress go out as one statement
                 # Pipeline has 14 steps (Step 15 is API-only, not part of automatic pipeline)
                 progress = int((step_number / 14) * 100)
                 cursor.execute("""
+                    WITH step AS (
+                        UPDATE job_steps 
+                        SET status = %s, ended_at = %s, message = %s, output_files = %s
+                        WHERE job_id = %s AND step_number = %s
+                    )
                     UPDATE jobs 
                     SET current_step = %s, progress = %s, updated_at = %s
                     WHERE id = %s
-                """, (step_number, progress, datetime.now(), job_id))
+                """, (status, datetime.now(), message, output_files or [], job_id, step_number,
+                      step_number, progress, datetime.now(), job_id))
+            
+            elif status == 'failed':
+                cursor.execute("""
+                    UPDATE job_steps 
+                    SET status = %s, ended_at = %s, message = %s, output_files = %s
+                    WHERE job_id = %s AND step_number = %s
+                """, (status, datetime.now(), message, output_files or [], job_id, step_number))
             
             return True
     except Exception as e:
@@ -140,58 +140,49 @@ DATE,TIME,STOCK NAME,TARGETS,STOP LOSS,HOLDING PERIOD,CALL,CHART TYPE
         
         # Parse and re-write CSV with proper quoting to handle commas in values
         import io
-        csv_buffer = io.StringIO(csv_content)
-        reader = csv.DictReader(csv_buffer)
-        rows = list(reader)
-        stocks_count = len(rows)
-        
-        # Get valid fieldnames (filter out None)
-        valid_fieldnames = [fn for fn in reader.fieldnames if fn is not None]
-        
-        # Clean rows: remove None keys and ensure all expected fields exist
-        cleaned_rows = []
+        reader = csv.reader(io.StringIO(csv_content))
+        fieldnames = next(reader, None) or []
+        width = len(fieldnames)
+        chart_type_index = fieldnames.index('CHART TYPE') if 'CHART TYPE' in fieldnames else None
         valid_chart_types = {"Daily", "Weekly", "Monthly"}
         
-        for row in rows:
-            # Remove None keys from row
-            cleaned_row = {k: v for k, v in row.items() if k is not None}
+        # Fit each row to the header (extra values dropped, missing ones blank)
+        cleaned_rows = []
+        for row in reader:
+            if not row:
+                continue
             
-            # Ensure all expected fields exist
-            for field in valid_fieldnames:
-                if field not in cleaned_row:
-                    cleaned_row[field] = ''
+            cleaned_row = row[:width] + [''] * (width - len(row))
             
             # Sanitize CHART TYPE
-            chart_type = str(cleaned_row.get('CHART TYPE', '')).strip()
-            if chart_type not in valid_chart_types:
-                cleaned_row['CHART TYPE'] = 'Daily'
-                print(f"   ⚠️  Invalid CHART TYPE '{chart_type}' → defaulting to 'Daily'")
+            if chart_type_index is not None:
+                chart_type = cleaned_row[chart_type_index].strip()
+                if chart_type not in valid_chart_types:
+                    cleaned_row[chart_type_index] = 'Daily'
+                    print(f"   ⚠️  Invalid CHART TYPE '{chart_type}' → defaulting to 'Daily'")
             
             cleaned_rows.append(cleaned_row)
         
+        if not cleaned_rows:
+            raise ValueError("Generated CSV has no data rows")
+        
+        stocks_count = len(cleaned_rows)
+        
         # Save CSV with proper quoting
         with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-            if cleaned_rows:
-                writer = csv.DictWriter(f, fieldnames=valid_fieldnames, quoting=csv.QUOTE_MINIMAL)
-                writer.writeheader()
-                writer.writerows(cleaned_rows)
-        
-        # Re-read to validate
-        with open(output_csv, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            stocks_count = len(rows)
-            
-            # Validate required columns
-            required_columns = ['DATE', 'TIME', 'STOCK NAME', 'TARGETS', 'STOP LOSS', 'HOLDING PERIOD', 'CALL', 'CHART TYPE']
-            if reader.fieldnames:
-                missing_cols = [col for col in required_columns if col not in reader.fieldnames]
-                if missing_cols:
-                    raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(fieldnames)
+            writer.writerows(cleaned_rows)
+        
+        # Validate required columns against the header just written
+        required_columns = ['DATE', 'TIME', 'STOCK NAME', 'TARGETS', 'STOP LOSS', 'HOLDING PERIOD', 'CALL', 'CHART TYPE']
+        missing_cols = [col for col in required_columns if col not in fieldnames]
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
         
         print(f"✅ Generated CSV with {stocks_count} stock call(s)")
         print(f"   Output: {output_csv}")
-        print(f"   Columns: {', '.join(reader.fieldnames) if reader.fieldnames else 'Unknown'}")
+        print(f"   Columns: {', '.join(fieldnames)}")
         
         return {
             'success': True,
@@ -15,7 +15,7 @@ import matplotlib.pyplot as plt
 import mplfinance as mpf
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
-from backend.utils.database import get_db_cursor
+from backend.utils.api_key_cache import get_api_key
 
 IST = pytz.timezone("Asia/Kolkata")
 BASE_URL = "https://api.dhan.co/v2"
@@ -33,11 +33,7 @@ class ChartGeneratorService:
     def _get_dhan_api_key(self):
         """Get Dhan API key from database"""
         try:
-            with get_db_cursor() as cursor:
-                cursor.execute("SELECT key_value FROM api_keys WHERE provider = 'dhan'")
-                result = cursor.fetchone()
-                if result and result['key_value']:
-                    return result['key_value']
+            return get_api_key('dhan')
         except Exception as e:
             print(f"Error getting Dhan API key: {e}")
         return None
@@ -1,103 +1,151 @@
 import os
 import uuid
-import threading
-from datetime import datetime
 from typing import Dict, List
 from backend.utils.database import get_db_cursor
+from backend.utils.background import run_in_background
+from backend.utils.log_utils import get_logger
 from .utils import create_input_csv
 from .step01_fetch_cmp import fetch_cmp_for_stocks
 from .step02_generate_charts import generate_charts_for_stocks
 from .step03_generate_pdf import generate_manual_pdf
 
+logger = get_logger(__name__)
+
+JOB_SUBFOLDERS = ('analysis', 'charts', 'pdf')
+
+# Last of the three pipeline steps
+PDF_STEP = 3
+
+# Status transitions of a run. Paired job_steps/jobs changes are single CTE
+# statements, so each transition is one statement and one commit.
+_SQL_START_PIPELINE = """
+    WITH first_step AS (
+        UPDATE job_steps SET status = 'running', started_at = CURRENT_TIMESTAMP
+        WHERE job_id = %(job_id)s AND step_number = 1
+    )
+    UPDATE jobs SET status = 'processing', progress = 0, current_step = 1, updated_at = CURRENT_TIMESTAMP
+    WHERE id = %(job_id)s
+    RETURNING date, payload
+"""
+
+# Success of one step and start of the next
+_SQL_ADVANCE_STEP = """
+    WITH done AS (
+        UPDATE job_steps SET status = 'success', message = %(message)s, ended_at = CURRENT_TIMESTAMP
+        WHERE job_id = %(job_id)s AND step_number = %(step_number)s
+    ), started AS (
+        UPDATE job_steps SET status = 'running', started_at = CURRENT_TIMESTAMP
+        WHERE job_id = %(job_id)s AND step_number = %(next_step)s
+    )
+    UPDATE jobs SET status = 'processing', progress = %(progress)s, current_step = %(next_step)s,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = %(job_id)s
+"""
+
+_SQL_FINISH_PIPELINE = """
+    WITH done AS (
+        UPDATE job_steps 
+        SET status = 'success', message = %(message)s, ended_at = CURRENT_TIMESTAMP, output_files = %(output_files)s
+        WHERE job_id = %(job_id)s AND step_number = %(step_number)s
+    )
+    UPDATE jobs 
+    SET status = 'pdf_ready', progress = 100, current_step = %(step_number)s, updated_at = CURRENT_TIMESTAMP,
+        payload = jsonb_set(COALESCE(payload, '{}'::jsonb), '{pdf_filename}', to_jsonb(%(pdf_filename)s::text))
+    WHERE id = %(job_id)s
+"""
+
+# The failed step is whichever one the job was on
+_SQL_FAIL_PIPELINE = """
+    WITH job AS (
+        UPDATE jobs SET status = 'failed', progress = 0, updated_at = CURRENT_TIMESTAMP
+        WHERE id = %(job_id)s
+        RETURNING current_step
+    )
+    UPDATE job_steps 
+    SET status = 'failed', message = %(message)s, ended_at = CURRENT_TIMESTAMP
+    WHERE job_id = %(job_id)s AND step_number = (SELECT current_step FROM job)
+"""
+
 class ManualRationaleOrchestrator:
     
     def __init__(self, job_id: str):
         self.job_id = job_id
         self.folder_path = os.path.join('backend', 'job_files', job_id)
-        os.makedirs(self.folder_path, exist_ok=True)
-        os.makedirs(os.path.join(self.folder_path, 'analysis'), exist_ok=True)
-        os.makedirs(os.path.join(self.folder_path, 'charts'), exist_ok=True)
-        os.makedirs(os.path.join(self.folder_path, 'pdf'), exist_ok=True)
     
-    def update_job_status(self, status: str, progress: int = 0, current_step: int = 0):
+    def create_folders(self):
+        """Create the job folder layout; runs on the pipeline worker, not the request"""
+        # Creating the leaves creates the job folder along the way
+        for subfolder in JOB_SUBFOLDERS:
+            os.makedirs(os.path.join(self.folder_path, subfolder), exist_ok=True)
+    
+    def start_pipeline(self):
+        """Mark the job processing and step 1 running; returns the job's date and payload"""
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(_SQL_START_PIPELINE, {'job_id': self.job_id})
+            job = cursor.fetchone()
+        
+        if not job:
+            raise ValueError(f"Job {self.job_id} not found")
+        return job
+    
+    def advance_step(self, step_number: int, message: str, progress: int):
+        """Mark a step successful and start the next one"""
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(_SQL_ADVANCE_STEP, {
+                'job_id': self.job_id,
+                'step_number': step_number,
+                'next_step': step_number + 1,
+                'message': message,
+                'progress': progress
+            })
+    
+    def finish_pipeline(self, pdf_path: str):
+        """Mark the last step successful, record the PDF and flag the job pdf_ready"""
         with get_db_cursor(commit=True) as cursor:
-            cursor.execute(
-                "UPDATE jobs SET status = %s, progress = %s, current_step = %s, updated_at = %s WHERE id = %s",
-                (status, progress, current_step, datetime.now(), self.job_id)
-            )
+            cursor.execute(_SQL_FINISH_PIPELINE, {
+                'job_id': self.job_id,
+                'step_number': PDF_STEP,
+                'message': 'PDF generated successfully',
+                'output_files': [pdf_path],
+                'pdf_filename': os.path.basename(pdf_path)
+            })
     
-    def update_step_status(self, step_number: int, status: str, message: str = '', output_files: list = None):
+    def fail_pipeline(self, message: str):
+        """Mark the job and its current step failed"""
         with get_db_cursor(commit=True) as cursor:
-            if status == 'running':
-                cursor.execute(
-                    "UPDATE job_steps SET status = %s, started_at = %s WHERE job_id = %s AND step_number = %s",
-                    (status, datetime.now(), self.job_id, step_number)
-                )
-            elif status in ['success', 'failed']:
-                if output_files:
-                    import json
-                    cursor.execute(
-                        "UPDATE job_steps SET status = %s, message = %s, ended_at = %s, output_files = %s WHERE job_id = %s AND step_number = %s",
-                        (status, message or '', datetime.now(), output_files, self.job_id, step_number)
-                    )
-                else:
-                    cursor.execute(
-                        "UPDATE job_steps SET status = %s, message = %s, ended_at = %s WHERE job_id = %s AND step_number = %s",
-                        (status, message or '', datetime.now(), self.job_id, step_number)
-                    )
+            cursor.execute(_SQL_FAIL_PIPELINE, {'job_id': self.job_id, 'message': message})
     
     def run_pipeline(self):
+        # Each transition below is one statement on a briefly checked-out pooled
+        # connection, so nothing is held during the CMP/chart/PDF work
         try:
+            # Start the 3-step pipeline; the same statement hands back the job data
+            job = self.start_pipeline()
+            self.create_folders()
+                
             # Create input.csv with all master data enrichment
-            print(f"📄 Creating input.csv for job {self.job_id}...")
-            input_csv_path = create_input_csv(self.job_id, self.folder_path)
-            print(f"✓ input.csv created: {input_csv_path}")
-            
-            # Start the 3-step pipeline
-            self.update_job_status('processing', progress=0, current_step=1)
-            
+            logger.info("📄 Creating input.csv for job %s...", self.job_id)
+            input_csv_path = create_input_csv(self.job_id, self.folder_path, job)
+            logger.info("✓ input.csv created: %s", input_csv_path)
+                
             # Step 1: Fetch CMP
-            self.update_step_status(1, 'running')
             stocks_with_cmp = fetch_cmp_for_stocks(self.job_id, self.folder_path)
-            self.update_step_status(1, 'success', 'CMP fetched successfully')
-            self.update_job_status('processing', progress=33, current_step=2)
-            
-            self.update_step_status(2, 'running')
+            self.advance_step(1, 'CMP fetched successfully', progress=33)
+                
+            # Step 2: Generate charts
             stocks_with_charts = generate_charts_for_stocks(self.job_id, self.folder_path, stocks_with_cmp)
-            self.update_step_status(2, 'success', 'Charts generated successfully')
-            self.update_job_status('processing', progress=66, current_step=3)
-            
-            self.update_step_status(3, 'running')
+            self.advance_step(2, 'Charts generated successfully', progress=66)
+                
+            # Step 3: Generate PDF, saving its filename to the payload
             pdf_path = generate_manual_pdf(self.job_id, self.folder_path, stocks_with_charts)
-            self.update_step_status(3, 'success', 'PDF generated successfully', output_files=[pdf_path])
-            
-            # Save PDF filename to payload
-            pdf_filename = os.path.basename(pdf_path)
-            with get_db_cursor(commit=True) as cursor:
-                cursor.execute("""
-                    UPDATE jobs 
-                    SET payload = jsonb_set(COALESCE(payload, '{}'::jsonb), '{pdf_filename}', to_jsonb(%s::text))
-                    WHERE id = %s
-                """, (pdf_filename, self.job_id))
-            
-            self.update_job_status('pdf_ready', progress=100, current_step=3)
-            
-            print(f"✓ Manual Rationale pipeline completed for job {self.job_id}")
-            print(f"✓ PDF saved: {pdf_filename}")
-            
+            self.finish_pipeline(pdf_path)
+                
+            logger.info("✓ Manual Rationale pipeline completed for job %s", self.job_id)
+            logger.info("✓ PDF saved: %s", os.path.basename(pdf_path))
+                
         except Exception as e:
-            print(f"✗ Pipeline failed for job {self.job_id}: {str(e)}")
-            current_step = 1
-            with get_db_cursor() as cursor:
-                cursor.execute("SELECT current_step FROM jobs WHERE id = %s", (self.job_id,))
-                result = cursor.fetchone()
-                if result:
-                    current_step = result['current_step']
-            
-            self.update_step_status(current_step, 'failed', str(e))
-            self.update_job_status('failed', current_step=current_step)
+            logger.error("✗ Pipeline failed for job %s: %s", self.job_id, e)
+            self.fail_pipeline(str(e))
     
     def run_async(self):
-        thread = threading.Thread(target=self.run_pipeline)
-        thread.daemon = True
-        thread.start()
+        run_in_background(self.run_pipeline)
@@ -3,7 +3,10 @@ import pandas as pd
 import requests
 import time
 from datetime import datetime, timedelta
-from backend.utils.database import get_db_cursor
+from backend.utils.api_key_cache import get_api_key
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def fetch_last_closing_price(api_key: str, security_id: str, exchange: str, instrument: str, dt: datetime):
@@ -77,7 +80,7 @@ def fetch_last_closing_price(api_key: str, security_id: str, exchange: str, inst
             return None
             
     except Exception as e:
-        print(f"    ⚠️ Historical API error: {str(e)}")
+        logger.warning("    ⚠️ Historical API error: %s", e)
         return None
 
 
@@ -145,9 +148,9 @@ def fetch_cmp_from_dhan(api_key: str, security_id: str, exchange: str, instrumen
         
         # Log detailed error if request fails
         if response.status_code != 200:
-            print(f"    ⚠️ API error ({response.status_code}): {response.text}")
+            logger.warning("    ⚠️ API error (%s): %s", response.status_code, response.text)
             # Try fallback to closing price
-            print(f"    ℹ️ Trying last closing price...")
+            logger.info("    ℹ️ Trying last closing price...")
             closing_price = fetch_last_closing_price(api_key, security_id, exchange, instrument, call_datetime)
             if closing_price:
                 return (closing_price, "closing")
@@ -161,7 +164,7 @@ def fetch_cmp_from_dhan(api_key: str, security_id: str, exchange: str, instrumen
             return (cmp_value, "intraday")
         else:
             # No intraday data - try fetching last closing price
-            print(f"    ℹ️ No intraday data (market closed), fetching last closing price...")
+            logger.info("    ℹ️ No intraday data (market closed), fetching last closing price...")
             closing_price = fetch_last_closing_price(api_key, security_id, exchange, instrument, call_datetime)
             if closing_price:
                 return (closing_price, "closing")
@@ -171,7 +174,7 @@ def fetch_cmp_from_dhan(api_key: str, security_id: str, exchange: str, instrumen
     except RuntimeError:
         raise  # Re-raise authentication errors
     except Exception as e:
-        print(f"    ⚠️ API error: {str(e)}")
+        logger.warning("    ⚠️ API error: %s", e)
         # Try fallback to closing price
         closing_price = fetch_last_closing_price(api_key, security_id, exchange, instrument, call_datetime)
         if closing_price:
@@ -190,9 +193,7 @@ def fetch_cmp_for_stocks(job_id: str, job_folder: str):
     Returns:
         List of stock dictionaries with CMP data
     """
-    print("\n" + "=" * 60)
-    print("MANUAL RATIONALE STEP 1: FETCH CMP (CURRENT MARKET PRICE)")
-    print("=" * 60 + "\n")
+    logger.info("MANUAL RATIONALE STEP 1: FETCH CMP (CURRENT MARKET PRICE)")
     
     try:
         # Input/Output paths
@@ -204,29 +205,25 @@ def fetch_cmp_for_stocks(job_id: str, job_folder: str):
             raise ValueError(f'Input CSV file not found: {input_csv}')
         
         # Get Dhan API key
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT key_value FROM api_keys WHERE provider = 'dhan'")
-            api_key_row = cursor.fetchone()
-            dhan_api_key = api_key_row['key_value'] if api_key_row else None
+        dhan_api_key = get_api_key('dhan')
         
         # Verify Dhan API key
         if not dhan_api_key:
             raise ValueError('Dhan API key not found in database. Please add it in API Keys settings.')
         
-        print(f"🔑 Dhan API key found")
+        logger.info("🔑 Dhan API key found")
         
         # Load input CSV
-        print(f"📖 Loading stocks from input.csv...")
+        logger.info("📖 Loading stocks from input.csv...")
         df = pd.read_csv(input_csv)
-        print(f"✅ Loaded {len(df)} stocks\n")
+        logger.info("✅ Loaded %s stocks", len(df))
         
         # Ensure CMP column exists
         if "CMP" not in df.columns:
             df["CMP"] = None
         
         # Fetch CMP for each stock
-        print("💹 Fetching Current Market Prices from Dhan API...")
-        print("-" * 60)
+        logger.info("💹 Fetching Current Market Prices from Dhan API...")
         
         success_count = 0
         failed_count = 0
@@ -239,7 +236,7 @@ def fetch_cmp_for_stocks(job_id: str, job_folder: str):
                 
                 if not date_str or not time_str:
                     stock_name = row.get("LISTED NAME", row.get("STOCK SYMBOL", f"Row {i}"))
-                    print(f"  ⚠️ {stock_name:25} | Missing DATE or TIME, skipping")
+                    logger.warning("  ⚠️ %-25s | Missing DATE or TIME, skipping", stock_name)
                     failed_count += 1
                     continue
                 
@@ -266,7 +263,7 @@ def fetch_cmp_for_stocks(job_id: str, job_folder: str):
                 
                 # Skip if missing required data
                 if not security_id or pd.isna(security_id) or str(security_id).strip() == "":
-                    print(f"  ⚠️ {display_name:25} | Missing Security ID, skipping")
+                    logger.warning("  ⚠️ %-25s | Missing Security ID, skipping", display_name)
                     failed_count += 1
                     continue
                 
@@ -278,10 +275,10 @@ def fetch_cmp_for_stocks(job_id: str, job_folder: str):
                     df.at[i, "CMP"] = cmp_value
                     source_label = "💰" if source == "intraday" else "📊"  # intraday vs closing
                     source_text = "" if source == "intraday" else " (Last Close)"
-                    print(f"  ✅ {display_name:25} | {source_label} ₹{cmp_value:,.2f}{source_text} @ {dt_str}")
+                    logger.info("  ✅ %-25s | %s ₹%s%s @ %s", display_name, source_label, format(cmp_value, ',.2f'), source_text, dt_str)
                     success_count += 1
                 else:
-                    print(f"  ⚠️ {display_name:25} | No data available @ {dt_str}")
+                    logger.warning("  ⚠️ %-25s | No data available @ %s", display_name, dt_str)
                     df.at[i, "CMP"] = None
                     failed_count += 1
                 
@@ -290,25 +287,24 @@ def fetch_cmp_for_stocks(job_id: str, job_folder: str):
                 
             except Exception as e:
                 display_name = row.get("LISTED NAME", row.get("STOCK SYMBOL", f"Row {i}"))
-                print(f"  ❌ {display_name:25} | Error: {str(e)}")
+                logger.error("  ❌ %-25s | Error: %s", display_name, e)
                 failed_count += 1
         
-        print("-" * 60)
-        print(f"\n📊 CMP Fetch Summary:")
-        print(f"   Total stocks: {len(df)}")
-        print(f"   Successfully fetched: {success_count}")
-        print(f"   Failed/No data: {failed_count}\n")
+        logger.info("📊 CMP Fetch Summary:")
+        logger.info("   Total stocks: %s", len(df))
+        logger.info("   Successfully fetched: %s", success_count)
+        logger.info("   Failed/No data: %s", failed_count)
         
         # Save output
-        print(f"💾 Saving CMP data to: {output_csv}")
+        logger.info("💾 Saving CMP data to: %s", output_csv)
         
         # Ensure analysis directory exists
         os.makedirs(os.path.dirname(output_csv), exist_ok=True)
         
         df.to_csv(output_csv, index=False)
         
-        print(f"✅ Saved {len(df)} records")
-        print(f"✅ Output: analysis/stocks_with_cmp.csv\n")
+        logger.info("✅ Saved %s records", len(df))
+        logger.info("✅ Output: analysis/stocks_with_cmp.csv")
         
         # Convert to list of dicts for return
         stocks_with_cmp = df.to_dict('records')
@@ -316,7 +312,5 @@ def fetch_cmp_for_stocks(job_id: str, job_folder: str):
         return stocks_with_cmp
         
     except Exception as e:
-        print(f"\n❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         raise e
@@ -25,7 +25,10 @@ import matplotlib.pyplot as plt
 import mplfinance as mpf
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
-from backend.utils.database import get_db_cursor
+from backend.utils.api_key_cache import get_api_key
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 IST = pytz.timezone("Asia/Kolkata")
 BASE_URL = "https://api.dhan.co/v2"
@@ -65,9 +68,9 @@ def _post(path: str, payload: dict, headers: dict, max_retries: int = 4) -> dict
             continue
         try:
             error_msg = r.json()
-            print(f"  ⚠️  Dhan API Error {r.status_code}: {error_msg}")
+            logger.warning("  ⚠️  Dhan API Error %s: %s", r.status_code, error_msg)
         except:
-            print(f"  ⚠️  Dhan API Error {r.status_code}: {r.text}")
+            logger.warning("  ⚠️  Dhan API Error %s: %s", r.status_code, r.text)
         r.raise_for_status()
     raise RuntimeError("Max retries exceeded")
 
@@ -347,9 +350,7 @@ def generate_charts_for_stocks(job_id: str, job_folder: str, stocks_with_cmp):
     Returns:
         List of stock dictionaries with chart paths
     """
-    print("\n" + "=" * 60)
-    print("MANUAL RATIONALE STEP 2: GENERATE STOCK CHARTS")
-    print("=" * 60 + "\n")
+    logger.info("MANUAL RATIONALE STEP 2: GENERATE STOCK CHARTS")
 
     try:
         analysis_folder = os.path.join(job_folder, 'analysis')
@@ -357,13 +358,10 @@ def generate_charts_for_stocks(job_id: str, job_folder: str, stocks_with_cmp):
         charts_dir = os.path.join(job_folder, 'charts')
         output_csv = os.path.join(analysis_folder, 'stocks_with_charts.csv')
 
-        if not os.path.exists(stocks_csv):
+        if not stocks_with_cmp and not os.path.exists(stocks_csv):
             raise ValueError(f'Stocks with CMP file not found: {stocks_csv}')
 
-        with get_db_cursor() as cursor:
-            cursor.execute("SELECT key_value FROM api_keys WHERE provider = 'dhan'")
-            api_key_row = cursor.fetchone()
-            dhan_api_key = api_key_row['key_value'] if api_key_row else None
+        dhan_api_key = get_api_key('dhan')
 
         if not dhan_api_key:
             raise ValueError('Dhan API key not found in database. Please add it in API Keys settings.')
@@ -375,13 +373,14 @@ def generate_charts_for_stocks(job_id: str, job_folder: str, stocks_with_cmp):
             "Accept": "application/json",
             "access-token": dhan_api_key
         }
-        print(f"🔑 Dhan API key found")
+        logger.info("🔑 Dhan API key found")
 
-        print("📊 Loading stocks with CMP...")
-        df = pd.read_csv(stocks_csv)
-        print(f"✅ Loaded {len(df)} stocks\n")
+        # Step 1 hands over its rows; the CSV is only read when they are missing
+        logger.info("📊 Loading stocks with CMP...")
+        df = pd.DataFrame(stocks_with_cmp) if stocks_with_cmp else pd.read_csv(stocks_csv)
+        logger.info("✅ Loaded %s stocks", len(df))
 
-        print(f"📈 Generating charts for {len(df)} stocks...")
+        logger.info("📈 Generating charts for %s stocks...", len(df))
 
         out_rows = []
         success_count = 0
@@ -394,7 +393,7 @@ def generate_charts_for_stocks(job_id: str, job_folder: str, stocks_with_cmp):
                     security_id = security_id.split('.')[0]
 
                 if not security_id or security_id == '' or security_id == 'nan':
-                    print(f"  ⚠️ [{idx+1}/{len(df)}] Skipping - Missing SECURITY ID")
+                    logger.warning("  ⚠️ [%s/%s] Skipping - Missing SECURITY ID", idx+1, len(df))
                     out_row = row.to_dict()
                     out_row["CHART PATH"] = ""
                     out_rows.append(out_row)
@@ -410,7 +409,7 @@ def generate_charts_for_stocks(job_id: str, job_folder: str, stocks_with_cmp):
 
                 exchange_segment = f"{exchange}_EQ" if exchange in ["NSE", "BSE"] else "NSE_EQ"
 
-                print(f"  [{idx+1}/{len(df)}] {short_name} ({chart_type}, {exchange_segment})...")
+                logger.info("  [%s/%s] %s (%s, %s)...", idx+1, len(df), short_name, chart_type, exchange_segment)
 
                 date_obj = parse_date(str(row.get("DATE", "")).strip())
                 time_str = str(row.get("TIME", "")).strip()
@@ -464,33 +463,31 @@ def generate_charts_for_stocks(job_id: str, job_folder: str, stocks_with_cmp):
                 out_row["CHART PATH"] = relative_path
                 out_rows.append(out_row)
 
-                print(f"      ✅ Chart saved: {relative_path}")
+                logger.info("      ✅ Chart saved: %s", relative_path)
                 success_count += 1
 
                 time.sleep(1.5)
 
             except Exception as e:
-                print(f"      ❌ Error: {str(e)}")
+                logger.error("      ❌ Error: %s", e)
                 out_row = row.to_dict()
                 out_row["CHART PATH"] = ""
                 out_rows.append(out_row)
                 failed_count += 1
 
-        print(f"\n💾 Saving output CSV...")
+        logger.info("💾 Saving output CSV...")
         out_df = pd.DataFrame(out_rows)
         out_df.to_csv(output_csv, index=False, encoding="utf-8-sig")
 
-        print(f"✅ Generated {success_count} charts")
+        logger.info("✅ Generated %s charts", success_count)
         if failed_count > 0:
-            print(f"⚠️  Failed: {failed_count} charts")
-        print(f"   Output: {output_csv}\n")
+            logger.warning("⚠️  Failed: %s charts", failed_count)
+        logger.info("   Output: %s", output_csv)
 
         stocks_with_charts = out_df.to_dict('records')
         
         return stocks_with_charts
 
     except Exception as e:
-        print(f"\n❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error")
         raise e
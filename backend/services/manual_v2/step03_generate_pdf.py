@@ -5,6 +5,7 @@ Creates a professional PDF report from stocks_with_charts.csv with premium blue
 """
 
 import os
+import re
 import pandas as pd
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
@@ -20,14 +21,11 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from PIL import Image as PILImage, ImageDraw
 from datetime import datetime
-import psycopg2
+from backend.utils.database import get_db_cursor
 from backend.utils.reportlab_html import extract_html_content
+from backend.utils.log_utils import get_logger
 
-
-def get_db_connection():
-    """Get database connection"""
-    import os
-    return psycopg2.connect(os.environ["DATABASE_URL"])
+logger = get_logger(__name__)
 
 
 def sanitize_filename(s: str) -> str:
@@ -37,10 +35,7 @@ def sanitize_filename(s: str) -> str:
 
 def fetch_pdf_config(job_id: str):
     """Fetch PDF configuration from database tables"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    try:
+    with get_db_cursor() as cursor:
         # Fetch job details with channel info (JOIN with channels table)
         cursor.execute("""
             SELECT c.channel_name, c.channel_logo_path, j.title, j.date
@@ -52,7 +47,10 @@ def fetch_pdf_config(job_id: str):
         if not job_row:
             raise ValueError(f"Job {job_id} not found")
         
-        channel_name, channel_logo_path_raw, title, input_date = job_row
+        channel_name = job_row['channel_name']
+        channel_logo_path_raw = job_row['channel_logo_path']
+        title = job_row['title']
+        input_date = job_row['date']
         
         # Construct full path for channel logo if it exists
         channel_logo_path = None
@@ -70,12 +68,12 @@ def fetch_pdf_config(job_id: str):
                 for path in possible_paths:
                     if os.path.exists(path):
                         channel_logo_path = path
-                        print(f"✅ Found channel logo at: {path}")
+                        logger.info("✅ Found channel logo at: %s", path)
                         break
                 
                 if not channel_logo_path:
-                    print(f"⚠️ Channel logo file not found: {channel_logo_path_raw}")
-                    print(f"   Tried paths: {possible_paths}")
+                    logger.warning("⚠️ Channel logo file not found: %s", channel_logo_path_raw)
+                    logger.warning("   Tried paths: %s", possible_paths)
         
         # Fetch PDF template (company details, disclaimer, disclosure)
         cursor.execute("""
@@ -86,7 +84,11 @@ def fetch_pdf_config(job_id: str):
         """)
         template_row = cursor.fetchone()
         if template_row:
-            company_name, registration_details, disclaimer_text, disclosure_text, company_data = template_row
+            company_name = template_row['company_name']
+            registration_details = template_row['registration_details']
+            disclaimer_text = template_row['disclaimer_text']
+            disclosure_text = template_row['disclosure_text']
+            company_data = template_row['company_data']
         else:
             # Default values if no template exists
             company_name = "PHD CAPITAL PVT LTD"
@@ -108,7 +110,8 @@ def fetch_pdf_config(job_id: str):
         font_regular_path = None
         font_bold_path = None
         
-        for file_type, file_path, file_name in uploaded_files:
+        for uploaded in uploaded_files:
+            file_type, file_path, file_name = uploaded['file_type'], uploaded['file_path'], uploaded['file_name']
             if file_type == 'companyLogo' and not company_logo_path:
                 # Use the file_path as-is from database (already has full path)
                 company_logo_path = file_path
@@ -141,10 +144,6 @@ def fetch_pdf_config(job_id: str):
             'font_regular_path': font_regular_path,
             'font_bold_path': font_bold_path
         }
-    
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def make_round_logo(src_path, diameter_px=360):
@@ -164,7 +163,7 @@ def make_round_logo(src_path, diameter_px=360):
         out.save(tmp_path, "PNG")
         return tmp_path
     except Exception as e:
-        print(f"⚠️ Could not create round logo: {e}")
+        logger.warning("⚠️ Could not create round logo: %s", e)
         return src_path
 
 
@@ -173,25 +172,28 @@ def make_round_logo(src_path, diameter_px=360):
 def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
     """Generate professional PDF report from stocks_with_charts.csv"""
     
-    print("\n" + "=" * 60)
-    print("MANUAL RATIONALE STEP 3: GENERATE PDF")
-    print("=" * 60 + "\n")
+    logger.info("MANUAL RATIONALE STEP 3: GENERATE PDF")
     
     # Paths
     stocks_csv = os.path.join(job_folder, "analysis/stocks_with_charts.csv")
     
-    if not os.path.exists(stocks_csv):
+    if not stocks_with_charts and not os.path.exists(stocks_csv):
         raise FileNotFoundError(f"Input file not found: {stocks_csv}")
     
-    print(f"📊 Loading stocks from {stocks_csv}...")
-    df = pd.read_csv(stocks_csv, encoding="utf-8-sig")
-    print(f"✅ Loaded {len(df)} stocks")
+    # Step 2 hands over its rows; the CSV is only read when they are missing
+    if stocks_with_charts:
+        logger.info("📊 Loading stocks from step 2 output...")
+        df = pd.DataFrame(stocks_with_charts)
+    else:
+        logger.info("📊 Loading stocks from %s...", stocks_csv)
+        df = pd.read_csv(stocks_csv, encoding="utf-8-sig")
+    logger.info("✅ Loaded %s stocks", len(df))
     
     # Fetch configuration
-    print("🔑 Fetching PDF configuration from database...")
+    logger.info("🔑 Fetching PDF configuration from database...")
     config = fetch_pdf_config(job_id)
-    print(f"✅ Platform: {config['channel_name']}")
-    print(f"✅ Report: {config['title']}")
+    logger.info("✅ Platform: %s", config['channel_name'])
+    logger.info("✅ Report: %s", config['title'])
     
     # Output PDF path - use input date from config, not current date
     input_date = config.get('input_date', '')
@@ -208,7 +210,7 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
     output_pdf = os.path.join(job_folder, "pdf", pdf_filename)
     os.makedirs(os.path.dirname(output_pdf), exist_ok=True)
     
-    print(f"📄 Output: {output_pdf}")
+    logger.info("📄 Output: %s", output_pdf)
     
     # Fonts
     BASE_REG = "NotoSans"
@@ -298,7 +300,7 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
             if logo_path and os.path.exists(logo_path):
                 ROUND_LOGO = logo_path
         except Exception as e:
-            print(f"⚠️ Could not create round logo: {e}")
+            logger.warning("⚠️ Could not create round logo: %s", e)
     
     # Padded block helper
     def padded_block(flowables, left=10, right=10):
@@ -325,7 +327,6 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
         c.setFont(BASE_REG, 7.5)
         
         reg_text = config['registration_details']
-        import re
         if '<' in reg_text and '>' in reg_text:
             reg_text = re.sub(r'<[^>]+>', ' ', reg_text)
             reg_text = ' '.join(reg_text.split())
@@ -360,7 +361,7 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
                 c.drawImage(config['company_logo_path'], PAGE_W - 90, PAGE_H - 55, 48, 24,
                            preserveAspectRatio=True, mask='auto')
             except Exception as e:
-                print(f"⚠️ Could not draw company logo: {e}")
+                logger.warning("⚠️ Could not draw company logo: %s", e)
     
     def draw_blue_stripe_header(c: pdfcanvas.Canvas):
         stripe_h = 20
@@ -385,7 +386,7 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
                            preserveAspectRatio=True, mask='auto')
                 cur_x += logo_sz + 6
             except Exception as e:
-                print(f"⚠️ Could not draw logo in footer: {e}")
+                logger.warning("⚠️ Could not draw logo in footer: %s", e)
                 c.setStrokeColor(BLUE)
                 c.circle(cur_x + logo_sz/2, baseline_y, logo_sz/2, stroke=1, fill=0)
                 cur_x += logo_sz + 6
@@ -461,7 +462,7 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
         return Image(path, width=max_w, height=h)
     
     # Stock pages
-    print(f"📝 Generating {len(df)} stock pages...")
+    logger.info("📝 Generating %s stock pages...", len(df))
     for idx, row in df.iterrows():
         date_val = str(row.get("DATE", "") or "").strip()
         time_val = str(row.get("TIME", "") or "").strip()
@@ -486,7 +487,7 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
                     story.append(full_width_chart(chart_path))
                     story.append(Spacer(1, 14))
                 except Exception as e:
-                    print(f"⚠️ Could not add chart {chart_path}: {e}")
+                    logger.warning("⚠️ Could not add chart %s: %s", chart_path, e)
                     story.append(Paragraph("<i>Chart unavailable</i>", small_grey))
                     story.append(Spacer(1, 10))
             else:
@@ -511,11 +512,11 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
         story.append(PageBreak())
         
         if (idx + 1) % 10 == 0:
-            print(f"  ✅ Generated {idx + 1}/{len(df)} pages")
+            logger.info("  ✅ Generated %s/%s pages", idx + 1, len(df))
     
     # Disclaimer
     if config.get('disclaimer_text'):
-        print("📋 Adding Disclaimer section...")
+        logger.info("📋 Adding Disclaimer section...")
         story.append(heading("Disclaimer"))
         story.append(Spacer(1, 10))
         disclaimer_content = extract_html_content(config['disclaimer_text'])
@@ -524,7 +525,7 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
     
     # Disclosure
     if config.get('disclosure_text'):
-        print("📋 Adding Disclosure section...")
+        logger.info("📋 Adding Disclosure section...")
         story.append(heading("Disclosure"))
         story.append(Spacer(1, 10))
         disclosure_content = extract_html_content(config['disclosure_text'])
@@ -532,11 +533,11 @@ def generate_manual_pdf(job_id: str, job_folder: str, stocks_with_charts):
         story.append(Spacer(1, 35))
     
     # Build PDF
-    print("🔨 Building PDF...")
+    logger.info("🔨 Building PDF...")
     doc.build(story, onFirstPage=on_first_page, onLaterPages=on_later_pages)
     
-    print(f"✅ PDF generated successfully!")
-    print(f"📄 Output: {output_pdf}")
-    print(f"📊 Total pages: {len(df)} stocks + disclaimers\n")
+    logger.info("✅ PDF generated successfully!")
+    logger.info("📄 Output: %s", output_pdf)
+    logger.info("📊 Total pages: %s stocks + disclaimers", len(df))
     
     return output_pdf
@@ -1,15 +1,40 @@
 import os
 import csv
 import json
+import glob
+import pickle
+import tempfile
+import threading
+from itertools import compress
 import pandas as pd
 from typing import Dict, List, Optional
 from datetime import datetime
+from backend.utils.database import get_db_cursor
 from backend.utils.path_utils import resolve_uploaded_file_path
+from backend.utils.log_utils import get_logger
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+MASTER_COLUMNS = [
+    'SEM_TRADING_SYMBOL', 'SEM_SMST_SECURITY_ID', 'SM_SYMBOL_NAME', 'SEM_CUSTOM_SYMBOL',
+    'SEM_EXM_EXCH_ID', 'SEM_INSTRUMENT_NAME', 'SEM_EXCH_INSTRUMENT_TYPE'
+]
+
+# Equity rows of the master CSV keyed by upper-case trading symbol, plus the
+# autocomplete suggestions in file order; rebuilt when the master file path or
+# its mtime changes
+_master_index = {'path': None, 'mtime': None, 'by_symbol': {}, 'suggestions': []}
+_master_index_lock = threading.Lock()
 
 def get_master_csv_path() -> Optional[str]:
     """Fetch master file path from database and resolve to current system path"""
-    from backend.utils.database import get_db_cursor
-    
     with get_db_cursor() as cursor:
         cursor.execute(
             "SELECT file_path FROM uploaded_files WHERE file_type = 'masterFile' ORDER BY uploaded_at DESC LIMIT 1"
@@ -18,11 +43,142 @@ def get_master_csv_path() -> Optional[str]:
         if result:
             db_path = result['file_path']
             resolved_path = resolve_uploaded_file_path(db_path)
-            print(f"📂 Master file path from DB: {db_path}")
-            print(f"📂 Resolved to: {resolved_path}")
+            logger.info("📂 Master file path from DB: %s", db_path)
+            logger.info("📂 Resolved to: %s", resolved_path)
             return resolved_path
     return None
 
+def _read_master_csv(master_csv_path: str) -> pd.DataFrame:
+    """MASTER_COLUMNS of the master CSV as strings ('' for empty cells), using Arrow's reader when installed"""
+    if PYARROW_AVAILABLE:
+        table = pacsv.read_csv(
+            master_csv_path,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=MASTER_COLUMNS,
+                column_types={column: pa.string() for column in MASTER_COLUMNS}
+            )
+        )
+        return table.to_pandas()
+    
+    # na_filter=False reads empty cells as '' directly, skipping NA detection
+    return pd.read_csv(
+        master_csv_path, usecols=MASTER_COLUMNS, dtype=str, engine='c',
+        memory_map=True, na_filter=False
+    )
+
+def _build_master_index(master_csv_path: str) -> Dict:
+    """Parse the master CSV into the by_symbol index and autocomplete suggestions"""
+    df = _read_master_csv(master_csv_path)
+    df_equity = df[
+        (df['SEM_INSTRUMENT_NAME'] == 'EQUITY') & 
+        (df['SEM_EXCH_INSTRUMENT_TYPE'] == 'ES')
+    ]
+    
+    keys = df_equity['SEM_TRADING_SYMBOL'].str.upper()
+    first = ~keys.duplicated()
+    records = df_equity.to_dict('records')
+    
+    suggestions = [
+        (key, {
+            'symbol': row['SEM_TRADING_SYMBOL'],
+            'name': row['SM_SYMBOL_NAME'],
+            'securityId': row['SEM_SMST_SECURITY_ID'],
+            'listedName': row['SM_SYMBOL_NAME'],
+            'shortName': row['SEM_CUSTOM_SYMBOL'],
+            'exchange': row['SEM_EXM_EXCH_ID'],
+            'instrument': row['SEM_INSTRUMENT_NAME']
+        })
+        for key, row in zip(keys, records)
+    ]
+    
+    return {
+        'by_symbol': dict(zip(keys[first], compress(records, first))),
+        'suggestions': suggestions
+    }
+
+def _remove_master_sidecars(master_csv_path: str, keep: Optional[str] = None) -> None:
+    """Delete pickled indexes written for a master CSV, except keep"""
+    for sidecar in glob.glob(f"{glob.escape(master_csv_path)}.*.pkl"):
+        if sidecar != keep:
+            try:
+                os.remove(sidecar)
+            except OSError:
+                pass
+
+def _load_or_build_master_index(master_csv_path: str, st: os.stat_result) -> Dict:
+    """
+    Master index from the pickle sidecar written for this version of the file,
+    or parsed from the CSV (and the sidecar written) when there is none.
+    
+    The sidecar sits next to the master file as <file>.<mtime>_<size>.pkl, so
+    the first lookup after a restart skips the CSV parse.
+    """
+    sidecar = f"{master_csv_path}.{st.st_mtime_ns:x}_{st.st_size:x}.pkl"
+    
+    try:
+        with open(sidecar, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("⚠️ Ignoring unreadable master index %s: %s", sidecar, e)
+    
+    index = _build_master_index(master_csv_path)
+    
+    # Write to a temp file and rename so readers never see a partial pickle
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(sidecar), suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, sidecar)
+        tmp_path = None
+        _remove_master_sidecars(master_csv_path, keep=sidecar)
+    except OSError as e:
+        logger.warning("⚠️ Could not save master index %s: %s", sidecar, e)
+    finally:
+        # Don't leave a half-written temp file behind if the dump or rename failed
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    return index
+
+def _load_master_index(master_csv_path: str) -> Dict:
+    """Current _master_index for the master CSV, re-read only when the file changed"""
+    st = os.stat(master_csv_path)
+    
+    with _master_index_lock:
+        if _master_index['path'] != master_csv_path or _master_index['mtime'] != st.st_mtime:
+            index = _load_or_build_master_index(master_csv_path, st)
+            _master_index.update(
+                path=master_csv_path,
+                mtime=st.st_mtime,
+                by_symbol=index['by_symbol'],
+                suggestions=index['suggestions']
+            )
+        
+        return dict(_master_index)
+
+def invalidate_master_cache(master_csv_path: Optional[str] = None) -> None:
+    """
+    Drop the cached master index so a replaced or deleted master file is not
+    kept in memory; with master_csv_path (the uploaded_files path as stored),
+    also delete that file's pickled indexes.
+    """
+    with _master_index_lock:
+        _master_index.update(path=None, mtime=None, by_symbol={}, suggestions=[])
+        if master_csv_path:
+            # Sidecars sit next to the resolved path, as get_master_csv_path returns it
+            for path in {master_csv_path, resolve_uploaded_file_path(master_csv_path)}:
+                _remove_master_sidecars(path)
+
+def get_master_equity_index(master_csv_path: str) -> Dict[str, Dict]:
+    """Equity (EQUITY/ES) master rows keyed by upper-case SEM_TRADING_SYMBOL, first row wins"""
+    return _load_master_index(master_csv_path)['by_symbol']
+
 def enrich_stocks_with_master_data(stocks: List[Dict]) -> List[Dict]:
     master_csv_path = get_master_csv_path()
     
@@ -30,33 +186,24 @@ def enrich_stocks_with_master_data(stocks: List[Dict]) -> List[Dict]:
         raise ValueError("Master CSV file not found. Please upload master file in Settings.")
     
     try:
-        df = pd.read_csv(master_csv_path)
-        
-        df_equity = df[
-            (df['SEM_INSTRUMENT_NAME'] == 'EQUITY') & 
-            (df['SEM_EXCH_INSTRUMENT_TYPE'] == 'ES')
-        ].copy()
+        master_index = get_master_equity_index(master_csv_path)
         
         enriched_stocks = []
         for stock in stocks:
             symbol = stock['symbol'].upper()
             
-            matching_row = df_equity[
-                df_equity['SEM_TRADING_SYMBOL'].str.upper() == symbol
-            ]
+            row = master_index.get(symbol)
             
-            if matching_row.empty:
+            if row is None:
                 raise ValueError(f"Stock symbol '{symbol}' not found in master CSV")
             
-            row = matching_row.iloc[0]
-            
             enriched_stock = {
                 'symbol': stock['symbol'],
-                'security_id': str(row['SEM_SMST_SECURITY_ID']) if pd.notna(row['SEM_SMST_SECURITY_ID']) else '',
-                'listed_name': str(row['SM_SYMBOL_NAME']) if pd.notna(row['SM_SYMBOL_NAME']) else '',
-                'short_name': str(row['SEM_CUSTOM_SYMBOL']) if pd.notna(row['SEM_CUSTOM_SYMBOL']) else '',
-                'exchange': str(row['SEM_EXM_EXCH_ID']) if pd.notna(row['SEM_EXM_EXCH_ID']) else '',
-                'instrument': str(row['SEM_INSTRUMENT_NAME']) if pd.notna(row['SEM_INSTRUMENT_NAME']) else '',
+                'security_id': row['SEM_SMST_SECURITY_ID'],
+                'listed_name': row['SM_SYMBOL_NAME'],
+                'short_name': row['SEM_CUSTOM_SYMBOL'],
+                'exchange': row['SEM_EXM_EXCH_ID'],
+                'instrument': row['SEM_INSTRUMENT_NAME'],
                 'chart_type': stock.get('chart_type', 'Daily'),
                 'analysis': stock.get('analysis', ''),
                 'call': stock.get('call', ''),
@@ -81,57 +228,43 @@ def get_stock_autocomplete(query: str, limit: int = 10) -> List[Dict]:
         return []
     
     try:
-        df = pd.read_csv(master_csv_path)
-        
-        df_equity = df[
-            (df['SEM_INSTRUMENT_NAME'] == 'EQUITY') & 
-            (df['SEM_EXCH_INSTRUMENT_TYPE'] == 'ES')
-        ].copy()
-        
         query_upper = query.upper()
         
-        matches = df_equity[
-            df_equity['SEM_TRADING_SYMBOL'].str.upper().str.contains(query_upper, na=False)
-        ].head(limit)
-        
+        # Substring match over the cached equity rows, in master file order
         results = []
-        for _, row in matches.iterrows():
-            results.append({
-                'symbol': str(row['SEM_TRADING_SYMBOL']) if pd.notna(row['SEM_TRADING_SYMBOL']) else '',
-                'name': str(row['SM_SYMBOL_NAME']) if pd.notna(row['SM_SYMBOL_NAME']) else '',
-                'securityId': str(row['SEM_SMST_SECURITY_ID']) if pd.notna(row['SEM_SMST_SECURITY_ID']) else '',
-                'listedName': str(row['SM_SYMBOL_NAME']) if pd.notna(row['SM_SYMBOL_NAME']) else '',
-                'shortName': str(row['SEM_CUSTOM_SYMBOL']) if pd.notna(row['SEM_CUSTOM_SYMBOL']) else '',
-                'exchange': str(row['SEM_EXM_EXCH_ID']) if pd.notna(row['SEM_EXM_EXCH_ID']) else '',
-                'instrument': str(row['SEM_INSTRUMENT_NAME']) if pd.notna(row['SEM_INSTRUMENT_NAME']) else ''
-            })
+        for symbol_upper, stock in _load_master_index(master_csv_path)['suggestions']:
+            if query_upper in symbol_upper:
+                if len(results) >= limit:
+                    break
+                results.append(stock)
         
         return results
         
     except Exception as e:
-        print(f"Error in autocomplete: {str(e)}")
+        logger.error("Error in autocomplete: %s", e)
         return []
 
-def create_input_csv(job_id: str, folder_path: str) -> str:
+def create_input_csv(job_id: str, folder_path: str, job: Optional[Dict] = None) -> str:
     """
     Create input.csv file with all stock data and master data enrichment.
     
     Columns: DATE, TIME, STOCK SYMBOL, CHART TYPE, LISTED NAME, SHORT NAME, 
              SECURITY ID, EXCHANGE, INSTRUMENT, ANALYSIS
     
+    job is the job's date and payload when the caller already has them.
+    
     Returns the path to the created CSV file.
     """
-    from backend.utils.database import get_db_cursor
-    
     # Fetch job data
-    with get_db_cursor() as cursor:
-        cursor.execute("""
-            SELECT date, payload FROM jobs WHERE id = %s
-        """, (job_id,))
-        job = cursor.fetchone()
-        
-        if not job:
-            raise ValueError(f"Job {job_id} not found")
+    if job is None:
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                SELECT date, payload FROM jobs WHERE id = %s
+            """, (job_id,))
+            job = cursor.fetchone()
+            
+            if not job:
+                raise ValueError(f"Job {job_id} not found")
     
     # Parse payload
     payload = json.loads(job['payload']) if isinstance(job['payload'], str) else job['payload']
@@ -142,33 +275,33 @@ def create_input_csv(job_id: str, folder_path: str) -> str:
     # Create CSV file
     csv_path = os.path.join(folder_path, 'input.csv')
     
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = [
-            'DATE', 'TIME', 'STOCK SYMBOL', 'CHART TYPE', 'LISTED NAME', 
-            'SHORT NAME', 'SECURITY ID', 'EXCHANGE', 'INSTRUMENT', 'ANALYSIS'
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for stock in stocks:
-            # Use chart type directly from user input (Daily/Weekly/Monthly)
-            chart_type = stock.get('chart_type', 'Daily')
-            
-            # Use analysis text directly from user input
-            analysis_text = stock.get('analysis', '')
-            
-            writer.writerow({
-                'DATE': job_date,
-                'TIME': call_time,
-                'STOCK SYMBOL': stock.get('symbol', ''),
-                'CHART TYPE': chart_type,
-                'LISTED NAME': stock.get('listed_name', ''),
-                'SHORT NAME': stock.get('short_name', ''),
-                'SECURITY ID': stock.get('security_id', ''),
-                'EXCHANGE': stock.get('exchange', ''),
-                'INSTRUMENT': stock.get('instrument', ''),
-                'ANALYSIS': analysis_text
-            })
-    
-    print(f"✓ Created input.csv at {csv_path}")
+    fieldnames = [
+        'DATE', 'TIME', 'STOCK SYMBOL', 'CHART TYPE', 'LISTED NAME', 
+        'SHORT NAME', 'SECURITY ID', 'EXCHANGE', 'INSTRUMENT', 'ANALYSIS'
+    ]
+    
+    # Chart type and analysis text come directly from user input
+    rows = [
+        (
+            job_date,
+            call_time,
+            stock.get('symbol', ''),
+            stock.get('chart_type', 'Daily'),
+            stock.get('listed_name', ''),
+            stock.get('short_name', ''),
+            stock.get('security_id', ''),
+            stock.get('exchange', ''),
+            stock.get('instrument', ''),
+            stock.get('analysis', '')
+        )
+        for stock in stocks
+    ]
+    
+    # Build the rows up front and hand them to the writer in one call
+    with open(csv_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
+    
+    logger.info("✓ Created input.csv at %s", csv_path)
     return csv_path
@@ -0,0 +1,48 @@
+"""
+Short-lived in-process cache of provider API keys.
+
+Keys rotate rarely, so pipeline runs read them from here instead of querying
+api_keys every time. Saving or deleting a key through the API clears this
+process's entry; other workers pick the change up within API_KEY_CACHE_SECONDS.
+"""
+import threading
+from cachetools import TTLCache
+from backend.utils.database import get_db_cursor
+
+API_KEY_CACHE_SECONDS = 300
+
+_api_key_cache = TTLCache(maxsize=16, ttl=API_KEY_CACHE_SECONDS)
+_api_key_lock = threading.Lock()
+
+
+def get_api_key(provider):
+    """
+    Return the stored key for a provider.
+
+    Args:
+        provider: Provider name as stored in api_keys (e.g. 'dhan')
+
+    Returns:
+        The key_value, or None when no key is configured (not cached, so a
+        newly added key is used straight away)
+    """
+    with _api_key_lock:
+        key_value = _api_key_cache.get(provider)
+    if key_value:
+        return key_value
+
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT key_value FROM api_keys WHERE provider = %s", (provider,))
+        row = cursor.fetchone()
+
+    key_value = row['key_value'] if row else None
+    if key_value:
+        with _api_key_lock:
+            _api_key_cache[provider] = key_value
+    return key_value
+
+
+def invalidate_api_key(provider):
+    """Drop a provider's cached key after it is changed or deleted"""
+    with _api_key_lock:
+        _api_key_cache.pop(provider, None)
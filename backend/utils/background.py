@@ -0,0 +1,48 @@
+"""
+Shared bounded worker pool for background pipeline runs.
+
+Request handlers hand long-running pipeline work to this pool instead of
+starting a new thread per request. Once every worker is busy, further runs
+wait in the pool's queue rather than piling extra threads and database
+connections onto the process.
+
+Bulk rationale runs use their own pool, _PIPELINE_POOL in
+backend.api.bulk_rationale (sized by BULK_WORKERS), so they never queue
+behind the other tools' pipelines.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from backend.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+_BACKGROUND_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv('PIPELINE_WORKERS', '8')),
+    thread_name_prefix='pipeline'
+)
+
+
+def _log_crash(name, future):
+    """Log errors that escaped a background run (pipelines record their own step failures)"""
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error("Background run %s crashed: %s", name, error)
+
+
+def run_in_background(fn, *args, **kwargs):
+    """
+    Queue a call on the shared pipeline pool.
+
+    Args:
+        fn: Callable to run
+        *args, **kwargs: Arguments passed to fn
+
+    Returns:
+        concurrent.futures.Future
+    """
+    future = _BACKGROUND_POOL.submit(fn, *args, **kwargs)
+    name = getattr(fn, '__qualname__', repr(fn))
+    future.add_done_callback(lambda f: _log_crash(name, f))
+    return future
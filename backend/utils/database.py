@@ -1,8 +1,30 @@
+import os
+import threading
+import weakref
+import orjson
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, register_default_json, register_default_jsonb
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 from contextlib import contextmanager
 from backend.config import Config
 
+# Decode json/jsonb columns (job payloads, step results) with orjson
+register_default_json(globally=True, loads=orjson.loads)
+register_default_jsonb(globally=True, loads=orjson.loads)
+
+# Per-process pool, created on first use so forked workers never share sockets.
+# psycopg2 keeps DB_POOL_MIN idle connections; DB_POOL_MAX caps checked-out ones.
+# The default 22 covers the default thread counts (see DEPLOYMENT.md): 8 request
+# threads + 8 PIPELINE_WORKERS + 4 BULK_WORKERS + 2 cleanup threads.
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+# Statement names PREPAREd on each connection; prepared statements live for the
+# whole session, so they outlast the transaction (and pool checkout) that made them
+_prepared_statements = weakref.WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
 def get_db_connection():
     conn = psycopg2.connect(
         Config.DATABASE_URL,
@@ -10,20 +32,91 @@ def get_db_connection():
     )
     return conn
 
+def _get_pool():
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ThreadedConnectionPool(
+                    int(os.getenv('DB_POOL_MIN', '4')),
+                    int(os.getenv('DB_POOL_MAX', '22')),
+                    Config.DATABASE_URL,
+                    sslmode='prefer'
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
+def _acquire_connection():
+    """Check a connection out of the pool; returns (conn, pooled)"""
+    pool = _get_pool()
+    try:
+        conn = pool.getconn()
+    except PoolError:
+        # Pool exhausted: serve this block with a one-off connection rather than failing
+        return get_db_connection(), False
+    
+    if conn.closed:
+        pool.putconn(conn, close=True)
+        conn = pool.getconn()
+    return conn, True
+
+def _release_connection(conn, pooled):
+    if not pooled:
+        conn.close()
+        return
+    
+    pool = _get_pool()
+    if conn.closed:
+        pool.putconn(conn, close=True)
+        return
+    
+    try:
+        conn.rollback()
+    except psycopg2.Error:
+        pool.putconn(conn, close=True)
+        return
+    pool.putconn(conn)
+
 @contextmanager
 def get_db_cursor(commit=False):
-    conn = get_db_connection()
+    conn, pooled = _acquire_connection()
     cursor = conn.cursor(cursor_factory=RealDictCursor)
     try:
         yield cursor
         if commit:
             conn.commit()
     except Exception as e:
-        conn.rollback()
+        if not conn.closed:
+            conn.rollback()
         raise e
     finally:
         cursor.close()
-        conn.close()
+        _release_connection(conn, pooled)
+
+def execute_prepared(cursor, name, sql, params=None):
+    """
+    Run a fixed query as a server-side prepared statement.
+    
+    The first call on a connection PREPAREs it; later calls on that connection
+    only EXECUTE it, skipping the parse/plan work.
+    
+    Args:
+        cursor: Cursor from get_db_cursor()
+        name: Statement name, one per query text
+        sql: Query using $1, $2, ... placeholders
+        params: Values for the placeholders, in order
+    """
+    with _prepared_lock:
+        prepared = _prepared_statements.setdefault(cursor.connection, set())
+    
+    if name not in prepared:
+        cursor.execute(f"PREPARE {name} AS {sql}")
+        prepared.add(name)
+    
+    if params:
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    else:
+        cursor.execute(f"EXECUTE {name}")
 
 def init_database():
     with get_db_cursor(commit=True) as cursor:
@@ -62,8 +155,14 @@ def init_database():
             );
         """)
         
+        # Several pipelines look keys up by LOWER(provider); exact-match lookups
+        # already use the UNIQUE constraint's index, so the plain index is redundant
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_api_keys_provider_lower ON api_keys(LOWER(provider));
+        """)
+        
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_api_keys_provider ON api_keys(provider);
+            DROP INDEX IF EXISTS idx_api_keys_provider;
         """)
         
         # PDF Template table (single row for company information)
@@ -170,6 +269,35 @@ def init_database():
             END $$;
         """)
         
+        # Add pdf_path column so Bulk Rationale can serve the generated PDF without a folder scan
+        cursor.execute("""
+            DO $$ 
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns 
+                    WHERE table_name = 'jobs' AND column_name = 'pdf_path'
+                ) THEN
+                    ALTER TABLE jobs ADD COLUMN pdf_path TEXT;
+                END IF;
+            END $$;
+        """)
+        
+        # Add search_text column: the lower-cased title, URL and id the dashboard
+        # search matches against, kept in one column so one index serves it
+        cursor.execute("""
+            DO $$ 
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns 
+                    WHERE table_name = 'jobs' AND column_name = 'search_text'
+                ) THEN
+                    ALTER TABLE jobs ADD COLUMN search_text TEXT GENERATED ALWAYS AS (
+                        LOWER(COALESCE(title, '') || E'\\n' || COALESCE(youtube_url, '') || E'\\n' || id)
+                    ) STORED;
+                END IF;
+            END $$;
+        """)
+        
         # Update status constraint to include 'awaiting_chart_upload'
         cursor.execute("""
             DO $$
@@ -188,8 +316,13 @@ def init_database():
             END $$;
         """)
         
+        # Owner lookups by user (INCLUDE id keeps them index-only)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_user_id_id ON jobs(user_id) INCLUDE (id);
+        """)
+        
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_jobs_user_id ON jobs(user_id);
+            DROP INDEX IF EXISTS idx_jobs_user_id;
         """)
         
         cursor.execute("""
@@ -200,6 +333,30 @@ def init_database():
             CREATE INDEX IF NOT EXISTS idx_jobs_tool_used ON jobs(tool_used);
         """)
         
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
+        """)
+        
+        # Trigram index serves the dashboard's search_text LIKE '%term%' search;
+        # skipped when the role is not allowed to create the pg_trgm extension
+        cursor.execute("""
+            DO $$ 
+            BEGIN
+                BEGIN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                EXCEPTION WHEN insufficient_privilege OR feature_not_supported OR undefined_file THEN
+                    RAISE NOTICE 'pg_trgm unavailable, dashboard search stays unindexed';
+                END;
+                IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+                    CREATE INDEX IF NOT EXISTS idx_jobs_search_text_trgm ON jobs USING gin (search_text gin_trgm_ops);
+                    -- Per-column indexes superseded by search_text
+                    DROP INDEX IF EXISTS idx_jobs_title_trgm;
+                    DROP INDEX IF EXISTS idx_jobs_youtube_url_trgm;
+                    DROP INDEX IF EXISTS idx_jobs_id_trgm;
+                END IF;
+            END $$;
+        """)
+        
         # Job Steps table (tracks each step in pipeline for each job)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS job_steps (
@@ -218,13 +375,121 @@ def init_database():
         """)
         
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_job_steps_job_id ON job_steps(job_id);
+            CREATE INDEX IF NOT EXISTS idx_job_steps_job_step ON job_steps(job_id, step_number);
+        """)
+        
+        # Superseded by idx_job_steps_job_step (job_id is its leading column)
+        cursor.execute("""
+            DROP INDEX IF EXISTS idx_job_steps_job_id;
         """)
         
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_job_steps_status ON job_steps(status);
         """)
         
+        # Step messages are free text that sometimes holds JSON (Step 6's failed
+        # charts); parse them in queries without one malformed message failing the query
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION try_parse_jsonb(value TEXT) RETURNS JSONB AS $$
+            BEGIN
+                RETURN value::jsonb;
+            EXCEPTION WHEN others THEN
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql IMMUTABLE;
+        """)
+        
+        # Step counts kept on the job row (maintained by the triggers below) so
+        # listing jobs with progress needs no job_steps aggregate
+        cursor.execute("""
+            DO $$ 
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns 
+                    WHERE table_name = 'jobs' AND column_name = 'step_count'
+                ) THEN
+                    ALTER TABLE jobs ADD COLUMN step_count INTEGER NOT NULL DEFAULT 0;
+                    ALTER TABLE jobs ADD COLUMN completed_step_count INTEGER NOT NULL DEFAULT 0;
+                    
+                    UPDATE jobs j
+                    SET step_count = s.total, completed_step_count = s.completed
+                    FROM (
+                        SELECT job_id, COUNT(*) AS total, COUNT(*) FILTER (WHERE status = 'success') AS completed
+                        FROM job_steps
+                        GROUP BY job_id
+                    ) s
+                    WHERE j.id = s.job_id;
+                END IF;
+            END $$;
+        """)
+        
+        # Statement-level, so resetting or inserting all of a job's steps in one
+        # statement touches the job row once
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION sync_job_step_counts() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    UPDATE jobs j
+                    SET step_count = j.step_count + d.total,
+                        completed_step_count = j.completed_step_count + d.completed
+                    FROM (
+                        SELECT job_id, COUNT(*) AS total, COUNT(*) FILTER (WHERE status = 'success') AS completed
+                        FROM new_steps GROUP BY job_id
+                    ) d
+                    WHERE j.id = d.job_id;
+                ELSIF TG_OP = 'DELETE' THEN
+                    UPDATE jobs j
+                    SET step_count = j.step_count - d.total,
+                        completed_step_count = j.completed_step_count - d.completed
+                    FROM (
+                        SELECT job_id, COUNT(*) AS total, COUNT(*) FILTER (WHERE status = 'success') AS completed
+                        FROM old_steps GROUP BY job_id
+                    ) d
+                    WHERE j.id = d.job_id;
+                ELSE
+                    UPDATE jobs j
+                    SET completed_step_count = j.completed_step_count + d.completed
+                    FROM (
+                        SELECT n.job_id,
+                               SUM((n.status = 'success')::int - (o.status = 'success')::int) AS completed
+                        FROM new_steps n JOIN old_steps o ON o.id = n.id
+                        GROUP BY n.job_id
+                    ) d
+                    WHERE j.id = d.job_id AND d.completed <> 0;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        
+        cursor.execute("""
+            DO $$ 
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_job_steps_count_insert') THEN
+                    CREATE TRIGGER trg_job_steps_count_insert
+                        AFTER INSERT ON job_steps REFERENCING NEW TABLE AS new_steps
+                        FOR EACH STATEMENT EXECUTE PROCEDURE sync_job_step_counts();
+                END IF;
+                IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_job_steps_count_update') THEN
+                    CREATE TRIGGER trg_job_steps_count_update
+                        AFTER UPDATE ON job_steps REFERENCING OLD TABLE AS old_steps NEW TABLE AS new_steps
+                        FOR EACH STATEMENT EXECUTE PROCEDURE sync_job_step_counts();
+                END IF;
+                IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_job_steps_count_delete') THEN
+                    CREATE TRIGGER trg_job_steps_count_delete
+                        AFTER DELETE ON job_steps REFERENCING OLD TABLE AS old_steps
+                        FOR EACH STATEMENT EXECUTE PROCEDURE sync_job_step_counts();
+                END IF;
+            END $$;
+        """)
+        
+        # Progress NOTIFY triggers are no longer used; drop them where installed
+        cursor.execute("""
+            DROP TRIGGER IF EXISTS trg_jobs_notify_progress ON jobs;
+            DROP TRIGGER IF EXISTS trg_job_steps_notify_progress ON job_steps;
+            DROP FUNCTION IF EXISTS notify_job_progress();
+        """)
+        
         # Saved Rationale table (final saved rationales)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS saved_rationale (
@@ -0,0 +1,103 @@
+"""
+Lightweight file responses for generated artifacts (PDFs, CSVs, charts).
+
+Behind nginx the proxy advertises X-Accel-Redirect support through the
+X-Sendfile-Type / X-Accel-Mapping request headers, and the file is handed off
+to nginx (which also answers conditional requests itself). Otherwise the file
+is streamed through the WSGI file wrapper, which gunicorn serves with
+sendfile(); unchanged files are answered with 304 and Range requests with 206.
+"""
+import os
+import unicodedata
+from urllib.parse import quote
+from flask import request, current_app
+from werkzeug.datastructures import Headers
+from werkzeug.wsgi import wrap_file
+
+READ_BUFFER_SIZE = 4096
+
+
+def _accel_redirect_uri(path):
+    """Map an absolute file path onto the internal nginx location, if configured"""
+    if request.headers.get('X-Sendfile-Type') != 'X-Accel-Redirect':
+        return None
+
+    mapping = request.headers.get('X-Accel-Mapping', '')
+    if '=' not in mapping:
+        return None
+
+    local_prefix, uri_prefix = mapping.split('=', 1)
+    local_prefix = os.path.realpath(local_prefix.strip())
+    real_path = os.path.realpath(path)
+
+    if not real_path.startswith(local_prefix.rstrip(os.sep) + os.sep):
+        return None
+
+    relative = real_path[len(local_prefix):].lstrip(os.sep)
+    return uri_prefix.strip().rstrip('/') + '/' + relative.replace(os.sep, '/')
+
+
+def _set_content_disposition(headers, disposition, filename):
+    """Set Content-Disposition the way send_file does (quoted, RFC 5987 filename* for non-ASCII)"""
+    try:
+        filename.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        quoted = quote(filename, safe="!#$&+-.^_`|~")
+        names = {'filename': simple, 'filename*': f"UTF-8''{quoted}"}
+    else:
+        names = {'filename': filename}
+    headers.set('Content-Disposition', disposition, **names)
+
+
+def stream_file(path, mimetype, download_name=None, as_attachment=False, conditional=True, allow_accel=True):
+    """
+    Return a response for a file on disk without going through send_file.
+
+    Args:
+        path: Absolute path to the file
+        mimetype: Content type of the response
+        download_name: Filename for the Content-Disposition header
+        as_attachment: Send as attachment instead of inline
+        conditional: Answer If-None-Match/If-Modified-Since with 304 and Range
+            requests with 206, using the fstat() of the already-open file
+            (ETag = mtime-size)
+        allow_accel: Hand the file off to nginx when it is configured; pass
+            False when the file is removed as soon as the response closes
+
+    Returns:
+        Flask response
+    """
+    headers = Headers()
+    _set_content_disposition(
+        headers,
+        'attachment' if as_attachment else 'inline',
+        download_name or os.path.basename(path)
+    )
+
+    accel_uri = _accel_redirect_uri(path) if allow_accel else None
+    if accel_uri:
+        headers['X-Accel-Redirect'] = accel_uri
+        return current_app.response_class('', status=200, headers=headers, mimetype=mimetype)
+
+    file = open(path, 'rb')
+    st = os.fstat(file.fileno())
+    headers['Content-Length'] = str(st.st_size)
+    response = current_app.response_class(
+        wrap_file(request.environ, file, READ_BUFFER_SIZE),
+        status=200,
+        headers=headers,
+        mimetype=mimetype,
+        direct_passthrough=True
+    )
+
+    if conditional:
+        response.last_modified = int(st.st_mtime)
+        response.set_etag(f"{st.st_mtime_ns:x}-{st.st_size:x}")
+        # Byte ranges as send_file serves them; browser PDF viewers fetch in ranges
+        response.make_conditional(request, accept_ranges=True, complete_length=st.st_size)
+        if response.status_code == 304:
+            # No body is sent, so don't leave the descriptor open until the response is collected
+            file.close()
+
+    return response
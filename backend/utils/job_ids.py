@@ -0,0 +1,34 @@
+"""
+Job ID generation shared by all rationale tools
+"""
+import base64
+import os
+import time
+import uuid
+
+
+def new_job_id(prefix):
+    """
+    Generate a collision-safe, time-ordered job ID.
+
+    The value is a UUIDv7 layout (48-bit millisecond timestamp + 74 random bits)
+    encoded as lowercase base32hex, which keeps the time ordering so new rows
+    append to the jobs primary key index.
+
+    Args:
+        prefix: Tool prefix (e.g. 'bulk', 'manual')
+
+    Returns:
+        ID such as 'bulk-01jb4x...' (prefix + 26 characters)
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (
+        (unix_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | (rand >> 68) << 64
+        | 0b10 << 62
+        | rand & ((1 << 62) - 1)
+    )
+    slug = base64.b32hexencode(uuid.UUID(int=value).bytes).decode().rstrip('=').lower()
+    return f"{prefix}-{slug}"
@@ -0,0 +1,49 @@
+"""
+orjson-backed JSON provider for jsonify().
+
+Output matches Flask's default provider: keys sorted, dates as HTTP dates,
+Decimal and UUID as strings, trailing newline on responses. The only difference
+is encoding: non-ASCII characters are written as UTF-8 rather than \\u escapes.
+Request bodies are still parsed with the standard json module.
+"""
+import json
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SORT_KEYS |
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+)
+
+
+def json_default(obj):
+    """orjson fallback matching Flask's JSON output (HTTP dates, Decimal as string)"""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """Serialize app JSON with orjson"""
+
+    def _options(self, indent=False):
+        return ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else ORJSON_OPTIONS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=json_default, option=self._options(kwargs.get('indent'))).decode()
+
+    def loads(self, s, **kwargs):
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=json_default, option=self._options(self._app.debug))
+        return self._app.response_class(body + b"\n", mimetype='application/json')
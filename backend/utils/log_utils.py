@@ -0,0 +1,38 @@
+"""
+Non-blocking loggers for request handlers and background pipelines.
+
+Log calls only enqueue the record; a single QueueListener thread formats it
+and writes to stdout, so worker threads never wait on the stdout lock.
+"""
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+_log_queue = queue.Queue(-1)
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+
+_listener = QueueListener(_log_queue, _stream_handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def get_logger(name):
+    """
+    Get a logger whose records are handed off to the shared background listener.
+
+    Args:
+        name: Logger name (usually __name__)
+
+    Returns:
+        logging.Logger
+    """
+    logger = logging.getLogger(name)
+    if not any(isinstance(h, QueueHandler) for h in logger.handlers):
+        logger.addHandler(QueueHandler(_log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
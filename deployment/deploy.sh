@@ -451,7 +451,7 @@ Group=www-data
 WorkingDirectory=/var/www/rationale-studio
 Environment="PATH=/var/www/rationale-studio/venv/bin:/usr/local/bin:/usr/bin:/bin"
 EnvironmentFile=/var/www/rationale-studio/.env
-ExecStart=/var/www/rationale-studio/venv/bin/gunicorn --bind 127.0.0.1:5000 --workers 4 --timeout 300 --worker-class sync 'backend.app:create_app()'
+ExecStart=/var/www/rationale-studio/venv/bin/gunicorn --bind 127.0.0.1:5000 --workers 4 --worker-class gthread --threads 8 --timeout 300 'backend.app:create_app()'
 Restart=always
 RestartSec=10
 StandardOutput=journal
@@ -481,10 +481,18 @@ server {
         proxy_set_header X-Real-IP $remote_addr;
         proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
         proxy_set_header X-Forwarded-Proto $scheme;
+        proxy_set_header X-Sendfile-Type X-Accel-Redirect;
+        proxy_set_header X-Accel-Mapping /var/www/rationale-studio/backend/job_files/=/internal/job_files/;
         proxy_read_timeout 300;
         proxy_connect_timeout 300;
         proxy_send_timeout 300;
     }
+
+    # Generated job files, served by nginx after an X-Accel-Redirect from the app
+    location /internal/job_files/ {
+        internal;
+        alias /var/www/rationale-studio/backend/job_files/;
+    }
 }
 NGINXEOF
 